@@ -0,0 +1,73 @@
+using System;
+using BenchmarkDotNet.Attributes;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Nucs.Optimization.Callbacks;
+using Nucs.Optimization.Helper;
+using Python.Runtime;
+
+/*
+|     Method |    Mean |
+|----------- |--------:|
+| Recompiled | 45.8 ms |
+|     Shared |  3.2 ms |
+ */
+namespace Nucs.Essentials.Benchmarks;
+
+/// <summary>
+///     Creating a short lived optimization and an iteration callback, the python work outside of the search itself.
+///     Recompiled executes opt_helpers.py and forest.py again the way every instance used to, Shared uses <see cref="EmbeddedModules"/>.
+///     Requires PYTHONNET_PYDLL to point to a python with scikit-optimize installed.
+/// </summary>
+[ShortRunJob]
+[MemoryDiagnoser]
+public class OptimizationStartupBenchmark {
+    public record BenchmarkParameters {
+        [IntegerSpace<int>(0, int.MaxValue)]
+        public int Seed;
+
+        [RealSpace<double>(0, Math.PI)]
+        public double FloatSeed;
+
+        [CategoricalSpace<string>("A", "B", "C")]
+        public string Categories;
+
+        public bool UseMethod;
+    }
+
+    private Py.GILState _gil;
+
+    [GlobalSetup]
+    public void Setup() {
+        if (!PythonEngine.IsInitialized)
+            PythonEngine.Initialize();
+        _gil = Py.GIL();
+        ParametersAnalyzer<BenchmarkParameters>.Initialize();
+        //the first load imports skopt and sklearn, which is paid once per process either way
+        _ = EmbeddedModules.Helper;
+        _ = EmbeddedModules.Forest;
+    }
+
+    [GlobalCleanup]
+    public void Cleanup() {
+        _gil.Dispose();
+    }
+
+    private static double Score(BenchmarkParameters parameters) => parameters.FloatSeed;
+
+    [Benchmark(Baseline = true)]
+    public void Recompiled() {
+        //PyOptimization, PyForestOptimization, the callback and OptimizeResult each executed their own copy
+        for (int i = 0; i < 3; i++)
+            PyModule.FromString("helper", EmbeddedResourceHelper.ReadEmbeddedResource("opt_helpers.py")!).Dispose();
+        PyModule.FromString("forest", EmbeddedResourceHelper.ReadEmbeddedResource("forest.py")!).Dispose();
+        Shared();
+    }
+
+    [Benchmark]
+    public void Shared() {
+        using var opt = new PyForestOptimization<BenchmarkParameters>(Score);
+        using var callback = new FastIterationCallback<BenchmarkParameters>(_ => { });
+    }
+}
@@ -0,0 +1,93 @@
+using System;
+using System.Collections.Generic;
+using BenchmarkDotNet.Attributes;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+
+/*
+| Iterations | UnboxPerIteration |     Bulk |
+|----------- |------------------:|---------:|
+|       1000 |         360.5 ms  |   5.6 ms |
+|      10000 |        2362.6 ms  |  24.3 ms |
+|     100000 |       18667.9 ms  | 220.6 ms |
+ */
+namespace Nucs.Essentials.Benchmarks;
+
+/// <summary>
+///     Converting a python OptimizeResult to <see cref="OptimizeResult{TParams}"/>, one unbox_params call per iteration vs opt_helpers.columnar_results.
+///     Requires PYTHONNET_PYDLL to point to a python with scikit-optimize installed.
+/// </summary>
+[ShortRunJob]
+[MemoryDiagnoser]
+public class OptimizeResultConversionBenchmark {
+    public record BenchmarkParameters {
+        [IntegerSpace<int>(0, int.MaxValue)]
+        public int Seed;
+
+        [RealSpace<double>(0, Math.PI)]
+        public double FloatSeed;
+
+        [CategoricalSpace<string>("A", "B", "C")]
+        public string Categories;
+
+        [CategoricalSpace<float>(1f, 2f, 3f)]
+        public float NumericalCategories;
+
+        public bool UseMethod;
+    }
+
+    [Params(1_000, 10_000, 100_000)]
+    public int Iterations;
+
+    private Py.GILState _gil;
+    private PyModule _helper;
+    private dynamic _result;
+
+    [GlobalSetup]
+    public void Setup() {
+        if (!PythonEngine.IsInitialized)
+            PythonEngine.Initialize();
+        _gil = Py.GIL();
+        ParametersAnalyzer<BenchmarkParameters>.Initialize();
+
+        _helper = PyModule.FromString("helper", Nucs.Optimization.Helper.EmbeddedResourceHelper.ReadEmbeddedResource("opt_helpers.py")!);
+        _helper.Exec(@"
+import numpy as np
+from skopt.space import Space, Real, Integer, Categorical
+from skopt.utils import create_result
+
+def synthetic_result(n):
+    space = Space([Categorical(['A', 'B', 'C']), Real(0, np.pi), Categorical([1.0, 2.0, 3.0]), Integer(0, 2147483647), Categorical([True, False])])
+    x_iters = space.rvs(n, random_state=1337)
+    return create_result(x_iters, np.random.RandomState(1337).rand(n), space=space)
+");
+        _result = ((dynamic) _helper).synthetic_result(Iterations);
+    }
+
+    [GlobalCleanup]
+    public void Cleanup() {
+        _helper.Dispose();
+        _gil.Dispose();
+    }
+
+    [Benchmark(Baseline = true)]
+    public (BenchmarkParameters Parameters, double Score)[] UnboxPerIteration() {
+        dynamic helper = _helper;
+        var results = (int) _result.func_vals.__len__();
+        var iterations = new (BenchmarkParameters Parameters, double Score)[results];
+        for (var i = 0; i < results; i++) {
+            var parameters = ParametersAnalyzer<BenchmarkParameters>.Populate((List<Tuple<string, object>>) helper.unbox_params(ParametersAnalyzer<BenchmarkParameters>.ParameterNames, _result.x_iters[i])
+                                                                                                                .AsManagedObject(typeof(List<Tuple<string, object>>)));
+            iterations[i] = (parameters, (double) _result.func_vals[i]);
+        }
+
+        return iterations;
+    }
+
+    [Benchmark]
+    public OptimizeResult<BenchmarkParameters> Bulk() {
+        return new OptimizeResult<BenchmarkParameters>(_result, false);
+    }
+}
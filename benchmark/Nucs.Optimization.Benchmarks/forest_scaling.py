@@ -0,0 +1,69 @@
+"""
+Thread scaling of the forest surrogates in src/Nucs.Optimization/forest.py.
+
+Times `fit` and `predict(X, return_std=True)` for every `n_jobs` from 1 up to
+the number of cores (powers of two) and reports the speedup over `n_jobs=1`.
+
+    > python forest_scaling.py [--estimator ET|RF] [--n_estimators 100] [--n_points 10000]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "Nucs.Optimization"))
+import forest  # noqa: E402
+
+
+def _best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estimator", choices=["ET", "RF"], default="ET")
+    parser.add_argument("--n_estimators", type=int, default=100)
+    parser.add_argument("--n_samples", type=int, default=1000, help="observations the surrogate is fit on")
+    parser.add_argument("--n_points", type=int, default=10000, help="candidates scored per predict")
+    parser.add_argument("--n_features", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    rng = np.random.RandomState(1337)
+    X = rng.rand(args.n_samples, args.n_features)
+    y = np.sin(X.sum(axis=1) * 3) + rng.rand(args.n_samples) * 0.1
+    candidates = rng.rand(args.n_points, args.n_features)
+    regressor = forest.ExtraTreesRegressor if args.estimator == "ET" else forest.RandomForestRegressor
+
+    cores = os.cpu_count() or 1
+    n_jobs_list = [1]
+    while n_jobs_list[-1] * 2 <= cores:
+        n_jobs_list.append(n_jobs_list[-1] * 2)
+    if n_jobs_list[-1] != cores:
+        n_jobs_list.append(cores)
+
+    print(f"{args.estimator} n_estimators={args.n_estimators} n_samples={args.n_samples} "
+          f"n_points={args.n_points} n_features={args.n_features} cores={cores}")
+    print(f"{'n_jobs':>6} | {'fit (s)':>9} | {'speedup':>7} | {'predict (s)':>11} | {'speedup':>7}")
+
+    base_fit = base_predict = None
+    for n_jobs in n_jobs_list:
+        model = regressor(n_estimators=args.n_estimators, criterion="squared_error", n_jobs=n_jobs, random_state=1337)
+        fit = _best_of(args.repeat, lambda: model.fit(X, y))
+        predict = _best_of(args.repeat, lambda: model.predict(candidates, return_std=True))
+        base_fit = base_fit or fit
+        base_predict = base_predict or predict
+        print(f"{n_jobs:>6} | {fit:>9.4f} | {base_fit / fit:>6.2f}x | {predict:>11.4f} | {base_predict / predict:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
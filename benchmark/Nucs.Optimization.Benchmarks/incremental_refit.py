@@ -0,0 +1,101 @@
+"""
+Full vs incremental refits of the forest surrogates in src/Nucs.Optimization/forest.py.
+
+Replays a growing history (one new observation per iteration, like a
+`forest_minimize` run) and fits the surrogate after every observation, once
+rebuilding the whole forest and once through `forest.IncrementalState`.
+Reports the cumulative fit wall-clock and the surrogate quality (RMSE and R^2
+on a fixed held-out set) at the end of the run, then compares the best value
+found by `forest_minimize` on a synthetic objective in both modes.
+
+    > python incremental_refit.py [--estimator ET|RF] [--n_estimators 100] [--n_calls 500]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+from sklearn.base import clone
+from skopt import forest_minimize
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "Nucs.Optimization"))
+import forest  # noqa: E402
+
+
+def objective(x):
+    x = np.atleast_2d(x)
+    return np.sum((x - 0.3) ** 2, axis=1) + 0.1 * np.sin(12 * x).sum(axis=1)
+
+
+def replay(regressor, args, incremental, X, y, X_test, y_test):
+    state = forest.IncrementalState(n_replace=args.n_replace, refit_every=args.refit_every) if incremental else None
+    base = regressor(n_estimators=args.n_estimators, criterion="squared_error", random_state=1337, incremental=state)
+
+    elapsed = 0.0
+    rmse = []
+    for n in range(args.n_initial, len(X) + 1):
+        model = clone(base)
+        start = time.perf_counter()
+        model.fit(X[:n], y[:n])
+        elapsed += time.perf_counter() - start
+        if n % args.eval_every == 0 or n == len(X):
+            rmse.append(np.sqrt(np.mean((model.predict(X_test) - y_test) ** 2)))
+
+    r2 = 1 - np.sum((model.predict(X_test) - y_test) ** 2) / np.sum((y_test - y_test.mean()) ** 2)
+    return elapsed, rmse[-1], float(np.mean(rmse)), r2
+
+
+def minimize(regressor, args, incremental):
+    state = forest.IncrementalState(n_replace=args.n_replace, refit_every=args.refit_every) if incremental else None
+    estimator = regressor(n_estimators=args.n_estimators, criterion="squared_error", random_state=1337, incremental=state)
+    start = time.perf_counter()
+    result = forest_minimize(lambda x: float(objective(x)[0]), [(0.0, 1.0)] * args.n_features, base_estimator=estimator,
+                             n_calls=args.n_minimize_calls, n_initial_points=args.n_initial, random_state=1337, n_points=args.n_points)
+    return time.perf_counter() - start, result.fun
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--estimator", choices=["ET", "RF"], default="ET")
+    parser.add_argument("--n_estimators", type=int, default=100)
+    parser.add_argument("--n_replace", type=int, default=None)
+    parser.add_argument("--refit_every", type=int, default=10)
+    parser.add_argument("--n_features", type=int, default=6)
+    parser.add_argument("--n_calls", type=int, default=500, help="length of the replayed history")
+    parser.add_argument("--n_initial", type=int, default=20)
+    parser.add_argument("--eval_every", type=int, default=25)
+    parser.add_argument("--n_minimize_calls", type=int, default=120)
+    parser.add_argument("--n_points", type=int, default=2000)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    rng = np.random.RandomState(1337)
+    X = rng.rand(args.n_calls, args.n_features)
+    y = objective(X)
+    X_test = rng.rand(2000, args.n_features)
+    y_test = objective(X_test)
+    regressor = forest.ExtraTreesRegressor if args.estimator == "ET" else forest.RandomForestRegressor
+
+    print(f"{args.estimator} n_estimators={args.n_estimators} n_replace={args.n_replace} refit_every={args.refit_every} "
+          f"n_features={args.n_features} history={args.n_calls}")
+    print(f"{'mode':>11} | {'fit total (s)':>13} | {'final RMSE':>10} | {'mean RMSE':>9} | {'final R^2':>9}")
+    results = {}
+    for incremental in (False, True):
+        mode = "incremental" if incremental else "full"
+        results[mode] = replay(regressor, args, incremental, X, y, X_test, y_test)
+        elapsed, final_rmse, mean_rmse, r2 = results[mode]
+        print(f"{mode:>11} | {elapsed:>13.3f} | {final_rmse:>10.4f} | {mean_rmse:>9.4f} | {r2:>9.4f}")
+    print(f"fit speedup: {results['full'][0] / results['incremental'][0]:.2f}x")
+
+    print()
+    print(f"forest_minimize n_calls={args.n_minimize_calls} n_points={args.n_points}")
+    print(f"{'mode':>11} | {'wall (s)':>8} | {'best':>8}")
+    for incremental in (False, True):
+        elapsed, best = minimize(regressor, args, incremental)
+        print(f"{'incremental' if incremental else 'full':>11} | {elapsed:>8.2f} | {best:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""
+Benchmark suite for the python side of Nucs.Optimization (forest.py and opt_helpers.py).
+
+Runs offline on synthetic data and times:
+    predict    `predict(X, return_std=True)` across tree counts, candidate counts and dimensions
+    fit        fitting the surrogate on a growing history, on all of it and through a `TrainingSetPolicy`
+    categorical  fit and predict over categorical dimensions, one-hot encoded and as codes (`ordinal_dimensions`)
+    unbox      `unbox_params` / `unbox_params_dictionary` conversions per second
+    wrapper    per-call overhead of `unbox_params` and `columnarScoreWrapper` around a no-op objective
+    minimize   end-to-end `forest_minimize` on a synthetic objective
+    acquisition  the best acquisition value found by sampling candidates and by a `LocalSearch`, and the evaluations it took
+    studies    many forest studies run one after another and interleaved by `schedule_studies` over a pool of workers
+    startup    loading opt_helpers in a fresh interpreter, and executing the module sources again per instance
+
+`unbox`, `wrapper`, `acquisition`, `studies` and `startup` need pythonnet and a .NET runtime (the same ones the library uses), they are
+skipped when clr cannot be loaded. Every case reports the best of `--repeat` runs.
+
+Results are written as json with `--save` and compared against a previous run with `--compare`,
+cases slower than the baseline by more than `--tolerance` are reported and the exit code is 1.
+
+    > python suite.py [--quick] [--only predict,fit,categorical,unbox,wrapper,minimize,acquisition,studies,startup] [--save baseline.json] [--compare baseline.json] [--tolerance 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import types
+import warnings
+
+import numpy as np
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "Nucs.Optimization")
+sys.path.insert(0, SRC)
+import forest  # noqa: E402
+
+SECTIONS = ("predict", "fit", "categorical", "unbox", "wrapper", "minimize", "acquisition", "studies", "startup")
+
+
+def _best_of(repeat, func, number=1):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _load_helpers():
+    """Imports opt_helpers with a .NET runtime loaded, None when pythonnet or the runtime is unavailable."""
+    try:
+        import pythonnet
+        if pythonnet.get_runtime_info() is None:
+            pythonnet.load(os.environ.get("PYTHONNET_RUNTIME", "coreclr"))
+        import opt_helpers
+        return opt_helpers
+    except Exception as e:  # pythonnet missing or no runtime to load
+        print(f"opt_helpers unavailable, skipping unbox/wrapper/acquisition/studies/startup: {e}")
+        return None
+
+
+def _dimensions(n_features):
+    from skopt.space import Categorical, Integer, Real
+    dimensions = []
+    for i in range(n_features):
+        kind = i % 3
+        if kind == 0:
+            dimensions.append(Real(0.0, 1.0, name=f"real{i}"))
+        elif kind == 1:
+            dimensions.append(Integer(0, 1000, name=f"int{i}"))
+        else:
+            dimensions.append(Categorical(["a", "b", "c", "d"], name=f"cat{i}"))
+    return dimensions
+
+
+def bench_predict(args, results):
+    grid_trees = [10, 50] if args.quick else [10, 50, 100, 250]
+    grid_points = [1000] if args.quick else [1000, 10000, 50000]
+    grid_features = [4] if args.quick else [2, 8, 32]
+
+    print(f"{'estimator':>9} | {'trees':>5} | {'points':>6} | {'dims':>4} | {'predict (s)':>11} | {'us/point':>8}")
+    for name, regressor in (("ET", forest.ExtraTreesRegressor), ("RF", forest.RandomForestRegressor)):
+        for n_features in grid_features:
+            rng = np.random.RandomState(1337)
+            X = rng.rand(args.n_samples, n_features)
+            y = np.sin(X.sum(axis=1) * 3) + rng.rand(args.n_samples) * 0.1
+            for n_estimators in grid_trees:
+                model = regressor(n_estimators=n_estimators, criterion="squared_error", random_state=1337).fit(X, y)
+                for n_points in grid_points:
+                    candidates = rng.rand(n_points, n_features)
+                    seconds = _best_of(args.repeat, lambda: model.predict(candidates, return_std=True))
+                    results[f"predict/{name}/trees={n_estimators}/points={n_points}/dims={n_features}"] = {"seconds": seconds}
+                    print(f"{name:>9} | {n_estimators:>5} | {n_points:>6} | {n_features:>4} | {seconds:>11.4f} | {seconds / n_points * 1e6:>8.3f}")
+
+
+def bench_fit(args, results):
+    grid_history = [1000, 5000] if args.quick else [1000, 5000, 20000]
+    max_points = 500
+
+    print(f"{'estimator':>9} | {'history':>7} | {'all (s)':>9} | {f'policy {max_points} (s)':>16}")
+    for name, regressor in (("ET", forest.ExtraTreesRegressor), ("RF", forest.RandomForestRegressor)):
+        for n_history in grid_history:
+            rng = np.random.RandomState(1337)
+            X = rng.rand(n_history, 8)
+            y = np.sin(X.sum(axis=1) * 3) + rng.rand(n_history) * 0.1
+            full = regressor(n_estimators=100, criterion="squared_error", random_state=1337)
+            bounded = regressor(n_estimators=100, criterion="squared_error", random_state=1337,
+                                training_set=forest.TrainingSetPolicy(max_points, random_state=1337))
+            seconds_full = _best_of(args.repeat, lambda: full.fit(X, y))
+            seconds_bounded = _best_of(args.repeat, lambda: bounded.fit(X, y))
+            results[f"fit/{name}/history={n_history}/all"] = {"seconds": seconds_full}
+            results[f"fit/{name}/history={n_history}/policy={max_points}"] = {"seconds": seconds_bounded}
+            print(f"{name:>9} | {n_history:>7} | {seconds_full:>9.4f} | {seconds_bounded:>16.4f}")
+
+
+def bench_categorical(args, results):
+    from skopt.space import Categorical, Space
+
+    grid_dims = [10] if args.quick else [10, 40]
+    n_categories = 12
+    n_candidates = 10000
+
+    print(f"{'estimator':>9} | {'dims':>4} | {'encoding':>8} | {'columns':>7} | {'fit (s)':>8} | {'predict (s)':>11}")
+    for name, regressor in (("ET", forest.ExtraTreesRegressor), ("RF", forest.RandomForestRegressor)):
+        for n_dims in grid_dims:
+            categories = [f"value{c}" for c in range(n_categories)]
+            for encoding, transform in (("onehot", "onehot"), ("ordinal", "normalize")):
+                # what ordinal_dimensions turns the default one-hot dimensions into
+                space = Space([Categorical(categories, transform=transform, name=f"cat{i}") for i in range(n_dims)])
+                rng = np.random.RandomState(1337)
+                X = space.transform(space.rvs(args.n_samples, random_state=rng))
+                y = rng.rand(args.n_samples)
+                candidates = space.transform(space.rvs(n_candidates, random_state=rng))
+                estimator = regressor(n_estimators=100, criterion="squared_error", random_state=1337)
+                seconds_fit = _best_of(args.repeat, lambda: estimator.fit(X, y))
+                seconds_predict = _best_of(args.repeat, lambda: estimator.predict(candidates, return_std=True))
+                key = f"categorical/{name}/dims={n_dims}/{encoding}"
+                results[key + "/fit"] = {"seconds": seconds_fit}
+                results[key + "/predict"] = {"seconds": seconds_predict}
+                print(f"{name:>9} | {n_dims:>4} | {encoding:>8} | {X.shape[1]:>7} | {seconds_fit:>8.4f} | {seconds_predict:>11.4f}")
+
+
+def bench_unbox(args, results, helpers):
+    number = 200 if args.quick else 2000
+    print(f"{'function':>23} | {'dims':>4} | {'calls/s':>10} | {'us/call':>8}")
+    for n_features in (4, 16):
+        names = [d.name for d in _dimensions(n_features)]
+        point = [d.rvs(random_state=1337)[0] for d in _dimensions(n_features)]
+        for function in (helpers.unbox_params, helpers.unbox_params_dictionary):
+            seconds = _best_of(args.repeat, lambda: function(names, point), number)
+            results[f"unbox/{function.__name__}/dims={n_features}"] = {"seconds": seconds}
+            print(f"{function.__name__:>23} | {n_features:>4} | {1 / seconds:>10.0f} | {seconds * 1e6:>8.2f}")
+
+
+def bench_wrapper(args, results, helpers):
+    number = 200 if args.quick else 2000
+    print(f"{'wrapper':>19} | {'dims':>4} | {'us/call':>8}")
+    for n_features in (4, 16):
+        dimensions = _dimensions(n_features)
+        names = [d.name for d in dimensions]
+        point = [d.rvs(random_state=1337)[0] for d in dimensions]
+
+        def unboxing(point):
+            # the (name, value) pairs the removed `scoreWrapper` passed to .NET on every call
+            helpers.unbox_params(names, point)
+            return -0.0
+
+        wrappers = {
+            # the objective does nothing, what is measured is the marshaling around it
+            "unbox_params": unboxing,
+            "columnarScoreWrapper": helpers.columnarScoreWrapper(lambda reals, integers: 0.0, dimensions, True),
+        }
+        for name, wrapper in wrappers.items():
+            seconds = _best_of(args.repeat, lambda: wrapper(point), number)
+            results[f"wrapper/{name}/dims={n_features}"] = {"seconds": seconds}
+            print(f"{name:>19} | {n_features:>4} | {seconds * 1e6:>8.2f}")
+
+
+def bench_minimize(args, results):
+    from skopt import forest_minimize
+
+    def objective(x):
+        x = np.asarray(x, dtype=float)
+        return float(np.sum((x - 0.3) ** 2) + 0.1 * np.sin(12 * x).sum())
+
+    n_calls = 30 if args.quick else 100
+    print(f"{'estimator':>9} | {'calls':>5} | {'dims':>4} | {'wall (s)':>8} | {'best':>8}")
+    for name in ("ET", "RF"):
+        for n_features in ((4,) if args.quick else (4, 16)):
+            regressor = forest.ExtraTreesRegressor if name == "ET" else forest.RandomForestRegressor
+            best = []
+
+            def run():
+                estimator = regressor(n_estimators=100, criterion="squared_error", random_state=1337)
+                result = forest_minimize(objective, [(0.0, 1.0)] * n_features, base_estimator=estimator, n_calls=n_calls,
+                                         n_initial_points=10, random_state=1337, n_points=args.n_points)
+                best.append(float(result.fun))
+
+            seconds = _best_of(1 if args.quick else min(args.repeat, 2), run)
+            results[f"minimize/{name}/calls={n_calls}/dims={n_features}"] = {"seconds": seconds, "best": best[-1]}
+            print(f"{name:>9} | {n_calls:>5} | {n_features:>4} | {seconds:>8.2f} | {best[-1]:>8.4f}")
+
+
+def bench_acquisition(args, results, helpers):
+    from skopt.acquisition import _gaussian_acquisition
+    from skopt.space import Space
+
+    space = Space(_dimensions(12))
+    rng = np.random.RandomState(1337)
+    Xi = space.rvs(200, random_state=rng)
+    Xt = space.transform(Xi)
+    yi = np.sin(Xt.sum(axis=1) * 3) + rng.rand(len(Xt)) * 0.1
+    estimator = forest.ExtraTreesRegressor(n_estimators=100, criterion="squared_error", random_state=1337).fit(Xt, yi)
+
+    evaluations = [0]
+
+    def acquisition(X):
+        evaluations[0] += len(X)
+        return _gaussian_acquisition(X=X, model=estimator, y_opt=np.min(yi), acq_func="LCB", acq_func_kwargs={"kappa": 1.96})
+
+    cases = [(f"sampling n_points={n}", n, None) for n in (1000, 10000, 50000)]
+    cases.append(("local n_points=1000", 1000, helpers.LocalSearch()))
+    print(f"{'case':>23} | {'evaluations':>11} | {'seconds':>8} | {'best LCB':>8}")
+    for name, n_points, local_search in cases:
+        best = []
+
+        def run():
+            evaluations[0] = 0
+            X = space.transform(space.rvs(n_points, random_state=np.random.RandomState(7)))
+            if local_search is not None:
+                X = local_search.refine(space, X, acquisition, np.random.RandomState(7), Xi, list(yi))
+            best.append(float(acquisition(X).min()))
+
+        seconds = _best_of(args.repeat, run)
+        results[f"acquisition/{name.replace(' ', '/')}"] = {"seconds": seconds, "best": best[-1], "evaluations": evaluations[0]}
+        print(f"{name:>23} | {evaluations[0]:>11} | {seconds:>8.3f} | {best[-1]:>8.4f}")
+
+
+def _worker_pool(studies, n_workers, objective):
+    """
+    The submit/wait/collect callbacks of `schedule_studies` over a python thread pool standing in for
+    `StudyScheduler`, every point is a task of its own. Evaluations start first in first out, without priorities.
+    """
+    import ctypes
+    import queue
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = ThreadPoolExecutor(n_workers)
+    completed = queue.Queue()
+    lock = threading.Lock()
+    batches = {}
+
+    def submit(index, reals, integers, count):
+        n_reals = studies[index].layout.n_reals
+        points = np.ctypeslib.as_array((ctypes.c_double * (count * n_reals)).from_address(reals)).reshape(count, n_reals).copy()
+        scores = np.empty(count)
+        remaining = [count]
+        batches[index] = scores
+
+        def evaluate(row):
+            scores[row] = objective(points[row])
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    completed.put(index)
+
+        for row in range(count):
+            executor.submit(evaluate, row)
+
+    def wait():
+        indices = [completed.get()]
+        while not completed.empty():
+            indices.append(completed.get())
+        return indices
+
+    def collect(index, scores, count):
+        np.ctypeslib.as_array((ctypes.c_double * count).from_address(scores))[:] = batches.pop(index)
+
+    return executor, submit, wait, collect
+
+
+def bench_studies(args, results, helpers):
+    from skopt.space import Real
+
+    n_studies = 4 if args.quick else 8
+    n_calls = 15 if args.quick else 25
+    delay = 0.1  # seconds per evaluation, sleeping releases the GIL like a .NET score function does
+
+    def objective(x):
+        time.sleep(delay)
+        return float(np.sin(3 * x.sum()))
+
+    def studies():
+        dimensions = [Real(0.0, 1.0, name=f"real{i}") for i in range(4)]
+        return [helpers.Study(dimensions, forest.ExtraTreesRegressor(n_estimators=20, criterion="squared_error", random_state=i),
+                              False, n_calls, n_initial_points=5, batch_size=4, acq_func="LCB", random_state=i, n_points=500)
+                for i in range(n_studies)]
+
+    def run(n_workers, interleaved):
+        created = studies()
+        groups = [created] if interleaved else [[study] for study in created]
+        for group in groups:
+            executor, submit, wait, collect = _worker_pool(group, n_workers, objective)
+            helpers.schedule_studies(group, submit, wait, collect)
+            executor.shutdown()
+
+    cases = [("one after another", 4, False)] + [(f"interleaved n_workers={n}", n, True) for n in (1, 4, 16)]
+    print(f"{'case':>26} | {'seconds':>8} | {'evaluations/s':>13}")
+    for name, n_workers, interleaved in cases:
+        seconds = _best_of(1 if args.quick else args.repeat, lambda: run(n_workers, interleaved))
+        results[f"studies/{name.replace(' ', '/')}"] = {"seconds": seconds}
+        print(f"{name:>26} | {seconds:>8.3f} | {n_studies * n_calls / seconds:>13.1f}")
+
+
+_COLD_LOAD = """
+import json, os, sys, time
+sys.path.insert(0, {src!r})
+import pythonnet
+pythonnet.load(os.environ.get("PYTHONNET_RUNTIME", "coreclr"))
+import clr
+start = time.perf_counter()
+import opt_helpers
+helpers = time.perf_counter() - start
+imported = "skopt" in sys.modules or "sklearn" in sys.modules
+start = time.perf_counter()
+import forest
+print(json.dumps({{"opt_helpers": helpers, "forest": time.perf_counter() - start, "imported": imported}}))
+"""
+
+
+def bench_startup(args, results):
+    repeat = 1 if args.quick else args.repeat
+    print(f"{'case':>21} | {'ms':>8}")
+
+    # a fresh interpreter per run, the first load pays for importing skopt and sklearn
+    cold = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _COLD_LOAD.format(src=SRC)], capture_output=True, text=True, check=True).stdout
+        cold.append(json.loads(output.strip().splitlines()[-1]))
+    for module in ("opt_helpers", "forest"):
+        seconds = min(run[module] for run in cold)
+        results[f"startup/cold/{module}"] = {"seconds": seconds}
+        print(f"{'cold ' + module:>21} | {seconds * 1e3:>8.2f}")
+    print(f"skopt or sklearn imported by opt_helpers: {cold[0]['imported']}")
+
+    # what every PyOptimization, callback and OptimizeResult paid before the modules were shared
+    number = 5 if args.quick else 20
+    for module in ("opt_helpers", "forest"):
+        path = os.path.join(SRC, module + ".py")
+        with open(path) as f:
+            source = f.read()
+        seconds = _best_of(repeat, lambda: exec(compile(source, path, "exec"), types.ModuleType(module).__dict__), number)
+        results[f"startup/execute/{module}"] = {"seconds": seconds}
+        print(f"{'execute ' + module:>21} | {seconds * 1e3:>8.2f}")
+
+
+def _metadata():
+    import sklearn
+    import skopt
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "skopt": skopt.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(baseline_path, results, tolerance):
+    """Prints the ratio of every case against the baseline, returns the cases that regressed."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    print(f"{'case':<55} | {'baseline':>10} | {'current':>10} | {'ratio':>6}")
+    for case, current in sorted(results.items()):
+        if case not in baseline:
+            continue
+        before, after = baseline[case]["seconds"], current["seconds"]
+        ratio = after / before if before > 0 else float("inf")
+        regressed = ratio > 1 + tolerance
+        if regressed:
+            regressions.append(case)
+        print(f"{case:<55} | {before:>10.6f} | {after:>10.6f} | {ratio:>5.2f}x{' REGRESSED' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", default=",".join(SECTIONS), help="comma separated sections to run")
+    parser.add_argument("--quick", action="store_true", help="smaller grids, for a sanity check")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--n_samples", type=int, default=500, help="observations the predict surrogates are fit on")
+    parser.add_argument("--n_points", type=int, default=2000, help="candidates per iteration in the minimize section")
+    parser.add_argument("--save", help="write the results to this json file")
+    parser.add_argument("--compare", help="baseline json to compare the results against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline, 0.25 is 25%%")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    sections = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    results = {}
+    helpers = _load_helpers() if {"unbox", "wrapper", "acquisition", "studies", "startup"} & set(sections) else None
+    for section in sections:
+        print(f"\n== {section}")
+        if section == "predict":
+            bench_predict(args, results)
+        elif section == "fit":
+            bench_fit(args, results)
+        elif section == "categorical":
+            bench_categorical(args, results)
+        elif section == "minimize":
+            bench_minimize(args, results)
+        elif helpers is None:
+            continue
+        elif section == "startup":
+            bench_startup(args, results)
+        elif section == "acquisition":
+            bench_acquisition(args, results, helpers)
+        elif section == "studies":
+            bench_studies(args, results, helpers)
+        else:
+            (bench_unbox if section == "unbox" else bench_wrapper)(args, results, helpers)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"metadata": _metadata(), "results": results}, f, indent=2, sort_keys=True)
+        print(f"\nsaved {len(results)} results to {args.save}")
+
+    if args.compare:
+        print()
+        regressions = compare(args.compare, results, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regressions over {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
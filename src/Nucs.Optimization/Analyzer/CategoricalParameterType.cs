@@ -14,6 +14,8 @@ public class CategoricalParameterType<T> : CategoricalParameterType {
     public override object[] ObjectValues => ((CategoricalSpace<T>) Space).ObjectCategories;
 
     internal readonly Delegate AssignPointer;
+    private string[]? _enumCodes;
+    private T[]? _codes;
 
     public void Assign<TParams>(TParams parameters, T value) {
         ((CategoricalParameterType<T>.AssignDelegate<TParams>) AssignPointer)(parameters, value);
@@ -28,6 +30,20 @@ public class CategoricalParameterType<T> : CategoricalParameterType {
             ((CategoricalParameterType<T>.AssignDelegate<TParams>) AssignPointer)(parameters, (T) Convert.ChangeType(value, typeof(T)));
     }
 
+    public override void AssignReal<TParams>(TParams parameters, double value) {
+        throw new NotSupportedException($"Categorical parameter {Name} is passed as a code, not as a real value.");
+    }
+
+    public override void AssignInteger<TParams>(TParams parameters, long value) {
+        if (IsEnum) {
+            _enumCodes ??= ObjectValues.Cast<string>().ToArray();
+            ((CategoricalParameterType<string>.AssignDelegate<TParams>) AssignPointer)(parameters, _enumCodes[value]);
+        } else {
+            _codes ??= ObjectValues.Select(v => v is T tval ? tval : (T) Convert.ChangeType(v, typeof(T))).ToArray();
+            ((CategoricalParameterType<T>.AssignDelegate<TParams>) AssignPointer)(parameters, _codes[value]);
+        }
+    }
+
     public CategoricalParameterType(string name, TypeCode type, Delegate assignPointer, DimensionAttribute space) : base(name, type, space) {
         AssignPointer = assignPointer;
     }
@@ -29,6 +29,14 @@ public class NumericalParameterType<T> : NumericalParameterType where T : INumbe
             }
     }
 
+    public override void AssignReal<TParams>(TParams parameters, double value) {
+        ((NumericalParameterType<T>.AssignDelegate<TParams>) AssignPointer)(parameters, T.CreateChecked(value));
+    }
+
+    public override void AssignInteger<TParams>(TParams parameters, long value) {
+        ((NumericalParameterType<T>.AssignDelegate<TParams>) AssignPointer)(parameters, T.CreateChecked(value));
+    }
+
     public NumericalParameterType(string name, TypeCode type, Delegate assignPointer, DimensionAttribute space) : base(name, type, space) {
         AssignPointer = assignPointer;
     }
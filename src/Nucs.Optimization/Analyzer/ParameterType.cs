@@ -13,6 +13,16 @@ public abstract class ParameterType {
 
     public abstract void Assign<TParams>(TParams parameters, object value);
 
+    /// <summary>
+    ///     Assigns a value read from the float64 buffer of the columnar layout.
+    /// </summary>
+    public abstract void AssignReal<TParams>(TParams parameters, double value);
+
+    /// <summary>
+    ///     Assigns a value read from the int64 buffer of the columnar layout. For categorical parameters the value is the category's code.
+    /// </summary>
+    public abstract void AssignInteger<TParams>(TParams parameters, long value);
+
     protected ParameterType(string name, TypeCode type, DimensionAttribute space) {
         Space = space;
         Name = name;
@@ -9,6 +9,27 @@ public static class ParametersAnalyzer<TParams> where TParams : class, new() {
     public static string[] ParameterNames;
     public static int ParametersCount => Parameters.Count;
 
+    /// <summary>
+    ///     Index of each parameter (in <see cref="ParameterNames"/> order) inside the float64 or the int64 buffer of the columnar layout.
+    ///     Floating numerical parameters are stored in the float64 buffer, integer numerical parameters and categorical codes in the int64 buffer.
+    /// </summary>
+    public static int[] ColumnarSlots;
+
+    /// <summary>
+    ///     Whether each parameter (in <see cref="ParameterNames"/> order) is stored in the float64 buffer of the columnar layout.
+    /// </summary>
+    public static bool[] ColumnarIsReal;
+
+    /// <summary>
+    ///     Length of the float64 buffer of the columnar layout.
+    /// </summary>
+    public static int RealsCount;
+
+    /// <summary>
+    ///     Length of the int64 buffer of the columnar layout.
+    /// </summary>
+    public static int IntegersCount;
+
     #if DEBUG
     public static void Initialize() {
         #else
@@ -134,6 +155,14 @@ public static class ParametersAnalyzer<TParams> where TParams : class, new() {
 
         ParameterNames = Parameters.Select(s => s.Key).ToArray();
         ParameterValues = Parameters.Select(s => s.Value).ToArray();
+
+        //columnar layout, has to match opt_helpers.ColumnarLayout
+        ColumnarSlots = new int[ParameterValues.Length];
+        ColumnarIsReal = new bool[ParameterValues.Length];
+        for (var i = 0; i < ParameterValues.Length; i++) {
+            ColumnarIsReal[i] = ParameterValues[i] is NumericalParameterType { IsFloating: true };
+            ColumnarSlots[i] = ColumnarIsReal[i] ? RealsCount++ : IntegersCount++;
+        }
     }
 
     private static TypeCode GetPrimitiveTypeCode(Type type) {
@@ -197,4 +226,35 @@ public static class ParametersAnalyzer<TParams> where TParams : class, new() {
         Apply(parameters, values);
         return parameters;
     }
+
+    /// <summary>
+    ///     Applies a point in the columnar layout (see <see cref="ColumnarSlots"/>) to <see cref="TParams"/>.
+    /// </summary>
+    public static void Apply(TParams parameters, ReadOnlySpan<double> reals, ReadOnlySpan<long> integers) {
+        for (var i = 0; i < ParameterValues.Length; i++) {
+            if (ColumnarIsReal[i])
+                ParameterValues[i].AssignReal(parameters, reals[ColumnarSlots[i]]);
+            else
+                ParameterValues[i].AssignInteger(parameters, integers[ColumnarSlots[i]]);
+        }
+    }
+
+    /// <summary>
+    ///     Populates a point in the columnar layout (see <see cref="ColumnarSlots"/>) to <see cref="TParams"/>.
+    /// </summary>
+    public static TParams Populate(ReadOnlySpan<double> reals, ReadOnlySpan<long> integers) {
+        var parameters = new TParams();
+        Apply(parameters, reals, integers);
+        return parameters;
+    }
+
+    /// <summary>
+    ///     Populates <paramref name="count"/> points stored row-major in the columnar layout (see <see cref="ColumnarSlots"/>) to <see cref="TParams"/>.
+    /// </summary>
+    public static TParams[] Populate(ReadOnlySpan<double> reals, ReadOnlySpan<long> integers, int count) {
+        var populated = new TParams[count];
+        for (var i = 0; i < count; i++)
+            populated[i] = Populate(reals.Slice(i * RealsCount, RealsCount), integers.Slice(i * IntegersCount, IntegersCount));
+        return populated;
+    }
 }
\ No newline at end of file
@@ -1,3 +1,4 @@
+using Nucs.Optimization.Helper;
 using Python.Runtime;
 
 namespace Nucs.Optimization.Callbacks;
@@ -9,10 +10,19 @@ public class DeltaYStopper : PyOptCallback {
     public readonly double DeltaY;
     public readonly int NBest;
 
+    /// <summary>
+    ///     skopt's DeltaYStopper of <paramref name="skopt"/>, which sorts all the scores every iteration.
+    /// </summary>
     public DeltaYStopper(PyModule skopt, double deltaY, int nBest = 5) : base(skopt, nameof(DeltaYStopper), Py.kw("delta", deltaY, "n_best", nBest)) {
         DeltaY = deltaY;
         NBest = nBest;
     }
 
-    public DeltaYStopper(double deltaY, int nBest = 5) : this((PyModule) PyModule.Import("skopt"), deltaY, nBest) { }
-}
\ No newline at end of file
+    /// <summary>
+    ///     Keeps the <paramref name="nBest"/> lowest scores as they are told instead of sorting all of them every iteration, see DeltaYStopper in opt_helpers.py.
+    /// </summary>
+    public DeltaYStopper(double deltaY, int nBest = 5) : base(EmbeddedModules.Helper.GetAttr(nameof(DeltaYStopper)).Invoke(Array.Empty<PyObject>(), Py.kw("delta", deltaY, "n_best", nBest))) {
+        DeltaY = deltaY;
+        NBest = nBest;
+    }
+}
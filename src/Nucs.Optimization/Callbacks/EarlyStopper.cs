@@ -18,20 +18,19 @@ public class EarlyStopper<TParams> : PyOptCallback where TParams : class, new()
         _maximize = maximize;
         _helperModule = helperModule;
         Callback = callback;
-        This = helperModule.Get("EarlyStopperWrapper").Invoke(Array.Empty<PyObject>(), Py.kw("callback", UnboxResults));
+        This = helperModule.GetAttr("EarlyStopperWrapper").Invoke(Array.Empty<PyObject>(), Py.kw("callback", UnboxResults, "columnar", true));
     }
 
-    public EarlyStopper(bool maximize, StopConditionDelegate callback) : this(PyModule.FromString("helper", EmbeddedResourceHelper.ReadEmbeddedResource("opt_helpers.py")!), maximize, callback) { }
+    public EarlyStopper(bool maximize, StopConditionDelegate callback) : this(EmbeddedModules.Helper, maximize, callback) { }
 
-    private bool? UnboxResults(dynamic result) {
-        dynamic _helper = _helperModule;
-
-        PyObject recentIter = result.x_iters[result.x_iters.__len__() - 1];
-        //recentIter = recentIter[recentIter.InvokeMethod("__len__").ToInt32(CultureInfo.InvariantCulture) - 1];
-        var parameters = ParametersAnalyzer<TParams>.Populate(values: (List<Tuple<string, object>>) _helper.unbox_params(ParametersAnalyzer<TParams>.ParameterNames, recentIter)
-                                                                                                           .AsManagedObject(typeof(List<Tuple<string, object>>)));
-        var score = (_maximize ? -1 : 1) * (double) result.func_vals[result.func_vals.__len__() - 1];
-        //unbox results
+    /// <summary>
+    ///     Receives every point told since the last call, one at a time in the columnar layout with its score, see EarlyStopperWrapper in opt_helpers.py.
+    /// </summary>
+    private unsafe bool? UnboxResults(long reals, long integers, double score) {
+        var parameters = ParametersAnalyzer<TParams>.Populate(new ReadOnlySpan<double>((void*) reals, ParametersAnalyzer<TParams>.RealsCount),
+                                                              new ReadOnlySpan<long>((void*) integers, ParametersAnalyzer<TParams>.IntegersCount));
+        //scores are adjusted to the polarity of the goal
+        score *= _maximize ? -1 : 1;
         return Callback(parameters, score);
     }
 }
\ No newline at end of file
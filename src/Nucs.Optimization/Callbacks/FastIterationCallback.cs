@@ -14,10 +14,10 @@ public class FastIterationCallback<TParams> : PyOptCallback where TParams : clas
 
     public FastIterationCallback(PyModule helperModule, StopConditionDelegate callback) {
         Callback = callback;
-        This = helperModule.Get("EarlyStopperWrapper").Invoke(Array.Empty<PyObject>(), Py.kw("callback", UnboxResults));
+        This = helperModule.GetAttr("EarlyStopperWrapper").Invoke(Array.Empty<PyObject>(), Py.kw("callback", UnboxResults));
     }
 
-    public FastIterationCallback(StopConditionDelegate callback) : this(PyModule.FromString("helper", EmbeddedResourceHelper.ReadEmbeddedResource("opt_helpers.py")!), callback) { }
+    public FastIterationCallback(StopConditionDelegate callback) : this(EmbeddedModules.Helper, callback) { }
 
     private bool? UnboxResults(PyObject result) {
         Callback(++_iteration);
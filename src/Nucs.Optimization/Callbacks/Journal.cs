@@ -0,0 +1,54 @@
+using Nucs.Optimization.Helper;
+using Python.Runtime;
+
+namespace Nucs.Optimization.Callbacks;
+
+/// <summary>
+///     Appends one record per evaluation (parameters, score, timing) to a journal file, fsynced every <see cref="FsyncEvery"/> records.
+///     Pass it to Search/SearchAll/SearchTop as journal, the journaled evaluations are told to the optimizer instead of being re-evaluated when <see cref="Resume"/> is set.
+/// </summary>
+public class Journal : PyOptCallback {
+    public readonly FileInfo Path;
+    public readonly bool Resume;
+    public readonly int FsyncEvery;
+
+    public Journal(PyModule helperModule, FileInfo path, bool resume = true, int fsyncEvery = 10) {
+        Path = path;
+        Resume = resume;
+        FsyncEvery = fsyncEvery;
+        Directory.CreateDirectory(path.Directory!.FullName);
+        This = helperModule.Get(nameof(Journal)).Invoke(Array.Empty<PyObject>(), Py.kw("path", path.FullName, "fsync_every", fsyncEvery));
+    }
+
+    public Journal(FileInfo path, bool resume = true, int fsyncEvery = 10) : this(EmbeddedModules.Helper, path, resume, fsyncEvery) { }
+
+    /// <summary>
+    ///     Starts a new run.
+    /// </summary>
+    /// <returns>The journaled points and minimized scores as python lists (x0, y0), None when there is nothing to resume, and their count.</returns>
+    internal (PyObject X0, PyObject Y0, int Resumed) Begin() {
+        using var begun = This.InvokeMethod("begin", Resume.ToPython());
+        var x0 = begun[0];
+        var y0 = begun[1];
+        var resumed = (int) y0.Length();
+        if (resumed == 0) {
+            x0.Dispose();
+            y0.Dispose();
+            return (PyObject.None, PyObject.None, 0);
+        }
+
+        return (x0, y0, resumed);
+    }
+
+    /// <summary>
+    ///     The next <paramref name="count"/> points told to the optimizer are not journaled, see <see cref="WarmStart"/>.
+    /// </summary>
+    internal void Skip(int count) {
+        This.InvokeMethod("skip", new PyInt(count)).Dispose();
+    }
+
+    public override void Dispose() {
+        This?.InvokeMethod("close").Dispose();
+        base.Dispose();
+    }
+}
@@ -16,7 +16,7 @@ public abstract class PyOptCallback : IDisposable {
 
     protected PyOptCallback() { }
 
-    public void Dispose() {
+    public virtual void Dispose() {
         This?.Dispose();
     }
 }
\ No newline at end of file
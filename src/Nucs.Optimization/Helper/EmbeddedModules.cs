@@ -0,0 +1,57 @@
+using System.Threading;
+using Python.Runtime;
+
+namespace Nucs.Optimization.Helper;
+
+/// <summary>
+///     The embedded python scripts, compiled once per python engine and shared by every optimization, callback and result.
+///     The modules must not be disposed by their users. Access with the GIL held.
+/// </summary>
+public static class EmbeddedModules {
+    private static readonly object _sync = new object();
+    private static PyModule? _helper;
+    private static PyModule? _forest;
+
+    /// <summary>
+    ///     opt_helpers.py, loading it does not import skopt or sklearn.
+    /// </summary>
+    public static PyModule Helper => _helper ?? Load(ref _helper, "helper", "opt_helpers.py");
+
+    /// <summary>
+    ///     forest.py, loading it imports sklearn: its surrogates derive from sklearn's forests, only opt_helpers.py defers its imports.
+    /// </summary>
+    public static PyModule Forest => _forest ?? Load(ref _forest, "forest", "forest.py");
+
+    private static PyModule Load(ref PyModule? module, string name, string resourceName) {
+        //the GIL is released while waiting, the thread loading may need it back to finish importing
+        if (!Monitor.TryEnter(_sync)) {
+            var state = PythonEngine.BeginAllowThreads();
+            try {
+                Monitor.Enter(_sync);
+            } finally {
+                PythonEngine.EndAllowThreads(state);
+            }
+        }
+
+        try {
+            if (module != null)
+                return module;
+
+            var loaded = PyModule.FromString(name, EmbeddedResourceHelper.ReadEmbeddedResource(resourceName)!);
+            PythonEngine.AddShutdownHandler(Reset);
+            return module = loaded;
+        } finally {
+            Monitor.Exit(_sync);
+        }
+    }
+
+    /// <summary>
+    ///     Forgets the modules of an engine that is shutting down, the next access compiles them again.
+    /// </summary>
+    private static void Reset() {
+        lock (_sync) {
+            _helper = null;
+            _forest = null;
+        }
+    }
+}
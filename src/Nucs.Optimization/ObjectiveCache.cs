@@ -0,0 +1,70 @@
+using Nucs.Optimization.Helper;
+using Python.Runtime;
+
+namespace Nucs.Optimization;
+
+/// <summary>
+///     Memoizes score function results keyed on the parameters, so points the optimizer proposes again are not re-evaluated.
+///     Wraps opt_helpers.ObjectiveCache, pass it to the optimizer's constructor.
+/// </summary>
+public class ObjectiveCache : IDisposable {
+    public readonly PyObject This;
+
+    /// <summary>
+    ///     The maximum number of scores kept in memory, least recently used are evicted first. null for unbounded.
+    /// </summary>
+    public readonly int? MaxSize;
+
+    /// <summary>
+    ///     Real parameters are rounded to this many decimals before looking up. null to match exact values.
+    /// </summary>
+    public readonly int? Decimals;
+
+    /// <summary>
+    ///     SQLite database that persists all scores between runs. null for an in-memory cache.
+    ///     A database should only be shared between runs of the same score function and parameters.
+    /// </summary>
+    public readonly FileInfo? Path;
+
+    public ObjectiveCache(PyModule helperModule, int? maxSize = null, int? decimals = null, FileInfo? path = null) {
+        MaxSize = maxSize;
+        Decimals = decimals;
+        Path = path;
+        if (path != null)
+            Directory.CreateDirectory(path.Directory!.FullName);
+
+        This = helperModule.Get("ObjectiveCache").Invoke(Array.Empty<PyObject>(), Py.kw("max_size", maxSize != null ? new PyInt(maxSize.Value) : PyObject.None,
+                                                                                        "decimals", decimals != null ? new PyInt(decimals.Value) : PyObject.None,
+                                                                                        "path", path != null ? new PyString(path.FullName) : PyObject.None));
+    }
+
+    public ObjectiveCache(int? maxSize = null, int? decimals = null, FileInfo? path = null)
+        : this(EmbeddedModules.Helper, maxSize, decimals, path) { }
+
+    /// <summary>
+    ///     Lookups answered from the cache.
+    /// </summary>
+    public long Hits => This.GetAttr("hits").As<long>();
+
+    /// <summary>
+    ///     Lookups that had to call the score function.
+    /// </summary>
+    public long Misses => This.GetAttr("misses").As<long>();
+
+    /// <summary>
+    ///     Number of cached scores, including persisted ones.
+    /// </summary>
+    public int Count => (int) This.Length();
+
+    /// <summary>
+    ///     Removes all cached scores, persisted ones included, and resets the counters.
+    /// </summary>
+    public void Clear() {
+        This.InvokeMethod("clear").Dispose();
+    }
+
+    public void Dispose() {
+        This.InvokeMethod("close").Dispose();
+        This.Dispose();
+    }
+}
@@ -0,0 +1,80 @@
+using Nucs.Optimization.Callbacks;
+using Nucs.Optimization.Helper;
+using Python.Runtime;
+
+namespace Nucs.Optimization;
+
+/// <summary>
+///     A compact history of every evaluation, recorded as a callback into a numpy structured array (opt_helpers.History).
+///     Parameters are only materialized for the rows that are read.
+/// </summary>
+/// <typeparam name="TParams">The parameters the optimization uses</typeparam>
+public class OptimizationHistory<TParams> : PyOptCallback where TParams : class, new() {
+    protected readonly bool _maximize;
+
+    /// <summary>
+    ///     The file backing the history as a numpy.memmap, null when kept in memory.
+    /// </summary>
+    public readonly FileInfo? Path;
+
+    public OptimizationHistory(PyModule helperModule, bool maximize, FileInfo? path = null, int capacity = 1024) {
+        _maximize = maximize;
+        Path = path;
+        if (path != null)
+            Directory.CreateDirectory(path.Directory!.FullName);
+
+        This = helperModule.Get("History").Invoke(Array.Empty<PyObject>(), Py.kw("path", path != null ? new PyString(path.FullName) : PyObject.None, "capacity", capacity));
+    }
+
+    public OptimizationHistory(bool maximize, FileInfo? path = null, int capacity = 1024)
+        : this(EmbeddedModules.Helper, maximize, path, capacity) { }
+
+    /// <summary>
+    ///     Number of recorded evaluations.
+    /// </summary>
+    public int Count => (int) This.Length();
+
+    /// <summary>
+    ///     The structured array of recorded rows, one column per parameter plus score (minimized) and timestamp.
+    /// </summary>
+    public PyObject Data => This.GetAttr("data");
+
+    /// <summary>
+    ///     The evaluation at <paramref name="index"/> in the order they were recorded.
+    /// </summary>
+    public (TParams Parameters, double Score) this[int index] => Read(index, 1)[0];
+
+    /// <summary>
+    ///     Reads <paramref name="count"/> evaluations starting at <paramref name="start"/> in the order they were recorded.
+    /// </summary>
+    public (TParams Parameters, double Score)[] Read(int start, int count) {
+        if (start < 0 || count < 0 || start + count > Count)
+            throw new ArgumentOutOfRangeException(nameof(start), $"Range {start}..{start + count} is out of the {Count} recorded evaluations.");
+
+        using dynamic np = PyModule.Import("numpy");
+        using PyObject indices = np.arange(start, start + count);
+        return Read(indices);
+    }
+
+    /// <summary>
+    ///     The <paramref name="k"/> best evaluations, best first.
+    /// </summary>
+    public (TParams Parameters, double Score)[] Top(int k) {
+        using var indices = This.InvokeMethod("top", new PyInt(k));
+        return Read(indices);
+    }
+
+    private (TParams Parameters, double Score)[] Read(PyObject indices) {
+        using var columns = This.InvokeMethod("rows", indices);
+        var (parameters, scores) = OptimizeResult<TParams>.UnboxColumns(columns, _maximize);
+        var rows = new (TParams Parameters, double Score)[scores.Length];
+        for (var i = 0; i < rows.Length; i++)
+            rows[i] = (parameters[i], scores[i]);
+        return rows;
+    }
+
+    public override void Dispose() {
+        This?.InvokeMethod("flush").Dispose();
+        base.Dispose();
+    }
+}
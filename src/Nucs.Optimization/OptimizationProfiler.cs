@@ -0,0 +1,115 @@
+using Nucs.Optimization.Callbacks;
+using Nucs.Optimization.Helper;
+using Python.Runtime;
+
+namespace Nucs.Optimization;
+
+/// <summary>
+///     Where the time of an iteration, or of a whole run, went.
+/// </summary>
+/// <param name="Evaluations">Score function calls, cached scores excluded.</param>
+/// <param name="Total">Wall time from the end of the previous iteration.</param>
+/// <param name="Objective">Time spent inside the score function.</param>
+/// <param name="Marshal">Packing points and calling between python and .NET, the score function excluded.</param>
+/// <param name="Fit">Fitting the surrogate model, constant liar fits included.</param>
+/// <param name="Acquisition">Drawing candidates and optimizing the acquisition function over them.</param>
+/// <param name="Other">The rest of <paramref name="Total"/>: ask/tell bookkeeping, callbacks and the optimization loop.</param>
+public readonly record struct IterationProfile(int Evaluations, TimeSpan Total, TimeSpan Objective, TimeSpan Marshal, TimeSpan Fit, TimeSpan Acquisition, TimeSpan Other);
+
+/// <summary>
+///     The phases of a whole run summed, see <see cref="IterationProfile"/>.
+/// </summary>
+public readonly record struct ProfileSummary(int Iterations, int Evaluations, TimeSpan Total, TimeSpan Objective, TimeSpan Marshal, TimeSpan Fit, TimeSpan Acquisition, TimeSpan Other) {
+    /// <summary>
+    ///     Reads a summary from the dictionary of opt_helpers.Profiler.summary.
+    /// </summary>
+    internal static ProfileSummary From(dynamic summary) {
+        return new ProfileSummary((int) summary["iterations"], (int) summary["evaluations"],
+                                  TimeSpan.FromSeconds((double) summary["total"]), TimeSpan.FromSeconds((double) summary["objective"]),
+                                  TimeSpan.FromSeconds((double) summary["marshal"]), TimeSpan.FromSeconds((double) summary["fit"]),
+                                  TimeSpan.FromSeconds((double) summary["acquisition"]), TimeSpan.FromSeconds((double) summary["other"]));
+    }
+}
+
+/// <summary>
+///     Records the time every iteration spends in the score function, marshaling, surrogate fitting and acquisition (opt_helpers.Profiler).
+///     Pass it with the callbacks of a search, the summary is also attached to <see cref="OptimizeResult{TParams}.Profile"/>.
+///     Fit and acquisition are measured for optimizers with a surrogate, which run through batch_minimize while profiled.
+/// </summary>
+public class OptimizationProfiler : PyOptCallback {
+    /// <summary>
+    ///     Address of the float64 the score function time is accumulated into, in seconds.
+    /// </summary>
+    internal readonly long ObjectiveSeconds;
+
+    /// <summary>
+    ///     Directory the cProfile stats of the profiled iterations are dumped to as iteration_n.prof, null to keep them in memory only.
+    /// </summary>
+    public readonly DirectoryInfo? ProfilePath;
+
+    /// <param name="profileIterations">1-based iterations to run under cProfile, see <see cref="Report"/>.</param>
+    /// <param name="profilePath">Directory to dump the cProfile stats of every profiled iteration to.</param>
+    public OptimizationProfiler(PyModule helperModule, IEnumerable<int>? profileIterations = null, DirectoryInfo? profilePath = null) {
+        ProfilePath = profilePath;
+        This = helperModule.Get("Profiler").Invoke(Array.Empty<PyObject>(), Py.kw("profile_iterations", profileIterations != null ? profileIterations.ToPyList() : PyObject.None,
+                                                                                  "profile_path", profilePath != null ? new PyString(profilePath.FullName) : PyObject.None));
+        using dynamic managed = This.GetAttr("managed");
+        ObjectiveSeconds = (long) managed.ctypes.data;
+    }
+
+    public OptimizationProfiler(IEnumerable<int>? profileIterations = null, DirectoryInfo? profilePath = null)
+        : this(EmbeddedModules.Helper, profileIterations, profilePath) { }
+
+    /// <summary>
+    ///     The phases of the last run summed.
+    /// </summary>
+    public ProfileSummary Summary {
+        get {
+            using var summary = This.InvokeMethod("summary");
+            return ProfileSummary.From(summary);
+        }
+    }
+
+    /// <summary>
+    ///     Every iteration of the last run, in order.
+    /// </summary>
+    public unsafe IterationProfile[] Iterations {
+        get {
+            using dynamic table = This.InvokeMethod("table");
+            var rows = (int) table.shape[0];
+            var columns = (int) table.shape[1];
+            var values = new ReadOnlySpan<double>((void*) (long) table.ctypes.data, rows * columns);
+            var iterations = new IterationProfile[rows];
+            for (int i = 0; i < rows; i++) {
+                var row = values.Slice(i * columns, columns);
+                iterations[i] = new IterationProfile((int) row[0], TimeSpan.FromSeconds(row[1]), TimeSpan.FromSeconds(row[2]), TimeSpan.FromSeconds(row[3]),
+                                                     TimeSpan.FromSeconds(row[4]), TimeSpan.FromSeconds(row[5]), TimeSpan.FromSeconds(row[6]));
+            }
+
+            return iterations;
+        }
+    }
+
+    /// <summary>
+    ///     The cProfile stats of the profiled iterations merged and sorted by cumulative time, null when no iteration was profiled.
+    /// </summary>
+    /// <param name="lines">Number of functions to list.</param>
+    public string? Report(int lines = 30) {
+        using var report = This.InvokeMethod("report", new PyInt(lines));
+        return report.IsNone() ? null : report.As<string>();
+    }
+
+    /// <summary>
+    ///     Starts timing a run.
+    /// </summary>
+    internal void Begin() {
+        This.InvokeMethod("begin").Dispose();
+    }
+
+    /// <summary>
+    ///     Ends a run.
+    /// </summary>
+    internal void End() {
+        This.InvokeMethod("end").Dispose();
+    }
+}
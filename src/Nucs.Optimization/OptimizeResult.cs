@@ -26,21 +26,33 @@ public class OptimizeResult<TParams> where TParams : class, new() {
     /// </summary>
     public (TParams Parameters, double Score)[] Iterations { get; }
 
+    /// <summary>
+    ///     Where the time of the run went, when it was profiled with an <see cref="OptimizationProfiler"/>.
+    /// </summary>
+    public ProfileSummary? Profile { get; }
+
     public OptimizeResult(dynamic result, bool maximize, bool? descending = null) {
-        using dynamic helper = PyModule.FromString("helper", EmbeddedResourceHelper.ReadEmbeddedResource("opt_helpers.py")!);
-        BestScore = ((double) result.fun) * (maximize ? -1 : 1);
-        Best = ParametersAnalyzer<TParams>.Populate((List<Tuple<string, object>>) helper.unbox_params(ParametersAnalyzer<TParams>.ParameterNames, result.x)
-                                                                                        .AsManagedObject(typeof(List<Tuple<string, object>>)));
-        var results = (int) result.func_vals.__len__();
-        Iterations = new (TParams Parameters, double Score)[results];
-        for (var i = 0; i < results; i++) {
-            var score = ((double) result.func_vals[i]) * (maximize ? -1 : 1);
-            var parameters = ParametersAnalyzer<TParams>.Populate((List<Tuple<string, object>>) helper.unbox_params(ParametersAnalyzer<TParams>.ParameterNames, result.x_iters[i])
-                                                                                                      .AsManagedObject(typeof(List<Tuple<string, object>>)));
-            Iterations[i] = (parameters, score);
+        dynamic helper = EmbeddedModules.Helper;
+        (TParams[] parameters, double[] scores) = ((TParams[], double[])) Unbox(helper, result, maximize);
+
+        //result.x is the first occurrence of the lowest minimized score
+        var best = 0;
+        for (var i = 1; i < scores.Length; i++) {
+            if (maximize ? scores[i] > scores[best] : scores[i] < scores[best])
+                best = i;
         }
 
+        Best = parameters[best];
+        BestScore = scores[best];
+        Iterations = new (TParams Parameters, double Score)[scores.Length];
+        for (var i = 0; i < scores.Length; i++)
+            Iterations[i] = (parameters[i], scores[i]);
+
         Array.Sort(Iterations, (descending ?? maximize) ? (lhs, rhs) => rhs.Score.CompareTo(lhs.Score) : (lhs, rhs) => lhs.Score.CompareTo(rhs.Score));
+
+        using PyObject profile = ((PyObject) result).InvokeMethod("get", new PyString("profile"));
+        if (!profile.IsNone())
+            Profile = ProfileSummary.From(profile);
     }
 
     public OptimizeResult(TParams best, double bestScore, (TParams Parameters, double Score)[] iterations) {
@@ -48,4 +60,36 @@ public class OptimizeResult<TParams> where TParams : class, new() {
         BestScore = bestScore;
         Iterations = iterations;
     }
+
+    /// <summary>
+    ///     Converts the iterations of a python OptimizeResult in bulk using opt_helpers.columnar_results.
+    ///     Scores are returned in the polarity of the goal.
+    /// </summary>
+    /// <param name="top">When specified, only the <paramref name="top"/> best iterations are converted, in no particular order.</param>
+    internal static (TParams[] Parameters, double[] Scores) Unbox(dynamic helper, dynamic result, bool maximize, int? top = null) {
+        using PyObject columns = helper.columnar_results(result, top: top != null ? new PyInt(top.Value) : PyObject.None);
+        return UnboxColumns(columns, maximize);
+    }
+
+    /// <summary>
+    ///     Converts a (reals, integers, scores) tuple of row-major buffers in the columnar layout (see <see cref="ParametersAnalyzer{TParams}.ColumnarSlots"/>).
+    ///     Scores are returned in the polarity of the goal.
+    /// </summary>
+    internal static unsafe (TParams[] Parameters, double[] Scores) UnboxColumns(PyObject columns, bool maximize) {
+        using dynamic reals = columns[0];
+        using dynamic integers = columns[1];
+        using dynamic scores = columns[2];
+
+        var count = (int) scores.shape[0];
+        var parameters = ParametersAnalyzer<TParams>.Populate(new ReadOnlySpan<double>((void*) (long) reals.ctypes.data, count * ParametersAnalyzer<TParams>.RealsCount),
+                                                              new ReadOnlySpan<long>((void*) (long) integers.ctypes.data, count * ParametersAnalyzer<TParams>.IntegersCount), count);
+
+        var values = new ReadOnlySpan<double>((void*) (long) scores.ctypes.data, count).ToArray();
+        if (maximize) {
+            for (var i = 0; i < values.Length; i++)
+                values[i] = -values[i];
+        }
+
+        return (parameters, values);
+    }
 }
\ No newline at end of file
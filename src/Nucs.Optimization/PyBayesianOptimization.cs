@@ -35,22 +35,28 @@ public static class PyBayesianOptimization {
 /// </summary>
 /// <typeparam name="TParams">A class and new() for parameters</typeparam>
 public class PyBayesianOptimization<TParams> : PyOptimization<TParams> where TParams : class, new() {
-    public PyBayesianOptimization(ScoreFunctionDelegate blackBoxScoreFunction, bool maximize = false, FileInfo? dumpResults = null) : base(blackBoxScoreFunction, maximize, dumpResults) { }
+    public PyBayesianOptimization(ScoreFunctionDelegate blackBoxScoreFunction, bool maximize = false, FileInfo? dumpResults = null, ObjectiveCache? cache = null) : base(blackBoxScoreFunction, maximize, dumpResults, cache) { }
+
+    /// <summary>
+    ///     Optimizes an asynchronous score function. Only the evaluations of a batch overlap: with the default <see cref="BatchSearchOptions.BatchSize"/> of 1 every evaluation is awaited
+    ///     on the thread running the search before the next point is asked, pass a BatchSize > 1 for evaluations to run concurrently.
+    /// </summary>
+    public PyBayesianOptimization(AsyncScoreFunctionDelegate asyncScoreFunction, bool maximize = false, FileInfo? dumpResults = null, ObjectiveCache? cache = null) : base(asyncScoreFunction, maximize, dumpResults, cache) { }
+
+    public PyBayesianOptimization(BudgetedScoreFunctionDelegate budgetedScoreFunction, bool maximize = false, FileInfo? dumpResults = null, ObjectiveCache? cache = null) : base(budgetedScoreFunction, maximize, dumpResults, cache) { }
 
     public (double Score, TParams Parameters) Search(int n_calls, int n_random_starts, PyBayesianOptimization.InitialPointGenerator initial_point_generator = PyBayesianOptimization.InitialPointGenerator.random,
                                                      PyBayesianOptimization.AcqFunc acq_func = PyBayesianOptimization.AcqFunc.gp_hedge, PyBayesianOptimization.AcqOptimizer acq_optimizer = PyBayesianOptimization.AcqOptimizer.lbfgs,
-                                                     int? random_state = null, int n_points = 10000, int n_restarts_optimizer = 5, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null) {
-        return SearchTop(1, n_calls, n_random_starts, initial_point_generator, acq_func, acq_optimizer, random_state, n_points, n_restarts_optimizer, xi, kappa, verbose, callbacks)[0];
+                                                     int? random_state = null, int n_points = 10000, int n_restarts_optimizer = 5, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null, BatchSearchOptions? options = null) {
+        return SearchTop(1, n_calls, n_random_starts, initial_point_generator, acq_func, acq_optimizer, random_state, n_points, n_restarts_optimizer, xi, kappa, verbose, callbacks, options)[0];
     }
 
     public OptimizeResult<TParams> SearchAll(int n_calls, int n_random_starts, PyBayesianOptimization.InitialPointGenerator initial_point_generator = PyBayesianOptimization.InitialPointGenerator.random,
                                              PyBayesianOptimization.AcqFunc acq_func = PyBayesianOptimization.AcqFunc.gp_hedge, PyBayesianOptimization.AcqOptimizer acq_optimizer = PyBayesianOptimization.AcqOptimizer.lbfgs,
-                                             int? random_state = null, int n_points = 10000, int n_restarts_optimizer = 5, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null) {
+                                             int? random_state = null, int n_points = 10000, int n_restarts_optimizer = 5, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null, BatchSearchOptions? options = null) {
+        options ??= new BatchSearchOptions();
         using dynamic skopt = PyModule.Import("skopt");
-        var result = skopt.gp_minimize(wrappedScoreMethod, _searchSpace, n_calls: n_calls, n_random_starts: n_random_starts,
-                                       initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
-                                       acq_optimizer: acq_optimizer.AsString(), n_jobs: 1, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
-                                       n_points: n_points, n_restarts_optimizer: n_restarts_optimizer, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList());
+        var result = Minimize(skopt, n_calls, n_random_starts, initial_point_generator, acq_func, acq_optimizer, random_state, n_points, n_restarts_optimizer, xi, kappa, verbose, callbacks, options);
 
         TryDumpResults(skopt, result);
 
@@ -59,43 +65,69 @@ public class PyBayesianOptimization<TParams> : PyOptimization<TParams> where TPa
 
     public (double Score, TParams Parameters)[] SearchTop(int topResults, int n_calls, int n_random_starts, PyBayesianOptimization.InitialPointGenerator initial_point_generator = PyBayesianOptimization.InitialPointGenerator.random,
                                                           PyBayesianOptimization.AcqFunc acq_func = PyBayesianOptimization.AcqFunc.gp_hedge, PyBayesianOptimization.AcqOptimizer acq_optimizer = PyBayesianOptimization.AcqOptimizer.lbfgs,
-                                                          int? random_state = null, int n_points = 10000, int n_restarts_optimizer = 5, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null) {
+                                                          int? random_state = null, int n_points = 10000, int n_restarts_optimizer = 5, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null, BatchSearchOptions? options = null) {
+        options ??= new BatchSearchOptions();
         using dynamic skopt = PyModule.Import("skopt");
-        using dynamic np = PyModule.Import("numpy");
-        var result = skopt.gp_minimize(wrappedScoreMethod, _searchSpace, n_calls: n_calls, n_random_starts: n_random_starts,
-                                       initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
-                                       acq_optimizer: acq_optimizer.AsString(), n_jobs: 1, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
-                                       n_points: n_points, n_restarts_optimizer: n_restarts_optimizer, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList());
-        var scores = result.func_vals;
-        var scoreParameters = result.x_iters;
-
+        var result = Minimize(skopt, n_calls, n_random_starts, initial_point_generator, acq_func, acq_optimizer, random_state, n_points, n_restarts_optimizer, xi, kappa, verbose, callbacks, options);
         TryDumpResults(skopt, result);
 
-        int scoresCount = (int) scores.shape[0];
-        dynamic best; //numpy array of indices
-        if (topResults < scoresCount) {
-            best = np.argpartition(scores, topResults);
-        } else {
-            best = np.arange(scoresCount);
-        }
-
-        topResults = Math.Min(topResults, scoresCount);
-
-        var returns = new (double Score, TParams Parameters)[topResults];
-        for (int i = 0; i < returns.Length; i++) {
-            //unbox the best parameters
-            List<Tuple<string, object>> values = (List<Tuple<string, object>>) _helper.unbox_params(ParametersAnalyzer<TParams>.ParameterNames, scoreParameters[best[i]])
-                                                                                      .AsManagedObject(typeof(List<Tuple<string, object>>));
-            var bestParameters = ParametersAnalyzer<TParams>.Populate(values);
-
-            //adjust score polarity to the goal
-            double score = (double) scores[best[i]] * (_maximize ? -1 : 1);
-            returns[i] = (Score: score, Parameters: bestParameters);
-        }
+        //unbox the best parameters, scores are adjusted to the polarity of the goal
+        (TParams[] Parameters, double[] Scores) unboxed = OptimizeResult<TParams>.Unbox(_helper, result, _maximize, topResults);
+        var returns = new (double Score, TParams Parameters)[unboxed.Scores.Length];
+        for (int i = 0; i < returns.Length; i++)
+            returns[i] = (Score: unboxed.Scores[i], Parameters: unboxed.Parameters[i]);
 
         Array.Sort(returns, _maximize ? (lhs, rhs) => rhs.Score.CompareTo(lhs.Score) : (lhs, rhs) => lhs.Score.CompareTo(rhs.Score));
         
         //return the best score and the parameters
         return returns;
     }
+
+    /// <summary>
+    ///     Studies run on a gaussian process with the default gp_hedge acquisition function.
+    /// </summary>
+    protected internal override (PyObject Estimator, string AcqFunc) CreateStudyEstimator(int? random_state) {
+        return (new PyString("GP"), PyBayesianOptimization.AcqFunc.gp_hedge.AsString());
+    }
+
+    /// <summary>
+    ///     Runs gp_minimize, or batch_minimize when <see cref="BatchSearchOptions.BatchSize"/> is greater than 1 or the <paramref name="callbacks"/> include an <see cref="OptimizationProfiler"/>.
+    /// </summary>
+    /// <param name="options">Journal, warm start, budget and the other optional features of the run, see <see cref="BatchSearchOptions"/>.</param>
+    private dynamic Minimize(dynamic skopt, int n_calls, int n_random_starts, PyBayesianOptimization.InitialPointGenerator initial_point_generator, PyBayesianOptimization.AcqFunc acq_func,
+                             PyBayesianOptimization.AcqOptimizer acq_optimizer, int? random_state, int n_points, int n_restarts_optimizer, double xi, double kappa, bool verbose,
+                             IEnumerable<PyOptCallback>? callbacks, BatchSearchOptions options) {
+        var timed = acq_func is PyBayesianOptimization.AcqFunc.EIps or PyBayesianOptimization.AcqFunc.PIps;
+        if (timed && options.MinBudget != null)
+            throw new ArgumentException("EIps and PIps can not be used with a MinBudget.", nameof(acq_func));
+
+        var (x0, y0) = BeginJournal(options.Journal, ref callbacks, ref n_calls, ref n_random_starts);
+        BeginWarmStart(options.WarmStart, options.Journal, ref x0, ref y0, ref n_random_starts);
+        var timer = BeginTimer(timed, ref y0);
+        var profiler = BeginProfiler(callbacks);
+        if (options.MinBudget != null) {
+            using var budgetScoreMethod = WrapBudgetScoreMethod(options.NWorkers);
+            return _helper.budget_minimize(budgetScoreMethod, _searchSpace, base_estimator: "GP", n_calls: n_calls, n_initial_points: n_random_starts,
+                                           min_budget: options.MinBudget.Value, eta: options.Eta, hyperband: options.Hyperband,
+                                           initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
+                                           acq_optimizer: acq_optimizer.AsString(), n_jobs: 1, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
+                                           n_points: n_points, n_restarts_optimizer: n_restarts_optimizer, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList(),
+                                           strategy: options.Strategy.AsString(), x0: x0, y0: y0, profiler: profiler?.This ?? PyObject.None);
+        }
+
+        if (options.BatchSize > 1 || profiler != null) {
+            using var batchScoreMethod = WrapBatchScoreMethod(options.NWorkers, timer);
+            return _helper.batch_minimize(batchScoreMethod, _searchSpace, base_estimator: "GP", n_calls: n_calls, n_initial_points: n_random_starts,
+                                          initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
+                                          acq_optimizer: acq_optimizer.AsString(), n_jobs: 1, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
+                                          n_points: n_points, n_restarts_optimizer: n_restarts_optimizer, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList(),
+                                          batch_size: options.BatchSize, strategy: options.Strategy.AsString(), x0: x0, y0: y0, profiler: profiler?.This ?? PyObject.None);
+        }
+
+        using var timedScoreMethod = timer != null ? WrapScoreMethod(timer) : null;
+        return skopt.gp_minimize(timedScoreMethod ?? wrappedScoreMethod, _searchSpace, n_calls: n_calls, n_random_starts: n_random_starts,
+                                 initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
+                                 acq_optimizer: acq_optimizer.AsString(), n_jobs: 1, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
+                                 n_points: n_points, n_restarts_optimizer: n_restarts_optimizer, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList(), x0: x0, y0: y0);
+    }
 }
\ No newline at end of file
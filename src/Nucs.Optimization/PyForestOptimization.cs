@@ -27,7 +27,8 @@ public static class PyForestOptimization {
     public enum AcqOptimizer {
         sampling,
         lbfgs,
-        auto
+        auto,
+        local
     }
 
     public enum BaseEstimator {
@@ -43,32 +44,37 @@ public static class PyForestOptimization {
 public class PyForestOptimization<TParams> : PyOptimization<TParams> where TParams : class, new() {
     private readonly dynamic _forest;
 
-    public PyForestOptimization(ScoreFunctionDelegate blackBoxScoreFunction, bool maximize = false, FileInfo? dumpResults = null) : base(blackBoxScoreFunction, maximize, dumpResults) {
-        _forest = PyModule.FromString("forest", EmbeddedResourceHelper.ReadEmbeddedResource("forest.py")!);
+    public PyForestOptimization(ScoreFunctionDelegate blackBoxScoreFunction, bool maximize = false, FileInfo? dumpResults = null, ObjectiveCache? cache = null) : base(blackBoxScoreFunction, maximize, dumpResults, cache) {
+        _forest = EmbeddedModules.Forest;
+    }
+
+    /// <summary>
+    ///     Optimizes an asynchronous score function. Only the evaluations of a batch overlap: with the default <see cref="BatchSearchOptions.BatchSize"/> of 1 every evaluation is awaited
+    ///     on the thread running the search before the next point is asked, pass a BatchSize > 1 for evaluations to run concurrently.
+    /// </summary>
+    public PyForestOptimization(AsyncScoreFunctionDelegate asyncScoreFunction, bool maximize = false, FileInfo? dumpResults = null, ObjectiveCache? cache = null) : base(asyncScoreFunction, maximize, dumpResults, cache) {
+        _forest = EmbeddedModules.Forest;
+    }
+
+    public PyForestOptimization(BudgetedScoreFunctionDelegate budgetedScoreFunction, bool maximize = false, FileInfo? dumpResults = null, ObjectiveCache? cache = null) : base(budgetedScoreFunction, maximize, dumpResults, cache) {
+        _forest = EmbeddedModules.Forest;
     }
 
     public (double Score, TParams Parameters) Search(int n_calls, int n_random_starts, PyForestOptimization.BaseEstimator base_estimator = PyForestOptimization.BaseEstimator.ET,
                                                      PyForestOptimization.InitialPointGenerator initial_point_generator = PyForestOptimization.InitialPointGenerator.random,
                                                      PyForestOptimization.AcqFunc acq_func = PyForestOptimization.AcqFunc.LCB, PyForestOptimization.AcqOptimizer acq_optimizer = PyForestOptimization.AcqOptimizer.lbfgs,
-                                                     int? random_state = null, int n_points = 10000, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null) {
-        return SearchTop(1, n_calls, n_random_starts, base_estimator, initial_point_generator, acq_func, acq_optimizer, random_state, n_points, xi, kappa, verbose, callbacks)[0];
+                                                     int? random_state = null, int n_points = 10000, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null, int n_jobs = 1, ForestSearchOptions? options = null) {
+        return SearchTop(1, n_calls, n_random_starts, base_estimator, initial_point_generator, acq_func, acq_optimizer, random_state, n_points, xi, kappa, verbose, callbacks, n_jobs, options)[0];
     }
 
     public OptimizeResult<TParams> SearchAll(int n_calls, int n_random_starts, PyForestOptimization.BaseEstimator base_estimator = PyForestOptimization.BaseEstimator.ET,
                                              PyForestOptimization.InitialPointGenerator initial_point_generator = PyForestOptimization.InitialPointGenerator.random,
                                              PyForestOptimization.AcqFunc acq_func = PyForestOptimization.AcqFunc.LCB, PyForestOptimization.AcqOptimizer acq_optimizer = PyForestOptimization.AcqOptimizer.lbfgs,
-                                             int? random_state = null, int n_points = 10000, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null) {
+                                             int? random_state = null, int n_points = 10000, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null, int n_jobs = 1, ForestSearchOptions? options = null) {
+        options ??= new ForestSearchOptions();
         using dynamic skopt = PyModule.Import("skopt");
-        var estimator = base_estimator switch {
-            PyForestOptimization.BaseEstimator.RF => _forest.RandomForestRegressor(criterion: "squared_error", random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None),
-            PyForestOptimization.BaseEstimator.ET => _forest.ExtraTreesRegressor(criterion: "squared_error", random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None),
-            _                                     => throw new ArgumentOutOfRangeException(nameof(base_estimator), base_estimator, null)
-        };
-
-        var result = skopt.forest_minimize(wrappedScoreMethod, _searchSpace, base_estimator: estimator, n_calls: n_calls, n_random_starts: n_random_starts,
-                                           initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
-                                           n_jobs: 1, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
-                                           n_points: n_points, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList());
+        var result = Minimize(skopt, n_calls, n_random_starts, CreateEstimator(base_estimator, random_state, n_jobs, options),
+                              initial_point_generator, acq_func, acq_optimizer, random_state, n_points, xi, kappa, verbose, callbacks, n_jobs, options);
 
         TryDumpResults(skopt, result);
 
@@ -78,45 +84,18 @@ public class PyForestOptimization<TParams> : PyOptimization<TParams> where TPara
     public (double Score, TParams Parameters)[] SearchTop(int topResults, int n_calls, int n_random_starts, PyForestOptimization.BaseEstimator base_estimator = PyForestOptimization.BaseEstimator.ET,
                                                           PyForestOptimization.InitialPointGenerator initial_point_generator = PyForestOptimization.InitialPointGenerator.random,
                                                           PyForestOptimization.AcqFunc acq_func = PyForestOptimization.AcqFunc.LCB, PyForestOptimization.AcqOptimizer acq_optimizer = PyForestOptimization.AcqOptimizer.lbfgs,
-                                                          int? random_state = null, int n_points = 10000, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null) {
+                                                          int? random_state = null, int n_points = 10000, double xi = 0.01d, double kappa = 1.96d, bool verbose = false, IEnumerable<PyOptCallback>? callbacks = null, int n_jobs = 1, ForestSearchOptions? options = null) {
+        options ??= new ForestSearchOptions();
         using dynamic skopt = PyModule.Import("skopt");
-        using dynamic np = PyModule.Import("numpy");
-        var estimator = base_estimator switch {
-            PyForestOptimization.BaseEstimator.RF => _forest.RandomForestRegressor(criterion: "squared_error", random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None),
-            PyForestOptimization.BaseEstimator.ET => _forest.ExtraTreesRegressor(criterion: "squared_error", random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None),
-            _                                     => throw new ArgumentOutOfRangeException(nameof(base_estimator), base_estimator, null)
-        };
-
-        var result = skopt.forest_minimize(wrappedScoreMethod, _searchSpace, base_estimator: estimator, n_calls: n_calls, n_random_starts: n_random_starts,
-                                           initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
-                                           n_jobs: 1, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
-                                           n_points: n_points, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList());
-        var scores = result.func_vals;
-        var scoreParameters = result.x_iters;
-
+        var result = Minimize(skopt, n_calls, n_random_starts, CreateEstimator(base_estimator, random_state, n_jobs, options),
+                              initial_point_generator, acq_func, acq_optimizer, random_state, n_points, xi, kappa, verbose, callbacks, n_jobs, options);
         TryDumpResults(skopt, result);
 
-        int scoresCount = (int) scores.shape[0];
-        dynamic best; //numpy array of indices
-        if (topResults < scoresCount) {
-            best = np.argpartition(scores, topResults);
-        } else {
-            best = np.arange(scoresCount);
-        }
-
-        topResults = Math.Min(topResults, scoresCount);
-
-        var returns = new (double Score, TParams Parameters)[topResults];
-        for (int i = 0; i < returns.Length; i++) {
-            //unbox the best parameters
-            List<Tuple<string, object>> values = (List<Tuple<string, object>>) _helper.unbox_params(ParametersAnalyzer<TParams>.ParameterNames, scoreParameters[best[i]])
-                                                                                      .AsManagedObject(typeof(List<Tuple<string, object>>));
-            var bestParameters = ParametersAnalyzer<TParams>.Populate(values);
-
-            //adjust score polarity to the goal
-            double score = (double) scores[best[i]] * (_maximize ? -1 : 1);
-            returns[i] = (Score: score, Parameters: bestParameters);
-        }
+        //unbox the best parameters, scores are adjusted to the polarity of the goal
+        (TParams[] Parameters, double[] Scores) unboxed = OptimizeResult<TParams>.Unbox(_helper, result, _maximize, topResults);
+        var returns = new (double Score, TParams Parameters)[unboxed.Scores.Length];
+        for (int i = 0; i < returns.Length; i++)
+            returns[i] = (Score: unboxed.Scores[i], Parameters: unboxed.Parameters[i]);
 
         Array.Sort(returns, _maximize ? (lhs, rhs) => rhs.Score.CompareTo(lhs.Score) : (lhs, rhs) => lhs.Score.CompareTo(rhs.Score));
         
@@ -124,10 +103,84 @@ public class PyForestOptimization<TParams> : PyOptimization<TParams> where TPara
         return returns;
     }
 
-    protected override void Dispose(bool disposing) {
-        base.Dispose(disposing);
-        if (disposing) {
-            _forest.Dispose();
+    /// <summary>
+    ///     Studies run on an ET forest with the default LCB acquisition function.
+    /// </summary>
+    protected internal override (PyObject Estimator, string AcqFunc) CreateStudyEstimator(int? random_state) {
+        return (CreateEstimator(PyForestOptimization.BaseEstimator.ET, random_state, 1, new ForestSearchOptions()), PyForestOptimization.AcqFunc.LCB.AsString());
+    }
+
+    /// <summary>
+    ///     Runs forest_minimize, or batch_minimize when <see cref="BatchSearchOptions.BatchSize"/> is greater than 1, a <see cref="TreeSearchOptions.CandidatePool"/> or the local <paramref name="acq_optimizer"/> is used or the <paramref name="callbacks"/> include an <see cref="OptimizationProfiler"/>.
+    /// </summary>
+    /// <param name="options">Journal, warm start, budget and the other optional features of the run, see <see cref="ForestSearchOptions"/>.</param>
+    /// <param name="acq_optimizer">local refines the sampled candidates by rounds of perturbations around the best of them and the best points so far, see LocalSearch in opt_helpers.py. Any other value samples <paramref name="n_points"/> candidates.</param>
+    private dynamic Minimize(dynamic skopt, int n_calls, int n_random_starts, dynamic estimator, PyForestOptimization.InitialPointGenerator initial_point_generator,
+                             PyForestOptimization.AcqFunc acq_func, PyForestOptimization.AcqOptimizer acq_optimizer, int? random_state, int n_points, double xi, double kappa, bool verbose, IEnumerable<PyOptCallback>? callbacks,
+                             int n_jobs, ForestSearchOptions options) {
+        var timed = acq_func is PyForestOptimization.AcqFunc.EIps or PyForestOptimization.AcqFunc.PIps;
+        if (timed && options.MinBudget != null)
+            throw new ArgumentException("EIps and PIps can not be used with a MinBudget.", nameof(acq_func));
+
+        var (x0, y0) = BeginJournal(options.Journal, ref callbacks, ref n_calls, ref n_random_starts);
+        BeginWarmStart(options.WarmStart, options.Journal, ref x0, ref y0, ref n_random_starts);
+        var timer = BeginTimer(timed, ref y0);
+        var profiler = BeginProfiler(callbacks);
+        //the score wrappers keep the original dimensions, only the encoding the surrogate sees changes
+        PyObject dimensions = options.OrdinalCategoricals ? _helper.ordinal_dimensions(_searchSpace) : _searchSpace;
+        bool local = acq_optimizer == PyForestOptimization.AcqOptimizer.local;
+        PyObject localSearch = local ? _helper.LocalSearch(n_starts: options.LocalStarts, n_neighbors: options.LocalNeighbors, n_rounds: options.LocalRounds) : PyObject.None;
+        if (options.MinBudget != null) {
+            using var budgetScoreMethod = WrapBudgetScoreMethod(options.NWorkers);
+            return _helper.budget_minimize(budgetScoreMethod, dimensions, base_estimator: estimator, n_calls: n_calls, n_initial_points: n_random_starts,
+                                           min_budget: options.MinBudget.Value, eta: options.Eta, hyperband: options.Hyperband,
+                                           initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
+                                           n_jobs: n_jobs, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
+                                           n_points: n_points, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList(),
+                                           strategy: options.Strategy.AsString(), x0: x0, y0: y0, profiler: profiler?.This ?? PyObject.None, local_search: localSearch);
+        }
+
+        if (options.BatchSize > 1 || options.CandidatePool || local || profiler != null) {
+            using var batchScoreMethod = WrapBatchScoreMethod(options.NWorkers, timer);
+            return _helper.batch_minimize(batchScoreMethod, dimensions, base_estimator: estimator, n_calls: n_calls, n_initial_points: n_random_starts,
+                                          initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
+                                          n_jobs: n_jobs, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
+                                          n_points: n_points, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList(),
+                                          batch_size: options.BatchSize, strategy: options.Strategy.AsString(), x0: x0, y0: y0,
+                                          candidate_pool: options.CandidatePool ? _helper.CandidatePool(refresh: options.PoolRefresh, local: options.PoolLocal) : PyObject.None,
+                                          profiler: profiler?.This ?? PyObject.None, local_search: localSearch);
         }
+
+        using var timedScoreMethod = timer != null ? WrapScoreMethod(timer) : null;
+        return skopt.forest_minimize(timedScoreMethod ?? wrappedScoreMethod, dimensions, base_estimator: estimator, n_calls: n_calls, n_random_starts: n_random_starts,
+                                     initial_point_generator: initial_point_generator.AsString(), acq_func: acq_func.AsString(),
+                                     n_jobs: n_jobs, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None,
+                                     n_points: n_points, xi: xi, kappa: kappa, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList(), x0: x0, y0: y0);
+    }
+
+    /// <summary>
+    ///     Creates the forest surrogate passed to forest_minimize.
+    /// </summary>
+    /// <param name="options">Its incremental fitting and training set, see <see cref="ForestSearchOptions.Incremental"/> and <see cref="ForestSearchOptions.MaxTrainPoints"/>.</param>
+    protected virtual dynamic CreateEstimator(PyForestOptimization.BaseEstimator base_estimator, int? random_state, int n_jobs, ForestSearchOptions options) {
+        PyObject incrementalState = options.Incremental
+            ? _forest.IncrementalState(n_replace: options.NReplace != null ? new PyInt(options.NReplace.Value) : PyObject.None,
+                                       refit_every: options.RefitEvery != null ? new PyInt(options.RefitEvery.Value) : PyObject.None)
+            : PyObject.None;
+
+        //the rest of the history is subsampled stratified over the scores
+        PyObject trainingSet = options.MaxTrainPoints != null
+            ? _forest.TrainingSetPolicy(options.MaxTrainPoints.Value, n_best: options.TrainBest != null ? new PyInt(options.TrainBest.Value) : PyObject.None,
+                                        n_recent: options.TrainRecent != null ? new PyInt(options.TrainRecent.Value) : PyObject.None,
+                                        random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None)
+            : PyObject.None;
+
+        return base_estimator switch {
+            PyForestOptimization.BaseEstimator.RF => _forest.RandomForestRegressor(criterion: "squared_error", n_jobs: n_jobs, incremental: incrementalState, training_set: trainingSet,
+                                                                                   random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None),
+            PyForestOptimization.BaseEstimator.ET => _forest.ExtraTreesRegressor(criterion: "squared_error", n_jobs: n_jobs, incremental: incrementalState, training_set: trainingSet,
+                                                                                 random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None),
+            _ => throw new ArgumentOutOfRangeException(nameof(base_estimator), base_estimator, null)
+        };
     }
 }
\ No newline at end of file
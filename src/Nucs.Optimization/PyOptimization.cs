@@ -1,10 +1,23 @@
+using System.Diagnostics;
+using System.Threading;
+using System.Threading.Tasks;
 using Nucs.Optimization.Analyzer;
 using Nucs.Optimization.Attributes;
+using Nucs.Optimization.Callbacks;
 using Nucs.Optimization.Helper;
 using Python.Runtime;
 
 namespace Nucs.Optimization;
 
+/// <summary>
+///     The score the constant liar strategy pretends the pending points of a batch have, until they are scored: the minimum, mean or maximum of the observed scores.
+/// </summary>
+public enum LieStrategy {
+    cl_min,
+    cl_mean,
+    cl_max
+}
+
 /// <summary>
 ///     Abstract class for all python based optimization algorithms.
 /// </summary>
@@ -12,39 +25,78 @@ namespace Nucs.Optimization;
 public abstract class PyOptimization<TParams> : IDisposable where TParams : class, new() {
     protected readonly FileInfo? DumpResults;
     protected readonly ScoreFunctionDelegate _blackBoxScoreFunction;
+    protected readonly AsyncScoreFunctionDelegate? _asyncScoreFunction;
+    protected readonly BudgetedScoreFunctionDelegate? _budgetedScoreFunction;
     protected readonly dynamic _helper;
     protected readonly PyList _searchSpace;
     protected readonly PyObject wrappedScoreMethod;
     protected readonly bool _maximize;
 
+    /// <summary>
+    ///     The profiler of the current run, see <see cref="BeginProfiler"/>.
+    /// </summary>
+    protected OptimizationProfiler? _profiler;
+
+    /// <summary>
+    ///     The cache score function results are memoized in, null when not caching.
+    /// </summary>
+    public ObjectiveCache? Cache { get; }
+
     /// <summary>
     ///     The score function that will be used to evaluate the parameters.
     /// </summary>
     public delegate double ScoreFunctionDelegate(TParams parameters);
 
-    protected PyOptimization(ScoreFunctionDelegate blackBoxScoreFunction, bool maximize, FileInfo? dumpResults = null) {
+    /// <summary>
+    ///     An asynchronous score function, for I/O bound evaluations. Evaluations of a batch (<see cref="BatchSearchOptions.BatchSize"/> > 1) overlap up to <see cref="BatchSearchOptions.NWorkers"/> at a time,
+    ///     a single point (a BatchSize of 1, the default) is awaited synchronously so evaluations never overlap.
+    /// </summary>
+    public delegate Task<double> AsyncScoreFunctionDelegate(TParams parameters);
+
+    /// <summary>
+    ///     A score function whose cost scales with a budget, e.g. the length of a backtest's data window.
+    ///     <paramref name="budget"/> is a fraction in (0, 1] of a full evaluation. Searches with a <see cref="SearchOptions.MinBudget"/> promote only the most promising parameters to larger budgets,
+    ///     other searches evaluate at the full budget of 1.
+    /// </summary>
+    public delegate double BudgetedScoreFunctionDelegate(TParams parameters, double budget);
+
+    protected PyOptimization(ScoreFunctionDelegate blackBoxScoreFunction, bool maximize, FileInfo? dumpResults = null, ObjectiveCache? cache = null)
+        : this(blackBoxScoreFunction, null, null, blackBoxScoreFunction.Method, maximize, dumpResults, cache) { }
+
+    /// <remarks>Outside of a batch the score function is awaited synchronously on the thread running the search, one evaluation at a time.</remarks>
+    protected PyOptimization(AsyncScoreFunctionDelegate asyncScoreFunction, bool maximize, FileInfo? dumpResults = null, ObjectiveCache? cache = null)
+        : this(parameters => asyncScoreFunction(parameters).GetAwaiter().GetResult(), asyncScoreFunction, null, asyncScoreFunction.Method, maximize, dumpResults, cache) { }
+
+    protected PyOptimization(BudgetedScoreFunctionDelegate budgetedScoreFunction, bool maximize, FileInfo? dumpResults = null, ObjectiveCache? cache = null)
+        : this(parameters => budgetedScoreFunction(parameters, 1d), null, budgetedScoreFunction, budgetedScoreFunction.Method, maximize, dumpResults, cache) { }
+
+    private PyOptimization(ScoreFunctionDelegate blackBoxScoreFunction, AsyncScoreFunctionDelegate? asyncScoreFunction, BudgetedScoreFunctionDelegate? budgetedScoreFunction,
+                           MethodInfo scoreMethod, bool maximize, FileInfo? dumpResults, ObjectiveCache? cache) {
         //ensure analyzer constructed
         ParametersAnalyzer<TParams>.Initialize();
 
         //process blackbox function and analyze attributes
         _blackBoxScoreFunction = blackBoxScoreFunction;
+        _asyncScoreFunction = asyncScoreFunction;
+        _budgetedScoreFunction = budgetedScoreFunction;
         DumpResults = dumpResults;
-        if (blackBoxScoreFunction.Method.GetCustomAttribute<MinimizeAttribute>() != null)
+        Cache = cache;
+        if (scoreMethod.GetCustomAttribute<MinimizeAttribute>() != null)
             maximize = false;
-        else if (blackBoxScoreFunction.Method.GetCustomAttribute<MaximizeAttribute>() != null)
+        else if (scoreMethod.GetCustomAttribute<MaximizeAttribute>() != null)
             maximize = true;
 
         _maximize = maximize;
 
         //load helper script
-        _helper = PyModule.FromString("helper", EmbeddedResourceHelper.ReadEmbeddedResource("opt_helpers.py")!);
-
-        //wrap blackbox function
-        wrappedScoreMethod = _helper.scoreWrapper(PyObject.FromManagedObject(UnboxParametersScoreMethod), ParametersAnalyzer<TParams>.ParameterNames, _maximize);
+        _helper = EmbeddedModules.Helper;
 
         //create search space
         _searchSpace = new PyList();
         CreateSearchSpaceParameters();
+
+        //wrap blackbox function
+        wrappedScoreMethod = WrapScoreMethod();
     }
 
     /// <summary>
@@ -92,7 +144,7 @@ public abstract class PyOptimization<TParams> : IDisposable where TParams : clas
     protected virtual void TryDumpResults(dynamic skopt, dynamic result) {
         if (DumpResults != null) {
             Directory.CreateDirectory(DumpResults.Directory!.FullName);
-            skopt.utils.dump(result, DumpResults.FullName, store_objective: false);
+            _helper.dump_result(result, DumpResults.FullName);
         }
     }
 
@@ -107,18 +159,234 @@ public abstract class PyOptimization<TParams> : IDisposable where TParams : clas
         return new OptimizeResult<TParams>(skopt.utils.load(path), maximize);
     }
 
+    /// <summary>
+    ///     Starts <paramref name="journal"/> for a run and appends it to <paramref name="callbacks"/>.
+    ///     When it resumes, the journaled evaluations are returned to be passed as x0/y0 and count towards <paramref name="n_calls"/> and <paramref name="n_random_starts"/>.
+    /// </summary>
+    protected static (PyObject X0, PyObject Y0) BeginJournal(Journal? journal, ref IEnumerable<PyOptCallback>? callbacks, ref int n_calls, ref int n_random_starts) {
+        if (journal == null)
+            return (PyObject.None, PyObject.None);
+
+        var (x0, y0, resumed) = journal.Begin();
+        callbacks = (callbacks ?? Array.Empty<PyOptCallback>()).Append(journal);
+        n_calls = Math.Max(0, n_calls - resumed);
+        n_random_starts = Math.Max(0, n_random_starts - resumed);
+        return (x0, y0);
+    }
+
+    /// <summary>
+    ///     Appends the evaluations of <paramref name="warm_start"/> that fit the search space to the <paramref name="x0"/>/<paramref name="y0"/> of a run, after the journaled ones.
+    ///     They take the place of as many of the <paramref name="n_random_starts"/>, do not count towards n_calls and are not journaled again.
+    /// </summary>
+    protected void BeginWarmStart(WarmStart? warm_start, Journal? journal, ref PyObject x0, ref PyObject y0, ref int n_random_starts) {
+        if (warm_start == null)
+            return;
+
+        var (points, scores, added) = warm_start.Points(_searchSpace, ParametersAnalyzer<TParams>.ParameterNames, x0, y0);
+        if (added == 0) {
+            points.Dispose();
+            scores.Dispose();
+            return;
+        }
+
+        journal?.Skip(added);
+        x0 = points;
+        y0 = scores;
+        n_random_starts = Math.Max(0, n_random_starts - added);
+    }
+
+    /// <summary>
+    ///     Finds the <see cref="OptimizationProfiler"/> among <paramref name="callbacks"/> and starts timing a run with it, the score function is timed into it until the next run.
+    ///     When profiling, the score method has to be wrapped again for the run, see <see cref="WrapScoreMethod"/>.
+    /// </summary>
+    /// <returns>The profiler, null when there is none.</returns>
+    protected OptimizationProfiler? BeginProfiler(IEnumerable<PyOptCallback>? callbacks) {
+        _profiler = callbacks?.OfType<OptimizationProfiler>().FirstOrDefault();
+        _profiler?.Begin();
+        return _profiler;
+    }
+
+    /// <summary>
+    ///     Starts timing the score function for a run with the cost-aware acquisition functions EIps and PIps, which model the time every evaluation takes next to its score.
+    ///     The scores in <paramref name="y0"/> are paired with an assumed time, see ObjectiveTimer in opt_helpers.py.
+    /// </summary>
+    /// <returns>The timer to wrap the score method with, null when the run is not <paramref name="timed"/>.</returns>
+    protected PyObject? BeginTimer(bool timed, ref PyObject y0) {
+        if (!timed)
+            return null;
+
+        PyObject timer = _helper.ObjectiveTimer();
+        if (!y0.IsNone())
+            y0 = timer.InvokeMethod("pairs", y0);
+        return timer;
+    }
+
     /// <summary>
     ///     Wraps the blackbox function to be used by the python optimizer.
+    ///     Points are passed in the columnar layout of <see cref="ParametersAnalyzer{TParams}.ColumnarSlots"/>, see <see cref="UnboxColumnarScoreMethod"/>.
+    ///     Points found in <see cref="Cache"/> are not passed at all. Calls are timed into the profiler of the current run, if any.
+    /// </summary>
+    /// <param name="timer">Returns (score, elapsed seconds) for EIps and PIps, see <see cref="BeginTimer"/>. null to return the score.</param>
+    protected virtual PyObject WrapScoreMethod(PyObject? timer = null) {
+        return _helper.columnarScoreWrapper(PyObject.FromManagedObject(UnboxColumnarScoreMethod), _searchSpace, _maximize, cache: Cache?.This ?? PyObject.None,
+                                            profiler: _profiler?.This ?? PyObject.None, timer: timer ?? PyObject.None);
+    }
+
+    /// <summary>
+    ///     Wraps the blackbox function to be used by the python optimizer's batch_minimize.
+    /// </summary>
+    /// <param name="n_workers">Maximum number of concurrent blackbox calls. 0 or less for unlimited.</param>
+    /// <param name="timer">Times every blackbox call and returns [score, elapsed seconds] pairs for EIps and PIps, see <see cref="BeginTimer"/>. null to return the scores.</param>
+    protected virtual PyObject WrapBatchScoreMethod(int n_workers, PyObject? timer = null) {
+        return _helper.columnarBatchScoreWrapper(PyObject.FromManagedObject(UnboxColumnarBatchScoreMethod), _searchSpace, _maximize, n_workers, cache: Cache?.This ?? PyObject.None,
+                                                 profiler: _profiler?.This ?? PyObject.None, timer: timer ?? PyObject.None);
+    }
+
+    /// <summary>
+    ///     Wraps the budgeted blackbox function to be used by the python optimizer's budget_minimize.
+    /// </summary>
+    /// <param name="n_workers">Maximum number of concurrent blackbox calls. 0 or less for unlimited.</param>
+    protected virtual PyObject WrapBudgetScoreMethod(int n_workers) {
+        if (_budgetedScoreFunction == null)
+            throw new InvalidOperationException($"A min_budget requires the optimizer to be constructed with a {nameof(BudgetedScoreFunctionDelegate)}.");
+
+        return _helper.columnarBatchScoreWrapper(PyObject.FromManagedObject(UnboxColumnarBudgetScoreMethod), _searchSpace, _maximize, n_workers, cache: Cache?.This ?? PyObject.None,
+                                                 profiler: _profiler?.This ?? PyObject.None, budgeted: true);
+    }
+
+    /// <summary>
+    ///     Wraps the blackbox function to be used by the python optimizer.
+    ///     <paramref name="reals"/> and <paramref name="integers"/> point to the float64 and int64 buffers of the columnar layout, owned by python.
+    ///     It replaces UnboxParametersScoreMethod, which received the parameters as (name, value) pairs: subclasses that overrode it override this method instead.
+    /// </summary>
+    protected virtual unsafe double UnboxColumnarScoreMethod(long reals, long integers) {
+        var parameters = ParametersAnalyzer<TParams>.Populate(new ReadOnlySpan<double>((void*) reals, ParametersAnalyzer<TParams>.RealsCount),
+                                                              new ReadOnlySpan<long>((void*) integers, ParametersAnalyzer<TParams>.IntegersCount));
+        if (_profiler == null)
+            return _blackBoxScoreFunction(parameters);
+
+        var start = Stopwatch.GetTimestamp();
+        var score = _blackBoxScoreFunction(parameters);
+        *(double*) _profiler.ObjectiveSeconds += Stopwatch.GetElapsedTime(start).TotalSeconds;
+        return score;
+    }
+
+    /// <summary>
+    ///     Scores a batch of <paramref name="count"/> points in the columnar layout concurrently on up to <paramref name="n_workers"/> threads.
+    ///     <paramref name="reals"/> and <paramref name="integers"/> are row-major [count, n] buffers, the scores are written to <paramref name="scores"/>.
+    ///     Unless <paramref name="elapsed"/> is 0, the seconds every evaluation took are written to it.
+    ///     pythonnet releases the GIL while a managed method called from python runs, so the blackbox calls do not contend on it.
+    /// </summary>
+    protected virtual unsafe void UnboxColumnarBatchScoreMethod(long reals, long integers, long scores, long elapsed, int count, int n_workers) {
+        var parameters = ParametersAnalyzer<TParams>.Populate(new ReadOnlySpan<double>((void*) reals, count * ParametersAnalyzer<TParams>.RealsCount),
+                                                              new ReadOnlySpan<long>((void*) integers, count * ParametersAnalyzer<TParams>.IntegersCount), count);
+
+        var start = Stopwatch.GetTimestamp();
+        if (_asyncScoreFunction != null) {
+            var seconds = elapsed != 0 ? new double[count] : null;
+            ScoreAsync(parameters, n_workers, seconds).GetAwaiter().GetResult().CopyTo(new Span<double>((void*) scores, count));
+            seconds?.CopyTo(new Span<double>((void*) elapsed, count));
+        } else if (elapsed != 0) {
+            var output = (double*) scores;
+            var times = (double*) elapsed;
+            Parallel.For(0, count, Workers(n_workers), i => {
+                var begin = Stopwatch.GetTimestamp();
+                output[i] = _blackBoxScoreFunction(parameters[i]);
+                times[i] = Stopwatch.GetElapsedTime(begin).TotalSeconds;
+            });
+        } else {
+            var output = (double*) scores;
+            Parallel.For(0, count, Workers(n_workers), i => output[i] = _blackBoxScoreFunction(parameters[i]));
+        }
+
+        //the wall time of the whole batch, concurrent evaluations are not summed
+        if (_profiler != null)
+            *(double*) _profiler.ObjectiveSeconds += Stopwatch.GetElapsedTime(start).TotalSeconds;
+    }
+
+    /// <summary>
+    ///     Scores a batch of <paramref name="count"/> points at <paramref name="budget"/> concurrently on up to <paramref name="n_workers"/> threads, see <see cref="UnboxColumnarBatchScoreMethod"/>.
+    /// </summary>
+    protected virtual unsafe void UnboxColumnarBudgetScoreMethod(long reals, long integers, long scores, int count, int n_workers, double budget) {
+        var parameters = ParametersAnalyzer<TParams>.Populate(new ReadOnlySpan<double>((void*) reals, count * ParametersAnalyzer<TParams>.RealsCount),
+                                                              new ReadOnlySpan<long>((void*) integers, count * ParametersAnalyzer<TParams>.IntegersCount), count);
+
+        var start = Stopwatch.GetTimestamp();
+        var output = (double*) scores;
+        Parallel.For(0, count, Workers(n_workers), i => output[i] = _budgetedScoreFunction!(parameters[i], budget));
+
+        if (_profiler != null)
+            *(double*) _profiler.ObjectiveSeconds += Stopwatch.GetElapsedTime(start).TotalSeconds;
+    }
+
+    /// <summary>
+    ///     At most <paramref name="n_workers"/> concurrent iterations, 0 or less for unlimited like <see cref="ScoreAsync"/>.
+    /// </summary>
+    private static ParallelOptions Workers(int n_workers) {
+        return new ParallelOptions { MaxDegreeOfParallelism = n_workers > 0 ? n_workers : -1 };
+    }
+
+    /// <summary>
+    ///     Awaits the asynchronous score function for every parameters, up to <paramref name="n_workers"/> evaluations in flight at a time.
+    /// </summary>
+    /// <param name="elapsed">When not null, receives the seconds every evaluation took from the moment it was let in flight.</param>
+    /// <returns>The scores in the order of <paramref name="parameters"/>.</returns>
+    protected virtual async Task<double[]> ScoreAsync(TParams[] parameters, int n_workers, double[]? elapsed = null) {
+        using var throttle = n_workers > 0 ? new SemaphoreSlim(n_workers) : null;
+
+        async Task<double> Score(TParams p, int i) {
+            if (throttle != null)
+                await throttle.WaitAsync().ConfigureAwait(false);
+            var start = Stopwatch.GetTimestamp();
+            try {
+                return await _asyncScoreFunction!(p).ConfigureAwait(false);
+            } finally {
+                if (elapsed != null)
+                    elapsed[i] = Stopwatch.GetElapsedTime(start).TotalSeconds;
+                throttle?.Release();
+            }
+        }
+
+        return await Task.WhenAll(parameters.Select(Score)).ConfigureAwait(false);
+    }
+
+    /// <summary>
+    ///     The search space of the optimization, one skopt dimension per parameter.
+    /// </summary>
+    internal PyList SearchSpace => _searchSpace;
+
+    /// <summary>
+    ///     Whether the score function is maximized.
+    /// </summary>
+    internal bool Maximize => _maximize;
+
+    /// <summary>
+    ///     The surrogate and acquisition function the optimization runs a <see cref="Study{TParams}"/> of a <see cref="StudyScheduler"/> with.
+    ///     Defaults to random proposals, the estimator is passed to Study in opt_helpers.py.
+    /// </summary>
+    protected internal virtual (PyObject Estimator, string AcqFunc) CreateStudyEstimator(int? random_state) {
+        return (new PyString("dummy"), "gp_hedge");
+    }
+
+    /// <summary>
+    ///     Scores <paramref name="parameters"/> for a <see cref="StudyScheduler"/> worker, awaiting the asynchronous score function when there is one.
+    /// </summary>
+    internal Task<double> ScoreStudyAsync(TParams parameters) {
+        return _asyncScoreFunction != null ? _asyncScoreFunction(parameters) : Task.FromResult(_blackBoxScoreFunction(parameters));
+    }
+
+    /// <summary>
+    ///     Dumps the <paramref name="result"/> of a <see cref="Study{TParams}"/> like a search of this optimization would and unboxes it.
     /// </summary>
-    protected virtual double UnboxParametersScoreMethod(PyObject args) {
-        return _blackBoxScoreFunction(ParametersAnalyzer<TParams>.Populate((List<Tuple<string, object>>) args.AsManagedObject(typeof(List<Tuple<string, object>>))!));
+    internal OptimizeResult<TParams> EndStudy(dynamic skopt, PyObject result) {
+        TryDumpResults(skopt, result);
+        return new OptimizeResult<TParams>(result, _maximize);
     }
 
     protected virtual void Dispose(bool disposing) {
         if (disposing) {
             _searchSpace.Dispose();
             wrappedScoreMethod.Dispose();
-            _helper.Dispose();
         }
     }
 
@@ -10,59 +10,78 @@ namespace Nucs.Optimization;
 /// </summary>
 /// <typeparam name="TParams">A class and new() for parameters</typeparam>
 public class PyRandomOptimization<TParams> : PyOptimization<TParams> where TParams : class, new() {
-    public PyRandomOptimization(ScoreFunctionDelegate blackBoxScoreFunction, bool maximize = false, FileInfo? dumpResults = null) : base(blackBoxScoreFunction, maximize, dumpResults) { }
+    public PyRandomOptimization(ScoreFunctionDelegate blackBoxScoreFunction, bool maximize = false, FileInfo? dumpResults = null, ObjectiveCache? cache = null) : base(blackBoxScoreFunction, maximize, dumpResults, cache) { }
 
-    public (double Score, TParams Parameters) Search(int n_calls, int? random_state = null, bool verbose = true, IEnumerable<PyOptCallback>? callbacks = null) {
-        return SearchTop(1, n_calls, random_state, verbose, callbacks)[0];
+    /// <summary>
+    ///     Optimizes an asynchronous score function. A random search scores one point at a time, every evaluation is awaited on the thread running the search.
+    ///     For evaluations to overlap, run it as a study with batch_size > 1, see <see cref="StudyScheduler"/>.
+    /// </summary>
+    public PyRandomOptimization(AsyncScoreFunctionDelegate asyncScoreFunction, bool maximize = false, FileInfo? dumpResults = null, ObjectiveCache? cache = null) : base(asyncScoreFunction, maximize, dumpResults, cache) { }
+
+    public PyRandomOptimization(BudgetedScoreFunctionDelegate budgetedScoreFunction, bool maximize = false, FileInfo? dumpResults = null, ObjectiveCache? cache = null) : base(budgetedScoreFunction, maximize, dumpResults, cache) { }
+
+    public (double Score, TParams Parameters) Search(int n_calls, int? random_state = null, bool verbose = true, IEnumerable<PyOptCallback>? callbacks = null, SearchOptions? options = null) {
+        return SearchTop(1, n_calls, random_state, verbose, callbacks, options)[0];
     }
 
-    public OptimizeResult<TParams> SearchAll(int n_calls, int? random_state = null, bool verbose = true, IEnumerable<PyOptCallback>? callbacks = null) {
+    public OptimizeResult<TParams> SearchAll(int n_calls, int? random_state = null, bool verbose = true, IEnumerable<PyOptCallback>? callbacks = null, SearchOptions? options = null) {
+        options ??= new SearchOptions();
         using dynamic skopt = PyModule.Import("skopt");
-        using dynamic np = PyModule.Import("numpy");
-        var result = skopt.dummy_minimize(wrappedScoreMethod, _searchSpace, n_calls: n_calls,
-                                          random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList());
+        var result = Minimize(skopt, n_calls, random_state, verbose, callbacks, options);
 
         TryDumpResults(skopt, result);
 
         return new OptimizeResult<TParams>(result, _maximize);
     }
 
-    public (double Score, TParams Parameters)[] SearchTop(int topResults, int n_calls, int? random_state = null, bool verbose = true, IEnumerable<PyOptCallback>? callbacks = null) {
+    public (double Score, TParams Parameters)[] SearchTop(int topResults, int n_calls, int? random_state = null, bool verbose = true, IEnumerable<PyOptCallback>? callbacks = null, SearchOptions? options = null) {
+        options ??= new SearchOptions();
         using dynamic skopt = PyModule.Import("skopt");
-        using dynamic np = PyModule.Import("numpy");
-        var result = skopt.dummy_minimize(wrappedScoreMethod, _searchSpace, n_calls: n_calls,
-                                          random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList());
-
-        var scores = result.func_vals;
-        var scoreParameters = result.x_iters;
+        var result = Minimize(skopt, n_calls, random_state, verbose, callbacks, options);
 
         TryDumpResults(skopt, result);
 
-        int scoresCount = (int) scores.shape[0];
-        dynamic best; //numpy array of indices
-        if (topResults < scoresCount) {
-            best = np.argpartition(scores, topResults);
-        } else {
-            best = np.arange(scoresCount);
-        }
-
-        topResults = Math.Min(topResults, scoresCount);
-
-        var returns = new (double Score, TParams Parameters)[topResults];
-        for (int i = 0; i < returns.Length; i++) {
-            //unbox the best parameters
-            List<Tuple<string, object>> values = (List<Tuple<string, object>>) _helper.unbox_params(ParametersAnalyzer<TParams>.ParameterNames, scoreParameters[best[i]])
-                                                                                      .AsManagedObject(typeof(List<Tuple<string, object>>));
-            var bestParameters = ParametersAnalyzer<TParams>.Populate(values);
+        //unbox the best parameters, scores are adjusted to the polarity of the goal
+        (TParams[] Parameters, double[] Scores) unboxed = OptimizeResult<TParams>.Unbox(_helper, result, _maximize, topResults);
+        var returns = new (double Score, TParams Parameters)[unboxed.Scores.Length];
+        for (int i = 0; i < returns.Length; i++)
+            returns[i] = (Score: unboxed.Scores[i], Parameters: unboxed.Parameters[i]);
 
-            //adjust score polarity to the goal
-            double score = (double) scores[best[i]] * (_maximize ? -1 : 1);
-            returns[i] = (Score: score, Parameters: bestParameters);
-        }
-        
         Array.Sort(returns, _maximize ? (lhs, rhs) => rhs.Score.CompareTo(lhs.Score) : (lhs, rhs) => lhs.Score.CompareTo(rhs.Score));
 
         //return the best score and the parameters
         return returns;
     }
+
+    /// <summary>
+    ///     Runs dummy_minimize. With an <see cref="OptimizationProfiler"/> in <paramref name="callbacks"/>, the score function is wrapped for the run to be timed.
+    ///     With a <see cref="SearchOptions.MinBudget"/>, runs budget_minimize with random proposals instead, which is Hyperband when <see cref="SearchOptions.Hyperband"/> is true.
+    /// </summary>
+    /// <param name="options">Journal, warm start, budget and the other optional features of the run, see <see cref="SearchOptions"/>.</param>
+    private dynamic Minimize(dynamic skopt, int n_calls, int? random_state, bool verbose, IEnumerable<PyOptCallback>? callbacks, SearchOptions options) {
+        var n_random_starts = n_calls;
+        var (x0, y0) = BeginJournal(options.Journal, ref callbacks, ref n_calls, ref n_random_starts);
+        BeginWarmStart(options.WarmStart, options.Journal, ref x0, ref y0, ref n_random_starts);
+        var profiler = BeginProfiler(callbacks);
+        if (options.MinBudget != null) {
+            using var budgetScoreMethod = WrapBudgetScoreMethod(-1);
+            return _helper.budget_minimize(budgetScoreMethod, _searchSpace, base_estimator: "dummy", n_calls: n_calls, n_initial_points: n_random_starts,
+                                           min_budget: options.MinBudget.Value, eta: options.Eta, hyperband: options.Hyperband,
+                                           random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None, verbose: verbose,
+                                           callback: callbacks?.Select(p=>p.This).ToPyList(), x0: x0, y0: y0, profiler: profiler?.This ?? PyObject.None);
+        }
+
+        if (profiler == null)
+            return skopt.dummy_minimize(wrappedScoreMethod, _searchSpace, n_calls: n_calls,
+                                        random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None, verbose: verbose, callback: callbacks?.Select(p=>p.This).ToPyList(),
+                                        x0: x0, y0: y0);
+
+        //there is no surrogate to fit, only the score function calls are timed
+        using var scoreMethod = WrapScoreMethod();
+        var result = skopt.dummy_minimize(scoreMethod, _searchSpace, n_calls: n_calls,
+                                          random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None, verbose: verbose, callback: callbacks.Select(p=>p.This).ToPyList(),
+                                          x0: x0, y0: y0);
+        profiler.End();
+        return result;
+    }
 }
\ No newline at end of file
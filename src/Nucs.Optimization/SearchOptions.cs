@@ -0,0 +1,130 @@
+using Nucs.Optimization.Callbacks;
+
+namespace Nucs.Optimization;
+
+/// <summary>
+///     Optional features of a search, the options of <see cref="PyRandomOptimization{TParams}"/>.
+///     The other optimizers take the subclass of the features they support: <see cref="BatchSearchOptions"/>, <see cref="TreeSearchOptions"/> and <see cref="ForestSearchOptions"/>.
+/// </summary>
+public class SearchOptions {
+    /// <summary>
+    ///     Journals every evaluation, a search given a journal with evaluations resumes from them.
+    /// </summary>
+    public Journal? Journal { get; init; }
+
+    /// <summary>
+    ///     Seeds the run with the evaluations of earlier runs, they do not count towards n_calls.
+    /// </summary>
+    public WarmStart? WarmStart { get; init; }
+
+    /// <summary>
+    ///     Runs budget_minimize, scoring points at budgets from <see cref="MinBudget"/> in (0, 1] and promoting only the best to the full budget of 1,
+    ///     requires a <see cref="PyOptimization{TParams}.BudgetedScoreFunctionDelegate"/>. null to score every point at the full budget.
+    /// </summary>
+    public double? MinBudget { get; init; }
+
+    /// <summary>
+    ///     Budget multiplier between rungs, only the best 1 / <see cref="Eta"/> points of a rung are promoted.
+    /// </summary>
+    public double Eta { get; init; } = 3d;
+
+    /// <summary>
+    ///     Cycle through brackets of every starting budget instead of always starting at <see cref="MinBudget"/>.
+    /// </summary>
+    public bool Hyperband { get; init; }
+}
+
+/// <summary>
+///     Options of a search that proposes batches of points, see <see cref="PyBayesianOptimization{TParams}"/>.
+/// </summary>
+public class BatchSearchOptions : SearchOptions {
+    /// <summary>
+    ///     Points proposed per iteration using the constant liar <see cref="Strategy"/> and scored concurrently.
+    /// </summary>
+    public int BatchSize { get; init; } = 1;
+
+    /// <summary>
+    ///     Maximum number of concurrent score function calls in a batch. 0 or less for unlimited.
+    /// </summary>
+    public int NWorkers { get; init; } = -1;
+
+    /// <summary>
+    ///     The score the pending points of a batch are assumed to have while the rest of the batch is proposed.
+    /// </summary>
+    public LieStrategy Strategy { get; init; } = LieStrategy.cl_min;
+}
+
+/// <summary>
+///     Options of a search on a tree surrogate, see <see cref="PyGbrtOptimization{TParams}"/>.
+/// </summary>
+public class TreeSearchOptions : BatchSearchOptions {
+    /// <summary>
+    ///     Optimize the acquisition function over candidates that are sampled and transformed once and partially refreshed every iteration, instead of n_points new samples.
+    /// </summary>
+    public bool CandidatePool { get; init; }
+
+    /// <summary>
+    ///     Fraction of the candidate pool resampled every iteration.
+    /// </summary>
+    public double PoolRefresh { get; init; } = 0.1d;
+
+    /// <summary>
+    ///     Fraction of the candidate pool replaced every iteration by perturbations of the best point so far.
+    /// </summary>
+    public double PoolLocal { get; init; } = 0.1d;
+
+    /// <summary>
+    ///     Candidates the local search of the local acq_optimizer keeps and perturbs every round.
+    /// </summary>
+    public int LocalStarts { get; init; } = 5;
+
+    /// <summary>
+    ///     Perturbations of every kept candidate per round of the local search.
+    /// </summary>
+    public int LocalNeighbors { get; init; } = 100;
+
+    /// <summary>
+    ///     Rounds of the local search.
+    /// </summary>
+    public int LocalRounds { get; init; } = 5;
+}
+
+/// <summary>
+///     Options of a search on a forest surrogate, see <see cref="PyForestOptimization{TParams}"/>.
+/// </summary>
+public class ForestSearchOptions : TreeSearchOptions {
+    /// <summary>
+    ///     When true, the ensemble is kept between iterations and only <see cref="NReplace"/> oldest trees are retrained per iteration.
+    /// </summary>
+    public bool Incremental { get; init; }
+
+    /// <summary>
+    ///     Trees retrained per incremental fit. null for n_estimators / 10.
+    /// </summary>
+    public int? NReplace { get; init; }
+
+    /// <summary>
+    ///     Every n-th fit rebuilds the whole forest. null to never rebuild after the first fit.
+    /// </summary>
+    public int? RefitEvery { get; init; } = 10;
+
+    /// <summary>
+    ///     Fit the surrogate on at most this many observations instead of the whole history. null for the whole history.
+    /// </summary>
+    public int? MaxTrainPoints { get; init; }
+
+    /// <summary>
+    ///     Best scoring observations always fit on when <see cref="MaxTrainPoints"/> is set. null for MaxTrainPoints / 4.
+    /// </summary>
+    public int? TrainBest { get; init; }
+
+    /// <summary>
+    ///     Most recent observations always fit on when <see cref="MaxTrainPoints"/> is set. null for MaxTrainPoints / 4.
+    /// </summary>
+    public int? TrainRecent { get; init; }
+
+    /// <summary>
+    ///     Pass one-hot encoded categorical parameters to the surrogate as a single column of category codes each, see ordinal_dimensions in opt_helpers.py.
+    /// </summary>
+    public bool OrdinalCategoricals { get; init; }
+}
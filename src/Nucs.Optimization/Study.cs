@@ -0,0 +1,90 @@
+using System.Threading;
+using System.Threading.Tasks;
+using Nucs.Optimization.Analyzer;
+using Python.Runtime;
+
+namespace Nucs.Optimization;
+
+/// <summary>
+///     A search run by a <see cref="StudyScheduler"/>, see <see cref="StudyScheduler.Add{TParams}"/>.
+/// </summary>
+public abstract class Study : IDisposable {
+    internal readonly PyObject This;
+    internal readonly int Index;
+    internal double[] Scores = Array.Empty<double>();
+    internal int Remaining;
+    internal long Queued;
+    private int _evaluations;
+
+    protected Study(PyObject study, int index, int priority) {
+        This = study;
+        Index = index;
+        Priority = priority;
+    }
+
+    /// <summary>
+    ///     Points of higher priority studies are scored first, studies of equal priority share the workers evenly.
+    /// </summary>
+    public int Priority { get; }
+
+    /// <summary>
+    ///     Score function calls completed so far.
+    /// </summary>
+    public int Evaluations => Volatile.Read(ref _evaluations);
+
+    internal void Completed() => Interlocked.Increment(ref _evaluations);
+
+    /// <summary>
+    ///     Unboxes a batch of <paramref name="count"/> points in the columnar layout to be scored, see <see cref="PyOptimization{TParams}.UnboxColumnarBatchScoreMethod"/>.
+    /// </summary>
+    internal abstract void Populate(long reals, long integers, int count);
+
+    /// <summary>
+    ///     Scores the point at <paramref name="index"/> of the populated batch.
+    /// </summary>
+    internal abstract Task<double> ScoreAsync(int index);
+
+    /// <summary>
+    ///     Receives the skopt result once the scheduler ran.
+    /// </summary>
+    internal abstract void End(dynamic skopt, PyObject result);
+
+    public void Dispose() {
+        This.Dispose();
+        GC.SuppressFinalize(this);
+    }
+}
+
+/// <summary>
+///     A search of a <see cref="PyOptimization{TParams}"/> run by a <see cref="StudyScheduler"/>.
+/// </summary>
+/// <typeparam name="TParams">A class and new() for parameters</typeparam>
+public sealed class Study<TParams> : Study where TParams : class, new() {
+    private TParams[] _parameters = Array.Empty<TParams>();
+
+    internal Study(PyOptimization<TParams> optimization, PyObject study, int index, int priority) : base(study, index, priority) {
+        Optimization = optimization;
+    }
+
+    public PyOptimization<TParams> Optimization { get; }
+
+    /// <summary>
+    ///     The result of the study, null until <see cref="StudyScheduler.Run"/> returned.
+    /// </summary>
+    public OptimizeResult<TParams>? Result { get; private set; }
+
+    internal override unsafe void Populate(long reals, long integers, int count) {
+        _parameters = ParametersAnalyzer<TParams>.Populate(new ReadOnlySpan<double>((void*) reals, count * ParametersAnalyzer<TParams>.RealsCount),
+                                                           new ReadOnlySpan<long>((void*) integers, count * ParametersAnalyzer<TParams>.IntegersCount), count);
+        if (Scores.Length < count)
+            Scores = new double[count];
+    }
+
+    internal override Task<double> ScoreAsync(int index) {
+        return Optimization.ScoreStudyAsync(_parameters[index]);
+    }
+
+    internal override void End(dynamic skopt, PyObject result) {
+        Result = Optimization.EndStudy(skopt, result);
+    }
+}
@@ -0,0 +1,183 @@
+using System.Collections.Concurrent;
+using System.Runtime.ExceptionServices;
+using System.Threading;
+using System.Threading.Tasks;
+using Nucs.Optimization.Callbacks;
+using Nucs.Optimization.Helper;
+using Python.Runtime;
+
+namespace Nucs.Optimization;
+
+/// <summary>
+///     Runs many independent studies at once on the calling thread, instead of one blocked thread per search.
+///     The studies are asked and told in turns, see schedule_studies in opt_helpers.py, while the points they propose are scored on a shared pool of up to n_workers concurrent evaluations,
+///     so the surrogates of some studies are fit while the points of the others are scored. The studies whose batches completed together are fit on python threads,
+///     in parallel as far as their surrogates release the GIL, sklearn's trees do while building and predicting.
+///     Once the score function dominates, more workers score more points at once. Once fitting dominates, the studies are bound by the processors fitting them.
+///     Queued evaluations are started by descending <see cref="Study.Priority"/>, evaluations of studies of equal priority take turns.
+/// </summary>
+/// <remarks>Studies are scored without a profiler, journal or timer. The <see cref="PyOptimization{TParams}.Cache"/> and the dump file of their optimization are used.</remarks>
+public class StudyScheduler : IDisposable {
+    private readonly dynamic _helper;
+    private readonly int _n_workers;
+    private readonly List<Study> _studies = new();
+    private readonly PriorityQueue<(Study Study, int Index), (int Priority, long Share, long Sequence)> _queue = new();
+    private readonly BlockingCollection<int> _completed = new();
+    private readonly object _lock = new();
+    private long _sequence;
+    private int _running;
+    private Exception? _error;
+
+    /// <param name="n_workers">Maximum number of concurrent score function calls across all studies. -1 for one per processor.</param>
+    public StudyScheduler(int n_workers = -1) {
+        _helper = EmbeddedModules.Helper;
+        _n_workers = n_workers > 0 ? n_workers : Environment.ProcessorCount;
+    }
+
+    /// <summary>
+    ///     The studies added so far, in order.
+    /// </summary>
+    public IReadOnlyList<Study> Studies => _studies;
+
+    /// <summary>
+    ///     Adds a study of <paramref name="optimization"/> with its surrogate and default acquisition function, random proposals for a <see cref="PyRandomOptimization{TParams}"/>.
+    /// </summary>
+    /// <param name="n_calls">Score function calls of the study.</param>
+    /// <param name="n_random_starts">Random points scored before the surrogate is fit.</param>
+    /// <param name="priority">Points of higher priority studies are scored first.</param>
+    /// <param name="batch_size">Points proposed per iteration using the constant liar strategy cl_min, they are scored concurrently.</param>
+    /// <param name="callbacks">Evaluated once per batch of the study, stopping it stops this study only.</param>
+    public Study<TParams> Add<TParams>(PyOptimization<TParams> optimization, int n_calls, int n_random_starts, int priority = 0, int batch_size = 1,
+                                       int? random_state = null, int n_points = 10000, double xi = 0.01d, double kappa = 1.96d, IEnumerable<PyOptCallback>? callbacks = null)
+        where TParams : class, new() {
+        if (n_calls < 1)
+            throw new ArgumentOutOfRangeException(nameof(n_calls), n_calls, "A study needs at least one call.");
+
+        var (estimator, acq_func) = optimization.CreateStudyEstimator(random_state);
+        PyObject study = _helper.Study(optimization.SearchSpace, estimator, optimization.Maximize, n_calls, n_initial_points: n_random_starts, batch_size: batch_size, priority: priority,
+                                       acq_func: acq_func, random_state: random_state != null ? new PyInt(random_state.Value) : PyObject.None, n_points: n_points, xi: xi, kappa: kappa,
+                                       callback: callbacks?.Select(p=>p.This).ToPyList(), cache: optimization.Cache?.This ?? PyObject.None);
+
+        var added = new Study<TParams>(optimization, study, _studies.Count, priority);
+        _studies.Add(added);
+        return added;
+    }
+
+    /// <summary>
+    ///     Runs all the studies to completion, their results are set to <see cref="Study{TParams}.Result"/>.
+    ///     An exception thrown by a score function stops all the studies and is rethrown.
+    /// </summary>
+    public void Run() {
+        using dynamic skopt = PyModule.Import("skopt");
+        PyObject results;
+        try {
+            results = _helper.schedule_studies(_studies.Select(s => s.This).ToPyList(), PyObject.FromManagedObject(Submit), PyObject.FromManagedObject(Wait),
+                                               PyObject.FromManagedObject(Collect));
+        } catch (Exception) {
+            //the evaluations still running write to the studies, they have to finish before the studies can be disposed
+            Drain();
+            if (_error != null)
+                ExceptionDispatchInfo.Capture(_error).Throw();
+            throw;
+        }
+
+        using (results) {
+            for (int i = 0; i < _studies.Count; i++)
+                _studies[i].End(skopt, results[i]);
+        }
+    }
+
+    /// <summary>
+    ///     Queues a batch of <paramref name="count"/> points of the study at <paramref name="study"/> in the columnar layout, see <see cref="Study.Populate"/>.
+    ///     Every point is queued at the number of points its study queued before it, so studies of equal priority take turns.
+    /// </summary>
+    private void Submit(int study, long reals, long integers, int count) {
+        var submitted = _studies[study];
+        submitted.Populate(reals, integers, count);
+        submitted.Remaining = count;
+        lock (_lock) {
+            for (int i = 0; i < count; i++)
+                _queue.Enqueue((submitted, i), (-submitted.Priority, submitted.Queued++, _sequence++));
+        }
+
+        Dispatch();
+    }
+
+    /// <summary>
+    ///     Blocks until at least one batch completed.
+    /// </summary>
+    /// <returns>The indices of the studies whose batch completed.</returns>
+    private int[] Wait() {
+        //called from python, pythonnet released the GIL for the call so score functions and other threads can take it while this blocks
+        var completed = new List<int> { _completed.Take() };
+        while (_completed.TryTake(out var index))
+            completed.Add(index);
+
+        if (_error != null)
+            throw new OperationCanceledException("A score function threw, the studies are stopped.", _error);
+        return completed.ToArray();
+    }
+
+    /// <summary>
+    ///     Copies the scores of the completed batch of the study at <paramref name="study"/> to <paramref name="scores"/>.
+    /// </summary>
+    private unsafe void Collect(int study, long scores, int count) {
+        _studies[study].Scores.AsSpan(0, count).CopyTo(new Span<double>((void*) scores, count));
+    }
+
+    /// <summary>
+    ///     Drops the queued evaluations and blocks until the running ones finished.
+    /// </summary>
+    private void Drain() {
+        var state = PythonEngine.BeginAllowThreads();
+        try {
+            lock (_lock) {
+                _queue.Clear();
+                while (_running > 0)
+                    Monitor.Wait(_lock);
+            }
+        } finally {
+            PythonEngine.EndAllowThreads(state);
+        }
+    }
+
+    /// <summary>
+    ///     Starts queued evaluations on the thread pool until n_workers are running.
+    /// </summary>
+    private void Dispatch() {
+        while (true) {
+            (Study Study, int Index) evaluation;
+            lock (_lock) {
+                if (_running >= _n_workers || !_queue.TryDequeue(out evaluation, out _))
+                    return;
+                _running++;
+            }
+
+            Task.Run(() => Evaluate(evaluation.Study, evaluation.Index));
+        }
+    }
+
+    private async Task Evaluate(Study study, int index) {
+        try {
+            study.Scores[index] = await study.ScoreAsync(index).ConfigureAwait(false);
+        } catch (Exception e) {
+            Interlocked.CompareExchange(ref _error, e, null);
+        }
+
+        study.Completed();
+        lock (_lock) {
+            _running--;
+            Monitor.PulseAll(_lock);
+        }
+        if (Interlocked.Decrement(ref study.Remaining) == 0)
+            _completed.Add(study.Index);
+        Dispatch();
+    }
+
+    public void Dispose() {
+        foreach (var study in _studies)
+            study.Dispose();
+        _completed.Dispose();
+        GC.SuppressFinalize(this);
+    }
+}
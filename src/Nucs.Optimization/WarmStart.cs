@@ -0,0 +1,71 @@
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Callbacks;
+using Nucs.Optimization.Helper;
+using Python.Runtime;
+
+namespace Nucs.Optimization;
+
+/// <summary>
+///     Evaluations of earlier runs, read from dumps and journals, that a new search is seeded with instead of starting cold.
+///     Wraps opt_helpers.WarmStart, pass it to Search/SearchAll/SearchTop as warm_start.
+/// </summary>
+/// <remarks>
+///     Evaluations are mapped to the parameters of the search by <see cref="ParametersAnalyzer{TParams}.ParameterNames"/>, so the search space may have changed since.
+///     Points outside of the search space or missing one of its parameters are dropped and repeated points are told once.
+///     The scores are told as they were recorded, the earlier runs have to share the goal (maximize or minimize) of the search.
+/// </remarks>
+public class WarmStart : IDisposable {
+    public readonly PyObject This;
+
+    /// <summary>
+    ///     Real parameters are rounded to this many decimals before finding repeated points. null to match exact values.
+    /// </summary>
+    public readonly int? Decimals;
+
+    public WarmStart(PyModule helperModule, int? decimals = null) {
+        Decimals = decimals;
+        This = helperModule.Get("WarmStart").Invoke(Array.Empty<PyObject>(), Py.kw("decimals", decimals != null ? new PyInt(decimals.Value) : PyObject.None));
+    }
+
+    public WarmStart(int? decimals = null) : this(EmbeddedModules.Helper, decimals) { }
+
+    /// <summary>
+    ///     Number of evaluations added, before they are filtered to a search space.
+    /// </summary>
+    public int Count => (int) This.Length();
+
+    /// <summary>
+    ///     Adds the evaluations of a result dumped by an optimization's dumpResults.
+    /// </summary>
+    public WarmStart AddDump(FileInfo file) {
+        if (!file.Exists)
+            throw new FileNotFoundException($"File {file.FullName} not found.");
+
+        This.InvokeMethod("add_dump", new PyString(file.FullName)).Dispose();
+        return this;
+    }
+
+    /// <summary>
+    ///     Adds the evaluations of a <see cref="Journal"/> file. Journals written before names were recorded are assumed to be in the order of the search space.
+    /// </summary>
+    public WarmStart AddJournal(FileInfo file) {
+        if (!file.Exists)
+            throw new FileNotFoundException($"File {file.FullName} not found.");
+
+        This.InvokeMethod("add_journal", new PyString(file.FullName)).Dispose();
+        return this;
+    }
+
+    /// <summary>
+    ///     Appends the evaluations that fit <paramref name="searchSpace"/> to <paramref name="x0"/>/<paramref name="y0"/>, skipping points already in them.
+    /// </summary>
+    /// <returns>The python lists (x0, y0) and the number of evaluations appended.</returns>
+    internal (PyObject X0, PyObject Y0, int Added) Points(PyObject searchSpace, string[] names, PyObject x0, PyObject y0) {
+        using var points = This.InvokeMethod("points", searchSpace, names.ToPython(), x0, y0);
+        return (points[0], points[1], points[2].As<int>());
+    }
+
+    public void Dispose() {
+        This.Dispose();
+    }
+}
@@ -1,10 +1,450 @@
 """Forest based minimization algorithms."""
 
-from skopt.learning import *
-from skopt.learning.forest import _return_std
+import contextlib
+import copy
+import io
+import threading
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 
 from sklearn.ensemble import RandomForestRegressor as _sk_RandomForestRegressor
 from sklearn.ensemble import ExtraTreesRegressor as _sk_ExtraTreesRegressor
+from sklearn.utils import check_array, check_random_state, gen_even_slices
+
+# Number of candidate rows scored by a single parallel task in `_return_mean_std`.
+_ROWS_PER_CHUNK = 4096
+
+
+def _leaf_tables(trees):
+    """
+    Returns per-tree `(leaf_mean, leaf_variance)` lookup tables.
+
+    Both tables are indexed by node id, so the leaf indices returned by
+    `tree.apply(X)` can be used directly to look up the mean and the
+    impurity (variance) of the leaf each sample falls into.
+
+    Parameters
+    ----------
+    trees : list, shape=(n_estimators,)
+        List of fit sklearn trees as obtained from the ``estimators_``
+        attribute of a fit RandomForestRegressor or ExtraTreesRegressor.
+
+    Returns
+    -------
+    tables : list of tuples, shape=(n_estimators,)
+        `(leaf_mean, leaf_variance)` arrays of shape=(n_nodes,) per tree.
+    """
+    return [(tree.tree_.value[:, 0, 0], tree.tree_.impurity) for tree in trees]
+
+
+def _accumulate_mean_std(X, trees, tables, min_variance, mean, std, lock):
+    """
+    Adds the leaf means and second moments of `trees` at `X` into `mean`
+    and `std`. This is a utility function for joblib's Parallel.
+    """
+    mean_chunk = np.zeros(X.shape[0])
+    std_chunk = np.zeros(X.shape[0])
+
+    for tree, (leaf_mean, leaf_variance) in zip(trees, tables):
+        leaves = tree.apply(X, check_input=False)
+        mean_tree = leaf_mean[leaves]
+        mean_chunk += mean_tree
+        std_chunk += np.maximum(leaf_variance[leaves], min_variance)
+        std_chunk += mean_tree ** 2
+
+    if lock is None:
+        mean += mean_chunk
+        std += std_chunk
+    else:
+        with lock:
+            mean += mean_chunk
+            std += std_chunk
+
+
+def _return_mean_std(X, trees, tables, min_variance, n_jobs=1):
+    """
+    Returns `mean(Y | X)` and `std(Y | X)` in a single pass over the trees.
+
+    Equivalent to calling the forest's `predict` followed by `_return_std`,
+    but every tree is traversed only once: the leaf index of each sample is
+    found with `tree.apply` and both the mean and the variance are read from
+    the precomputed `tables`.
+
+    Parameters
+    ----------
+    X : array-like, shape=(n_samples, n_features)
+        Input data, already validated by `_validate_X_predict`.
+
+    trees : list, shape=(n_estimators,)
+        List of fit sklearn trees.
+
+    tables : list, shape=(n_estimators,)
+        Leaf lookup tables as returned by `_leaf_tables(trees)`.
+
+    min_variance : float
+        Minimum variance of a leaf, see section 4.3.3 of arXiv:1211.0906.
+
+    n_jobs : int, optional (default=1)
+        The number of threads the work is split over. Trees are chunked
+        into `n_jobs` groups and candidate rows into blocks of
+        `_ROWS_PER_CHUNK`. If -1, then the number of jobs is set to the
+        number of cores.
+
+    Returns
+    -------
+    mean : array-like, shape=(n_samples,)
+        Predicted values for X.
+
+    std : array-like, shape=(n_samples,)
+        Standard deviation of `y` at `X`.
+    """
+    n_samples = X.shape[0]
+    mean = np.zeros(n_samples)
+    std = np.zeros(n_samples)
+
+    n_jobs = min(effective_n_jobs(n_jobs), len(trees))
+    if n_jobs <= 1:
+        _accumulate_mean_std(X, trees, tables, min_variance, mean, std, None)
+    else:
+        lock = threading.Lock()
+        n_row_chunks = max(1, -(-n_samples // _ROWS_PER_CHUNK))
+        Parallel(n_jobs=n_jobs, prefer="threads", require="sharedmem")(
+            delayed(_accumulate_mean_std)(X[rows], trees[chunk], tables[chunk], min_variance, mean[rows], std[rows], lock)
+            for chunk in gen_even_slices(len(trees), n_jobs)
+            for rows in gen_even_slices(n_samples, n_row_chunks))
+
+    mean /= len(trees)
+    std /= len(trees)
+    std -= mean ** 2.0
+    std[std < 0.0] = 0.0
+    std = std ** 0.5
+    return mean, std
+
+
+class FlatForest(object):
+    """
+    The trees of a fit forest flattened into shared contiguous arrays.
+
+    Node `i` of tree `t` is row `roots[t] + i` of every array. A sample at an
+    internal node moves to `children_left` when `X[:, feature] <= threshold`
+    and to `children_right` otherwise. Leaves are their own children with a
+    threshold of +inf, so a traversal can take a fixed `max_depth` steps for
+    all trees and samples at once. Thresholds are stored as float32, the
+    precision sklearn trees compare samples in, rounded down so that the
+    comparisons match theirs exactly.
+
+    This is the form `opt_helpers.dump_result` dumps the forest surrogates
+    of `result.models` in, and `to_bytes` is a compressed form of it. The
+    traversal runs in numpy and is slower than the trees' own `apply`, fit
+    forests keep predicting through their trees, and pickle and copy with
+    them.
+
+    Parameters
+    ----------
+    roots : array of int32, shape=(n_estimators,)
+        Row of the root of every tree.
+
+    feature, threshold, children_left, children_right : arrays, shape=(n_nodes,)
+        Split of every node, int32/float32/int32/int32.
+
+    leaf_mean, leaf_variance : arrays of float64, shape=(n_nodes,)
+        Mean and variance (impurity) of the targets at every node.
+
+    n_features : int
+        Number of features the forest was fit on.
+
+    max_depth : int
+        Depth of the deepest tree.
+
+    min_variance : float, optional (default=0.0)
+        Minimum variance of a leaf, see section 4.3.3 of arXiv:1211.0906.
+    """
+
+    _ARRAYS = ("roots", "feature", "threshold", "children_left", "children_right", "leaf_mean", "leaf_variance")
+
+    def __init__(self, roots, feature, threshold, children_left, children_right, leaf_mean, leaf_variance,
+                 n_features, max_depth, min_variance=0.0):
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.leaf_mean = leaf_mean
+        self.leaf_variance = leaf_variance
+        self.n_features = n_features
+        self.max_depth = max_depth
+        self.min_variance = min_variance
+
+    @classmethod
+    def from_trees(cls, trees, n_features, min_variance=0.0):
+        """Flattens a list of fit sklearn trees, the ``estimators_`` of a fit forest."""
+        trees = [tree.tree_ for tree in trees]
+        counts = np.array([tree.node_count for tree in trees], dtype=np.int32)
+        roots = np.zeros(len(trees), dtype=np.int32)
+        np.cumsum(counts[:-1], out=roots[1:])
+
+        feature = np.concatenate([tree.feature for tree in trees]).astype(np.int32)
+        threshold = np.concatenate([tree.threshold for tree in trees])
+        children_left = np.concatenate([tree.children_left + root for tree, root in zip(trees, roots)]).astype(np.int32)
+        children_right = np.concatenate([tree.children_right + root for tree, root in zip(trees, roots)]).astype(np.int32)
+
+        leaves = feature < 0
+        rows = np.flatnonzero(leaves).astype(np.int32)
+        children_left[rows] = children_right[rows] = rows
+        feature[leaves] = 0
+        threshold[leaves] = np.inf
+
+        # largest float32 not above the float64 threshold: x <= t32 <=> x <= t for float32 x
+        threshold32 = threshold.astype(np.float32)
+        above = threshold32 > threshold
+        threshold32[above] = np.nextafter(threshold32[above], np.float32(-np.inf))
+
+        return cls(roots, feature, threshold32, children_left, children_right,
+                   np.concatenate([tree.value[:, 0, 0] for tree in trees]),
+                   np.concatenate([tree.impurity for tree in trees]),
+                   n_features, max(tree.max_depth for tree in trees), min_variance)
+
+    def __len__(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """
+        Returns the leaf every sample of `X` falls into in every tree, as
+        rows of the flat arrays of shape=(n_samples, n_estimators).
+        """
+        X = check_array(X, dtype=np.float32, order="C")
+        if X.shape[1] != self.n_features:
+            raise ValueError("X has %d features, but the forest was fit on %d features." % (X.shape[1], self.n_features))
+        nodes = np.empty((X.shape[0], len(self.roots)), dtype=np.int32)
+        for rows in gen_even_slices(X.shape[0], max(1, -(-X.shape[0] // _ROWS_PER_CHUNK))):
+            nodes[rows] = self._apply(X[rows])
+        return nodes
+
+    def _apply(self, X):
+        flat = X.ravel()
+        offsets = (np.arange(X.shape[0]) * X.shape[1])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            left = flat[offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(left, self.children_left[nodes], self.children_right[nodes])
+        return nodes
+
+    def predict(self, X, return_std=False):
+        """
+        Predicts `mean(Y | X)` and, with `return_std`, `std(Y | X)` the same
+        way the forest surrogates do. `X` is compared in float32.
+        """
+        leaves = self.apply(X)
+        mean_tree = self.leaf_mean[leaves]
+        mean = mean_tree.mean(axis=1)
+        if not return_std:
+            return mean
+
+        std = (np.maximum(self.leaf_variance[leaves], self.min_variance) + mean_tree ** 2).mean(axis=1)
+        std -= mean ** 2.0
+        std[std < 0.0] = 0.0
+        return mean, std ** 0.5
+
+    def to_bytes(self):
+        """A compressed serialized form, see `from_bytes`."""
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, n_features=self.n_features, max_depth=self.max_depth, min_variance=self.min_variance,
+                            **{name: getattr(self, name) for name in self._ARRAYS})
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data)) as arrays:
+            return cls(*(arrays[name] for name in cls._ARRAYS), n_features=int(arrays["n_features"]),
+                       max_depth=int(arrays["max_depth"]), min_variance=float(arrays["min_variance"]))
+
+
+class IncrementalState(object):
+    """
+    Ensemble kept between the fits of a forest surrogate.
+
+    skopt clones the base estimator before every fit, so the trees of the
+    previous iteration are normally thrown away and the whole forest is
+    rebuilt on the full history. Passing an `IncrementalState` as the
+    `incremental` parameter of `RandomForestRegressor`/`ExtraTreesRegressor`
+    shares it between all the clones; every fit then keeps the previous
+    ensemble and retrains only the `n_replace` oldest trees on the current
+    observations.
+
+    The constant liar copies `Optimizer.ask(n_points=...)` makes fit the same
+    clones on made up scores, asking them inside `frozen()` keeps their trees
+    out of the state.
+
+    Parameters
+    ----------
+    n_replace : int or None, optional (default=None)
+        The number of oldest trees retrained on every incremental fit.
+        If None, then `max(1, n_estimators // 10)`.
+
+    refit_every : int or None, optional (default=10)
+        Every `refit_every`-th fit rebuilds the whole forest.
+        If None, then only the first fit is a full one.
+
+    Attributes
+    ----------
+    estimators_ : list of DecisionTreeRegressor
+        The ensemble of the last fit, oldest trees first.
+
+    n_fits_ : int
+        The number of fits performed so far.
+
+    n_full_fits_ : int
+        The number of fits that rebuilt the whole forest.
+    """
+
+    def __init__(self, n_replace=None, refit_every=10):
+        self.n_replace = n_replace
+        self.refit_every = refit_every
+        self.estimators_ = None
+        self.n_fits_ = 0
+        self.n_full_fits_ = 0
+        self._n_features = None
+        self._random_state = None
+
+    def __deepcopy__(self, memo):
+        # sklearn.base.clone deep-copies parameters, the state has to be shared
+        return self
+
+    def fresh(self):
+        """An empty state of the same parameters, for a surrogate that must not share the ensemble."""
+        return IncrementalState(n_replace=self.n_replace, refit_every=self.refit_every)
+
+    @contextlib.contextmanager
+    def frozen(self):
+        """Fits inside the block start from the current ensemble, the state is restored as it was on exit."""
+        saved = (self.estimators_, self.n_fits_, self.n_full_fits_, self._n_features, copy.deepcopy(self._random_state))
+        try:
+            yield self
+        finally:
+            self.estimators_, self.n_fits_, self.n_full_fits_, self._n_features, self._random_state = saved
+
+    def fit(self, forest, fit, X, y, sample_weight=None):
+        """Fits `forest` through `fit` (its super's fit), incrementally when possible."""
+        if self._random_state is None:
+            self._random_state = check_random_state(forest.random_state)
+
+        n_replace = self.n_replace if self.n_replace is not None else max(1, forest.n_estimators // 10)
+        full = (self.estimators_ is None
+                or self._n_features != X.shape[1]
+                or len(self.estimators_) != forest.n_estimators
+                or n_replace >= forest.n_estimators
+                or (self.refit_every is not None and self.n_fits_ % self.refit_every == 0))
+
+        random_state, warm_start = forest.random_state, forest.warm_start
+        # draw a fresh seed per fit so the replaced trees are not re-grown from the same seeds
+        forest.random_state = self._random_state.randint(np.iinfo(np.int32).max)
+        try:
+            if full:
+                forest.warm_start = False
+                fit(X, y, sample_weight=sample_weight)
+                self.n_full_fits_ += 1
+            else:
+                forest.estimators_ = self.estimators_[n_replace:]
+                forest.warm_start = True
+                fit(X, y, sample_weight=sample_weight)
+        finally:
+            forest.random_state, forest.warm_start = random_state, warm_start
+
+        self.estimators_ = list(forest.estimators_)
+        self._n_features = X.shape[1]
+        self.n_fits_ += 1
+        return forest
+
+
+class TrainingSetPolicy(object):
+    """
+    Bounded training set of a forest surrogate.
+
+    Without a policy every fit trains on the whole history, so the memory and
+    the fit time of a forest surrogate grow with the number of evaluations.
+    Passing a `TrainingSetPolicy` as the `training_set` parameter of
+    `RandomForestRegressor`/`ExtraTreesRegressor` fits on at most `max_points`
+    observations instead: the `n_best` lowest scores and the `n_recent` most
+    recent observations are always kept, the rest of the room is a subsample
+    of the remaining observations stratified over their scores.
+
+    Parameters
+    ----------
+    max_points : int
+        The maximum number of observations fit on.
+
+    n_best : int or None, optional (default=None)
+        The number of lowest scoring observations always kept.
+        If None, then `max_points // 4`.
+
+    n_recent : int or None, optional (default=None)
+        The number of most recent observations always kept.
+        If None, then `max_points // 4`.
+
+    random_state : int, RandomState instance or None, optional (default=None)
+        Seeds the subsampling of the remaining observations.
+
+    Attributes
+    ----------
+    n_selects_ : int
+        The number of fits that were fit on a subset of the observations.
+    """
+
+    def __init__(self, max_points, n_best=None, n_recent=None, random_state=None):
+        self.max_points = max_points
+        self.n_best = n_best
+        self.n_recent = n_recent
+        self.random_state = random_state
+        self.n_selects_ = 0
+        self._random_state = None
+
+    def __deepcopy__(self, memo):
+        # sklearn.base.clone deep-copies parameters, sharing the state keeps the subsamples of consecutive fits apart
+        return self
+
+    def fresh(self):
+        """An unused policy of the same parameters, for a surrogate that must not share the state."""
+        return TrainingSetPolicy(self.max_points, n_best=self.n_best, n_recent=self.n_recent, random_state=self.random_state)
+
+    def indices(self, y):
+        """Returns the sorted indices of the observations to fit on, `y` ordered from the oldest observation."""
+        y = np.asarray(y)
+        # with `EIps`/`PIps` the second column is the log of the objective's time
+        scores = y if y.ndim == 1 else y[:, 0]
+        n = len(scores)
+        if n <= self.max_points:
+            return np.arange(n)
+
+        if self._random_state is None:
+            self._random_state = check_random_state(self.random_state)
+
+        n_best = min(self.n_best if self.n_best is not None else self.max_points // 4, self.max_points)
+        n_recent = min(self.n_recent if self.n_recent is not None else self.max_points // 4, self.max_points - n_best)
+        keep = np.zeros(n, dtype=bool)
+        keep[np.argsort(scores, kind="stable")[:n_best]] = True
+        keep[n - n_recent:] = True
+
+        # one observation from each of `room` consecutive strata of the rest sorted by score
+        rest = np.flatnonzero(~keep)
+        room = self.max_points - np.count_nonzero(keep)
+        if room > 0:
+            rest = rest[np.argsort(scores[rest], kind="stable")]
+            offsets = (np.arange(room) + self._random_state.uniform(size=room)) * (len(rest) / room)
+            keep[rest[offsets.astype(np.intp)]] = True
+
+        self.n_selects_ += 1
+        return np.flatnonzero(keep)
+
+    def select(self, X, y, sample_weight=None):
+        """Returns `X`, `y` and `sample_weight` reduced to the observations to fit on."""
+        X, y = np.asarray(X), np.asarray(y)
+        indices = self.indices(y)
+        if len(indices) == len(y):
+            return X, y, sample_weight
+        if sample_weight is not None:
+            sample_weight = np.asarray(sample_weight)[indices]
+        return X[indices], y[indices], sample_weight
 
 
 class RandomForestRegressor(_sk_RandomForestRegressor):
@@ -110,6 +550,15 @@ class RandomForestRegressor(_sk_RandomForestRegressor):
         and add more estimators to the ensemble, otherwise, just fit a whole
         new forest.
 
+    incremental : IncrementalState or None, optional (default=None)
+        When set, the ensemble is kept between fits (and between the clones
+        skopt makes of this estimator) and only the oldest trees are
+        retrained on every fit, see `IncrementalState`.
+
+    training_set : TrainingSetPolicy or None, optional (default=None)
+        When set, every fit is on at most `training_set.max_points` of the
+        observations, see `TrainingSetPolicy`.
+
     Attributes
     ----------
     estimators_ : list of DecisionTreeRegressor
@@ -156,8 +605,10 @@ class RandomForestRegressor(_sk_RandomForestRegressor):
                  max_leaf_nodes=None, min_impurity_decrease=0.,
                  bootstrap=True, oob_score=False,
                  n_jobs=1, random_state=None, verbose=0, warm_start=False,
-                 min_variance=0.0):
+                 min_variance=0.0, incremental=None, training_set=None):
         self.min_variance = min_variance
+        self.incremental = incremental
+        self.training_set = training_set
         super(RandomForestRegressor, self).__init__(
             n_estimators=n_estimators, criterion=criterion,
             max_depth=max_depth,
@@ -192,16 +643,37 @@ class RandomForestRegressor(_sk_RandomForestRegressor):
             is set to "mse", then `std[i] ~= std(y | X[i])`.
 
         """
-        mean = super(RandomForestRegressor, self).predict(X)
-
         if return_std:
             if self.criterion != "squared_error":
                 raise ValueError(
                     "Expected impurity to be 'mse', got %s instead"
                     % self.criterion)
-            std = _return_std(X, self.estimators_, mean, self.min_variance)
-            return mean, std
-        return mean
+            X = self._validate_X_predict(X)
+            return _return_mean_std(X, self.estimators_, self._get_leaf_tables(), self.min_variance, self.n_jobs)
+
+        return super(RandomForestRegressor, self).predict(X)
+
+    def flatten(self):
+        """Returns the fit trees as a `FlatForest`, the form `opt_helpers.dump_result` dumps the surrogate in."""
+        return FlatForest.from_trees(self.estimators_, self.n_features_in_, self.min_variance)
+
+    def fit(self, X, y, sample_weight=None):
+        if self.training_set is not None:
+            X, y, sample_weight = self.training_set.select(X, y, sample_weight)
+        if self.incremental is None:
+            super(RandomForestRegressor, self).fit(X, y, sample_weight=sample_weight)
+        else:
+            X = np.asarray(X)
+            self.incremental.fit(self, super(RandomForestRegressor, self).fit, X, y, sample_weight=sample_weight)
+        self._leaf_tables = _leaf_tables(self.estimators_)
+        return self
+
+    def _get_leaf_tables(self):
+        # models loaded from older dumps were fit without the lookup tables
+        tables = getattr(self, "_leaf_tables", None)
+        if tables is None or len(tables) != len(self.estimators_):
+            tables = self._leaf_tables = _leaf_tables(self.estimators_)
+        return tables
 
 
 class ExtraTreesRegressor(_sk_ExtraTreesRegressor):
@@ -380,6 +852,15 @@ class ExtraTreesRegressor(_sk_ExtraTreesRegressor):
 
         .. versionadded:: 0.22
 
+    incremental : IncrementalState or None, optional (default=None)
+        When set, the ensemble is kept between fits (and between the clones
+        skopt makes of this estimator) and only the oldest trees are
+        retrained on every fit, see `IncrementalState`.
+
+    training_set : TrainingSetPolicy or None, optional (default=None)
+        When set, every fit is on at most `training_set.max_points` of the
+        observations, see `TrainingSetPolicy`.
+
     Attributes
     ----------
     estimator_ : :class:`~sklearn.tree.ExtraTreeRegressor`
@@ -472,8 +953,10 @@ class ExtraTreesRegressor(_sk_ExtraTreesRegressor):
                  max_leaf_nodes=None, min_impurity_decrease=0.,
                  bootstrap=False, oob_score=False,
                  n_jobs=1, random_state=None, verbose=0, warm_start=False,
-                 min_variance=0.0):
+                 min_variance=0.0, incremental=None, training_set=None):
         self.min_variance = min_variance
+        self.incremental = incremental
+        self.training_set = training_set
         super(ExtraTreesRegressor, self).__init__(
             n_estimators=n_estimators, criterion=criterion,
             max_depth=max_depth,
@@ -508,14 +991,34 @@ class ExtraTreesRegressor(_sk_ExtraTreesRegressor):
             Standard deviation of `y` at `X`. If criterion
             is set to "mse", then `std[i] ~= std(y | X[i])`.
         """
-        mean = super(ExtraTreesRegressor, self).predict(X)
-
         if return_std:
             if self.criterion != "squared_error":
                 raise ValueError(
                     "Expected impurity to be 'mse', got %s instead"
                     % self.criterion)
-            std = _return_std(X, self.estimators_, mean, self.min_variance)
-            return mean, std
-
-        return mean
+            X = self._validate_X_predict(X)
+            return _return_mean_std(X, self.estimators_, self._get_leaf_tables(), self.min_variance, self.n_jobs)
+
+        return super(ExtraTreesRegressor, self).predict(X)
+
+    def flatten(self):
+        """Returns the fit trees as a `FlatForest`, the form `opt_helpers.dump_result` dumps the surrogate in."""
+        return FlatForest.from_trees(self.estimators_, self.n_features_in_, self.min_variance)
+
+    def fit(self, X, y, sample_weight=None):
+        if self.training_set is not None:
+            X, y, sample_weight = self.training_set.select(X, y, sample_weight)
+        if self.incremental is None:
+            super(ExtraTreesRegressor, self).fit(X, y, sample_weight=sample_weight)
+        else:
+            X = np.asarray(X)
+            self.incremental.fit(self, super(ExtraTreesRegressor, self).fit, X, y, sample_weight=sample_weight)
+        self._leaf_tables = _leaf_tables(self.estimators_)
+        return self
+
+    def _get_leaf_tables(self):
+        # models loaded from older dumps were fit without the lookup tables
+        tables = getattr(self, "_leaf_tables", None)
+        if tables is None or len(tables) != len(self.estimators_):
+            tables = self._leaf_tables = _leaf_tables(self.estimators_)
+        return tables
@@ -1,16 +1,62 @@
+import bisect
+import cProfile
+import io
 import json
+import os
+import pstats
+import sqlite3
+import time
+from collections import OrderedDict
 import clr
 from System.Collections.Generic import SortedDictionary
 import System
-from skopt.callbacks import EarlyStopper
+import numpy as np
 
+# skopt and sklearn are imported where they are used, loading this module does not import them.
+
+
+def columnarScoreWrapper(func, dimensions, maximize, cache=None, profiler=None, timer=None):
+    """
+    Wraps a .NET score function, see `PyOptimization.UnboxColumnarScoreMethod`.
+    With an `ObjectiveTimer`, the wrapper returns `(score, elapsed seconds)` for
+    the cost-aware acquisition functions "EIps" and "PIps".
+    """
+    layout = ColumnarLayout(dimensions)
+    reals, integers = layout.allocate()
+    reals_ptr, integers_ptr = reals.ctypes.data, integers.ctypes.data
+
+    def score(point):
+        key = None
+        if cache is not None:
+            key = cache.key(point, dimensions)
+            value = cache.get(key)
+            if value is not None:
+                return value, None if timer is None else timer.elapsed(key)
+
+        if profiler is not None or timer is not None:
+            start = time.perf_counter()
+            layout.pack(point, reals, integers)
+            value = func(reals_ptr, integers_ptr)
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.record_call(elapsed, 1)
+            if timer is not None:
+                timer.record(elapsed, key)
+        else:
+            layout.pack(point, reals, integers)
+            value = func(reals_ptr, integers_ptr)
+            elapsed = None
+        if cache is not None:
+            cache.put(key, value)
+        return value, elapsed
 
-def scoreWrapper(func, names, maximize):
     def minimize_wrapper(*args):
-        return func(unbox_params(names, args[0]))
+        value, elapsed = score(args[0])
+        return value if timer is None else (value, elapsed)
 
     def maximize_wrapper(*args):
-        return -func(unbox_params(names, args[0]))  # negate the score to minimize
+        value, elapsed = score(args[0])
+        return -value if timer is None else (-value, elapsed)  # negate the score to minimize
 
     if maximize:
         return maximize_wrapper
@@ -18,6 +64,444 @@ def scoreWrapper(func, names, maximize):
         return minimize_wrapper
 
 
+def columnarBatchScoreWrapper(func, dimensions, maximize, n_workers, cache=None, profiler=None, budgeted=False, timer=None):
+    """
+    Wraps a .NET batch score function, see `PyOptimization.UnboxColumnarBatchScoreMethod`.
+    When `budgeted`, the wrapper takes the budget of the batch as a second argument and passes it on
+    to `func`, see `budget_minimize`. Scores below the full budget of 1 are cached apart.
+    With an `ObjectiveTimer`, `func` times every evaluation and the wrapper returns
+    `[score, elapsed seconds]` pairs for "EIps" and "PIps".
+    """
+    layout = ColumnarLayout(dimensions)
+
+    def batch_wrapper(points, budget=1.0):
+        scores = np.empty(len(points))
+        pending = list(range(len(points)))
+        keys = None
+        if cache is not None:
+            keys = [cache.key(point, dimensions) for point in points]
+            if budget < 1.0:
+                keys = [key + (("budget", budget),) for key in keys]
+            pending, first = [], {}
+            for i, key in enumerate(keys):
+                if key in first:  # repeated within the batch, scored once
+                    cache.hits += 1
+                    continue
+                value = cache.get(key)
+                if value is not None:
+                    scores[i] = value
+                else:
+                    first[key] = i
+                    pending.append(i)
+
+        elapsed = np.zeros(len(pending)) if timer is not None else None
+        if pending:
+            start = time.perf_counter()
+            reals, integers = layout.allocate(len(pending))
+            for row, i in enumerate(pending):
+                layout.pack(points[i], reals[row], integers[row])
+            computed = np.empty(len(pending))
+            elapsed_ptr = elapsed.ctypes.data if elapsed is not None else 0
+            if budgeted:
+                func(reals.ctypes.data, integers.ctypes.data, computed.ctypes.data, len(pending), n_workers, budget)
+            else:
+                func(reals.ctypes.data, integers.ctypes.data, computed.ctypes.data, elapsed_ptr, len(pending), n_workers)
+            scores[pending] = computed
+            if profiler is not None:
+                profiler.record_call(time.perf_counter() - start, len(pending))
+            if timer is not None:
+                for row, i in enumerate(pending):
+                    timer.record(elapsed[row], keys[i] if keys is not None else None)
+
+        if cache is not None:
+            for i in pending:
+                cache.put(keys[i], scores[i])
+            for i, key in enumerate(keys):
+                scores[i] = scores[first.get(key, i)]
+
+        if maximize:
+            scores = -scores  # negate the score to minimize
+        if timer is None:
+            return scores.tolist()
+
+        times = [timer.elapsed(keys[i] if keys is not None else None) for i in range(len(points))]
+        for row, i in enumerate(pending):
+            times[i] = float(elapsed[row])
+        return [[score, t] for score, t in zip(scores.tolist(), times)]
+
+    return batch_wrapper
+
+
+class ObjectiveTimer(object):
+    """
+    Elapsed seconds of the objective for the cost-aware acquisition functions "EIps"
+    and "PIps", which fit the log of the time every evaluation took next to its score
+    and favor points expected to be cheap.
+
+    The score wrappers record the time of every evaluation they make. Evaluations
+    that were not timed, answered from the `ObjectiveCache` or told as `x0`/`y0`,
+    are assumed to take the time recorded for the same cache key, or the mean of
+    the times recorded so far, or `default` seconds before the first.
+    """
+
+    def __init__(self, default=1.0):
+        self.default = default
+        self.total = 0.0
+        self.count = 0
+        self._times = {}
+
+    def record(self, elapsed, key=None):
+        elapsed = float(elapsed)
+        self.total += elapsed
+        self.count += 1
+        if key is not None:
+            self._times[key] = elapsed
+
+    def elapsed(self, key=None):
+        if key is not None and key in self._times:
+            return self._times[key]
+        return self.total / self.count if self.count else self.default
+
+    def pairs(self, y0):
+        """`y0` as `[score, elapsed]` pairs, None stays None."""
+        if y0 is None:
+            return None
+        return [[float(y), self.elapsed()] for y in y0]
+
+
+class ColumnarLayout(object):
+    """
+    Fixed packing of a point into two contiguous buffers.
+
+    `Real` dimensions go into a float64 buffer, `Integer` dimensions and the
+    codes of `Categorical` dimensions (the index into `dim.categories`) into
+    an int64 buffer. Slots are assigned in dimension order, which is the
+    order of `ParametersAnalyzer.ParameterNames`, so the .NET side derives
+    the same layout without exchanging it.
+    """
+
+    def __init__(self, dimensions):
+        from skopt.space import Integer, Real
+
+        self.reals = []
+        self.integers = []
+        self.categoricals = []
+        for i, dim in enumerate(dimensions):
+            if isinstance(dim, Real):
+                self.reals.append((i, len(self.reals)))
+            elif isinstance(dim, Integer):
+                self.integers.append((i, len(self.integers) + len(self.categoricals)))
+            else:
+                codes = {category: code for code, category in enumerate(dim.categories)}
+                self.categoricals.append((i, len(self.integers) + len(self.categoricals), codes))
+
+        self.n_reals = len(self.reals)
+        self.n_integers = len(self.integers) + len(self.categoricals)
+
+    def allocate(self, n_points=None):
+        if n_points is None:
+            return np.zeros(self.n_reals), np.zeros(self.n_integers, dtype=np.int64)
+        return np.zeros((n_points, self.n_reals)), np.zeros((n_points, self.n_integers), dtype=np.int64)
+
+    def pack(self, point, reals, integers):
+        for i, slot in self.reals:
+            reals[slot] = point[i]
+        for i, slot in self.integers:
+            integers[slot] = point[i]
+        for i, slot, codes in self.categoricals:
+            integers[slot] = codes[point[i]]
+
+    def pack_all(self, points):
+        """Packs a list of points into row-major [n, k] buffers, one column at a time."""
+        reals, integers = self.allocate(len(points))
+        if len(points) == 0:
+            return reals, integers
+
+        columns = list(zip(*points))
+        for i, slot in self.reals:
+            reals[:, slot] = columns[i]
+        for i, slot in self.integers:
+            integers[:, slot] = columns[i]
+        for i, slot, codes in self.categoricals:
+            integers[:, slot] = [codes[value] for value in columns[i]]
+        return reals, integers
+
+
+def columnar_results(result, top=None):
+    """
+    Packs `result.x_iters` and `result.func_vals` into the columnar layout in bulk.
+
+    Returns `(reals, integers, scores)` with one row per iteration, see
+    `ColumnarLayout`. When `top` is given, only the `top` lowest scores are
+    packed, in no particular order.
+    """
+    x_iters = result.x_iters
+    func_vals = np.asarray(result.func_vals, dtype=np.float64)
+    if top is not None and top < len(func_vals):
+        indices = np.argpartition(func_vals, top)[:top]
+        x_iters = [x_iters[i] for i in indices]
+        func_vals = func_vals[indices]
+
+    reals, integers = ColumnarLayout(result.space.dimensions).pack_all(x_iters)
+    return reals, integers, np.ascontiguousarray(func_vals)
+
+
+def dump_result(result, filename):
+    """
+    Dumps `result` like `skopt.utils.dump(result, filename, store_objective=False)`, with the
+    forest surrogates of `result.models` flattened into `forest.FlatForest`s, which are several
+    times smaller and load without sklearn's trees. `result` itself keeps its surrogates.
+    """
+    from skopt.utils import dump
+
+    models = result.get("models")
+    if models:
+        result = type(result)(result)
+        result.models = [model.flatten() if hasattr(model, "flatten") else model for model in models]
+    dump(result, filename, store_objective=False)
+
+
+def canonical_key(point, dimensions, decimals=None):
+    """
+    Hashable key of a point, equal for points that evaluate the same: numpy scalars are unboxed,
+    integers are ints and reals are floats, rounded to `decimals` when it is not None.
+    """
+    from skopt.space import Integer, Real
+
+    canonical = []
+    for dim, value in zip(dimensions, point):
+        if hasattr(value, 'dtype'):
+            value = value.item()
+        if isinstance(dim, Real):
+            value = float(value)
+            if decimals is not None:
+                value = round(value, decimals)
+        elif isinstance(dim, Integer):
+            value = int(value)
+        canonical.append(value)
+    return tuple(canonical)
+
+
+class ObjectiveCache(object):
+    """
+    Memoizes objective scores keyed on the canonicalized point.
+
+    Integer and categorical spaces make the optimizer propose points that were
+    already evaluated, those are answered from the cache instead of calling the
+    objective again. Scores are stored in the polarity of the goal.
+
+    Parameters
+    ----------
+    max_size : int or None
+        Maximum number of scores kept in memory, least recently used are evicted first.
+        None for unbounded.
+    decimals : int or None
+        Real dimensions are rounded to this many decimals before keying.
+        None to key on the exact value.
+    path : str or None
+        SQLite database file that persists every score, so repeated runs can
+        reuse them. Evicted scores are still served from it. None for memory only.
+    """
+
+    def __init__(self, max_size=None, decimals=None, path=None):
+        self.max_size = max_size
+        self.decimals = decimals
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, score REAL NOT NULL)")
+            self._db.commit()
+
+    def key(self, point, dimensions):
+        return canonical_key(point, dimensions, self.decimals)
+
+    def get(self, key):
+        value = self._scores.get(key)
+        if value is not None:
+            self._scores.move_to_end(key)
+        elif self._db is not None:
+            row = self._db.execute("SELECT score FROM scores WHERE key = ?", (repr(key),)).fetchone()
+            if row is not None:
+                value = row[0]
+                self._remember(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        value = float(value)
+        self._remember(key, value)
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO scores (key, score) VALUES (?, ?)", (repr(key), value))
+            self._db.commit()
+
+    def _remember(self, key, value):
+        self._scores[key] = value
+        self._scores.move_to_end(key)
+        if self.max_size is not None:
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+    def clear(self):
+        self._scores.clear()
+        self.hits = 0
+        self.misses = 0
+        if self._db is not None:
+            self._db.execute("DELETE FROM scores")
+            self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self):
+        if self._db is not None:
+            return self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        return len(self._scores)
+
+
+
+class History(object):
+    """
+    Compact evaluation history backed by a numpy structured array.
+
+    Every dimension gets one typed column named after it, float64 for `Real`
+    and int64 for `Integer` and the code of a `Categorical` value, followed by
+    the minimized `score` and the `timestamp` of the evaluation. Capacity
+    doubles when full, so appends are amortized O(1). With `path`, the array
+    is a `numpy.memmap` of that file and grows with it.
+
+    It is a skopt callback appending the evaluations that are new since the
+    previous call. `dimensions` are taken from the first result when omitted.
+    """
+
+    def __init__(self, dimensions=None, path=None, capacity=1024):
+        self.path = path
+        self.capacity = max(1, capacity)
+        self.dimensions = None
+        self.dtype = None
+        self._layout = None
+        self._data = None
+        self._size = 0
+        self._seen = 0
+        if dimensions is not None:
+            self._bind(dimensions)
+
+    def _bind(self, dimensions):
+        from skopt.space import Real
+
+        self.dimensions = list(dimensions)
+        self._layout = ColumnarLayout(self.dimensions)
+        self._names = [dim.name if dim.name else "x%d" % i for i, dim in enumerate(self.dimensions)]
+        fields = [(name, np.float64 if isinstance(dim, Real) else np.int64) for name, dim in zip(self._names, self.dimensions)]
+        self.dtype = np.dtype(fields + [("score", np.float64), ("timestamp", np.float64)])
+        self._data = self._allocate(self.capacity)
+
+    def _allocate(self, capacity):
+        if self.path is None:
+            data = np.zeros(capacity, dtype=self.dtype)
+            if self._data is not None:
+                data[:self._size] = self._data[:self._size]
+            return data
+
+        if self._data is None:
+            return np.memmap(self.path, dtype=self.dtype, mode="w+", shape=(capacity,))
+
+        self._data.flush()
+        with open(self.path, "r+b") as file:
+            file.truncate(capacity * self.dtype.itemsize)
+        return np.memmap(self.path, dtype=self.dtype, mode="r+", shape=(capacity,))
+
+    def append(self, point, score, timestamp=None):
+        self.extend([point], [score], timestamp)
+
+    def extend(self, points, scores, timestamp=None):
+        n = len(points)
+        if n == 0:
+            return
+
+        if self._size + n > len(self._data):
+            self._data = self._allocate(max(len(self._data) * 2, self._size + n))
+
+        rows = self._data[self._size:self._size + n]
+        columns = list(zip(*points))
+        for i, slot in self._layout.reals:
+            rows[self._names[i]] = columns[i]
+        for i, slot in self._layout.integers:
+            rows[self._names[i]] = columns[i]
+        for i, slot, codes in self._layout.categoricals:
+            rows[self._names[i]] = [codes[value] for value in columns[i]]
+        rows["score"] = scores
+        rows["timestamp"] = time.time() if timestamp is None else timestamp
+        self._size += n
+
+    def __call__(self, result):
+        if self._layout is None:
+            self._bind(result.space.dimensions)
+        if len(result.func_vals) < self._seen:  # a new run
+            self._seen = 0
+
+        self.extend(result.x_iters[self._seen:], result.func_vals[self._seen:])
+        self._seen = len(result.func_vals)
+        return None
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def data(self):
+        """The recorded rows, a view of the structured array."""
+        if self._data is None:
+            return np.zeros(0)
+        return self._data[:self._size]
+
+    def top(self, k):
+        """Indices of the `k` lowest scores, lowest first."""
+        scores = self.data["score"] if self._size else np.zeros(0)
+        if k < len(scores):
+            indices = np.argpartition(scores, k)[:k]
+        else:
+            indices = np.arange(len(scores))
+        return indices[np.argsort(scores[indices], kind="stable")]
+
+    def rows(self, indices):
+        """Packs the given rows as `(reals, integers, scores)` in the columnar layout, see `ColumnarLayout`."""
+        data = self.data[np.asarray(indices, dtype=np.int64)]
+        reals, integers = self._layout.allocate(len(data))
+        for i, slot in self._layout.reals:
+            reals[:, slot] = data[self._names[i]]
+        for i, slot in self._layout.integers:
+            integers[:, slot] = data[self._names[i]]
+        for i, slot, codes in self._layout.categoricals:
+            integers[:, slot] = data[self._names[i]]
+        return reals, integers, np.ascontiguousarray(data["score"])
+
+    def points(self, indices):
+        """Decodes the given rows back to points of the search space."""
+        from skopt.space import Integer, Real
+
+        data = self.data[np.asarray(indices, dtype=np.int64)]
+        columns = []
+        for name, dim in zip(self._names, self.dimensions):
+            column = data[name].tolist()
+            if not isinstance(dim, (Real, Integer)):
+                column = [dim.categories[code] for code in column]
+            columns.append(column)
+        return [list(point) for point in zip(*columns)]
+
+    def flush(self):
+        if isinstance(self._data, np.memmap):
+            self._data.flush()
+
+
 def unbox_params(names, result):
     tupleType = System.Tuple[System.String, System.Object]
     listType = System.Collections.Generic.List[tupleType]
@@ -63,10 +547,1102 @@ class netdict(dict):
 def asJson(params):
     return json.loads(params)
 
-class EarlyStopperWrapper(EarlyStopper):
-    def __init__(self, callback) -> None:
+class _EarlyStopperWrapperMixin(object):
+    """
+    `skopt.callbacks.EarlyStopper` calling back into .NET, True stops the optimization.
+
+    `callback(result)` is passed the whole result. When `columnar`, it is passed every point
+    told since its last call and its score instead, one call per point, as
+    `callback(reals_ptr, integers_ptr, score)`: the point packed in the columnar layout into
+    buffers that are reused for every call, see `ColumnarLayout`. The points after the first
+    one returning True are not passed.
+    """
+
+    def __init__(self, callback, columnar=False) -> None:
         super().__init__()
         self.callback = callback
+        self.columnar = columnar
+        self._layout = None
+        self._seen = 0
+
+    def _criterion(self, result):
+        if not self.columnar:
+            return self.callback(result)
+
+        if self._layout is None:
+            self._layout = ColumnarLayout(result.space.dimensions)
+            self._reals, self._integers = self._layout.allocate()
+        if len(result.func_vals) < self._seen:  # a new run
+            self._seen = 0
+
+        # batched searches evaluate callbacks once per batch, every point of it is passed
+        seen, self._seen = self._seen, len(result.func_vals)
+        for x, y in zip(result.x_iters[seen:], result.func_vals[seen:]):
+            self._layout.pack(x, self._reals, self._integers)
+            if self.callback(self._reals.ctypes.data, self._integers.ctypes.data, float(y)):
+                return True
+        return None
+
+
+class _DeltaYStopperMixin(object):
+    """
+    `skopt.callbacks.DeltaYStopper` that keeps the `n_best` lowest scores as they are told
+    instead of sorting all of them on every iteration.
+    """
+
+    def __init__(self, delta, n_best=5):
+        super().__init__(delta, n_best)
+        self._best = []
+        self._seen = 0
 
     def _criterion(self, result):
-        return self.callback(result)
\ No newline at end of file
+        if len(result.func_vals) < self._seen:  # a new run
+            self._best = []
+            self._seen = 0
+
+        for y in result.func_vals[self._seen:]:
+            if len(self._best) < self.n_best or y < self._best[-1]:
+                bisect.insort(self._best, float(y))
+                del self._best[self.n_best:]
+        self._seen = len(result.func_vals)
+
+        if len(self._best) >= self.n_best:
+            return self._best[-1] - self._best[0] < self.delta
+        return None
+
+
+def batch_minimize(func, dimensions, base_estimator, n_calls=100, n_initial_points=10,
+                   initial_point_generator="random", acq_func="gp_hedge", acq_optimizer="sampling",
+                   random_state=None, verbose=False, callback=None, n_points=10000,
+                   n_restarts_optimizer=5, xi=0.01, kappa=1.96, n_jobs=1,
+                   batch_size=4, strategy="cl_min", x0=None, y0=None, candidate_pool=None, profiler=None, local_search=None):
+    """
+    Sequential model-based minimization that proposes `batch_size` points per iteration.
+
+    Mirrors `skopt.optimizer.base_minimize`, but every iteration asks the
+    optimizer for `batch_size` points using the constant liar `strategy`
+    ("cl_min", "cl_mean" or "cl_max"), scores all of them with a single call
+    to `func` and tells the results back in bulk. `func` receives a list of
+    points and returns a list of scores, see `columnarBatchScoreWrapper`.
+
+    `base_estimator` can be a regressor instance or "GP"/"GBRT", in which case
+    the estimator is cooked the same way `gp_minimize`/`gbrt_minimize` do.
+    Callbacks are evaluated once per batch.
+
+    Evaluated points `x0` with their scores `y0` are told before the first
+    batch and do not count towards `n_calls`.
+
+    With a `CandidatePool`, acquisition candidates are drawn from it instead
+    of being sampled and transformed anew on every fit, and with a `LocalSearch`
+    the candidates are refined around the best of them, see `InstrumentedOptimizer`.
+
+    A `Profiler` is told the fit and acquisition time of every fit and is
+    added to the callbacks.
+    """
+    specs = {"args": dict(locals()),
+             "function": "batch_minimize"}
+
+    from skopt import Optimizer
+    from skopt.callbacks import VerboseCallback, check_callback
+    from skopt.utils import eval_callbacks
+    from sklearn.utils import check_random_state
+
+    rng = check_random_state(random_state)
+    base_estimator, dimensions = _cook_base_estimator(base_estimator, dimensions, rng, n_jobs)
+
+    if n_calls < n_initial_points:
+        raise ValueError("Expected `n_calls` >= %d, got %d" % (n_initial_points, n_calls))
+
+    x0 = x0 or []
+    y0 = y0 or []
+    if len(x0) != len(y0):
+        raise ValueError("`x0` and `y0` should have the same length")
+
+    instrumented = candidate_pool is not None or profiler is not None or local_search is not None
+    optimizer_kwargs = {"candidate_pool": candidate_pool, "profiler": profiler, "local_search": local_search} if instrumented else {}
+    optimizer = (_skopt_class("InstrumentedOptimizer") if instrumented else Optimizer)(
+                          dimensions, base_estimator,
+                          n_initial_points=n_initial_points + len(x0),
+                          initial_point_generator=initial_point_generator,
+                          n_jobs=n_jobs,
+                          acq_func=acq_func, acq_optimizer=acq_optimizer,
+                          random_state=rng,
+                          acq_optimizer_kwargs={"n_points": n_points, "n_restarts_optimizer": n_restarts_optimizer,
+                                                "n_jobs": n_jobs},
+                          acq_func_kwargs={"xi": xi, "kappa": kappa},
+                          **optimizer_kwargs)
+
+    callbacks = check_callback(callback)
+    if profiler is not None and profiler not in callbacks:
+        callbacks.append(profiler)
+    if verbose:
+        callbacks.append(VerboseCallback(n_init=0, n_random=n_initial_points, n_total=n_calls))
+
+    result = None
+    if x0:
+        result = optimizer.tell(x0, y0)
+        result.specs = specs
+
+    n_calls += len(x0)
+    while len(optimizer.yi) < n_calls:
+        n_points = min(batch_size, n_calls - len(optimizer.yi))
+        next_x = _ask_points(optimizer, n_points, strategy)
+        next_y = func(next_x)
+        result = optimizer.tell(next_x, next_y)
+        result.specs = specs
+        if eval_callbacks(callbacks, result):
+            break
+
+    if profiler is not None:
+        profiler.end()
+    return result
+
+
+def _ask_points(optimizer, n_points, strategy):
+    """
+    Asks `optimizer` for `n_points` points, using the constant liar `strategy` when more than one.
+    The liar copies fit the surrogate on made up scores, the `IncrementalState` of a forest surrogate
+    is frozen meanwhile so none of their trees is kept for the optimizer's own fits.
+    """
+    if n_points <= 1:
+        return [optimizer.ask()]  # no constant liar copy for a single point
+
+    estimator = optimizer.base_estimator_
+    if not hasattr(estimator, "incremental"):
+        estimator = getattr(estimator, "estimator", None)  # MultiOutputRegressor with EIps/PIps
+    incremental = getattr(estimator, "incremental", None)
+    if incremental is None:
+        return optimizer.ask(n_points=n_points, strategy=strategy)
+    with incremental.frozen():
+        return optimizer.ask(n_points=n_points, strategy=strategy)
+
+
+def _cook_base_estimator(base_estimator, dimensions, rng, n_jobs):
+    """Cooks "GP"/"GBRT" the same way `gp_minimize`/`gbrt_minimize` do, returns the estimator and the dimensions to use."""
+    from skopt.utils import cook_estimator, normalize_dimensions
+
+    if base_estimator == "GP":
+        dimensions = normalize_dimensions(dimensions)
+        base_estimator = cook_estimator("GP", space=dimensions, random_state=rng.randint(0, np.iinfo(np.int32).max),
+                                        noise="gaussian")
+    elif base_estimator == "GBRT":
+        base_estimator = cook_estimator("GBRT", random_state=rng, n_jobs=n_jobs)
+    return base_estimator, dimensions
+
+
+def _unshared_estimator(estimator):
+    """
+    A clone of a forest `estimator` with fresh `IncrementalState`/`TrainingSetPolicy`,
+    which its clones otherwise share. Other estimators are returned as they are.
+    """
+    params = {name: getattr(estimator, name).fresh() for name in ("incremental", "training_set")
+              if getattr(estimator, name, None) is not None}
+    if not params:
+        return estimator
+
+    from sklearn.base import clone
+    return clone(estimator).set_params(**params)
+
+
+def ordinal_dimensions(dimensions):
+    """
+    Returns `dimensions` with every one-hot encoded `Categorical` replaced by one whose
+    transform is "normalize": a single column of category codes scaled into [0, 1]
+    instead of one column per category. Trees split on the codes directly, so the
+    surrogate sees one feature per dimension.
+    """
+    from skopt.space import Categorical
+
+    return [Categorical(dim.categories, prior=dim.prior, transform="normalize", name=dim.name)
+            if isinstance(dim, Categorical) and dim.transform_ == "onehot" else dim
+            for dim in dimensions]
+
+
+def budget_brackets(min_budget, eta=3, hyperband=False):
+    """
+    Returns the brackets of successive halving as lists of `(n_configurations, budget)`
+    rungs, budgets being fractions of a full evaluation. The lowest budget is
+    the largest `eta ** -s` not below `min_budget`. Without `hyperband`
+    there is one bracket that starts at the lowest budget, with `hyperband`
+    one bracket starts at every budget, the last one being plain full evaluations.
+    """
+    if not 0 < min_budget <= 1:
+        raise ValueError("Expected 0 < `min_budget` <= 1, got %r" % min_budget)
+    if eta < 2:
+        raise ValueError("Expected `eta` >= 2, got %r" % eta)
+
+    s_max = int(np.floor(np.log(1.0 / min_budget) / np.log(eta) + 1e-9))
+    brackets = []
+    for s in (range(s_max, -1, -1) if hyperband else [s_max]):
+        n = int(np.ceil((s_max + 1) / (s + 1) * eta ** s)) if hyperband else int(eta ** s)
+        brackets.append([(max(1, int(n * eta ** -i)), float(eta ** (i - s))) for i in range(s + 1)])
+    return brackets
+
+
+def budget_minimize(func, dimensions, base_estimator, n_calls=20, n_initial_points=10, min_budget=1 / 27, eta=3,
+                    hyperband=False, initial_point_generator="random", acq_func="gp_hedge", acq_optimizer="sampling",
+                    random_state=None, verbose=False, callback=None, n_points=10000, n_restarts_optimizer=5,
+                    xi=0.01, kappa=1.96, n_jobs=1, strategy="cl_min", x0=None, y0=None, profiler=None, local_search=None):
+    """
+    Multi-fidelity minimization by successive halving, optionally in Hyperband brackets.
+
+    Every bracket proposes a set of points, scores all of them at a low
+    budget, promotes the best `1 / eta` of them to a budget `eta` times larger
+    and so on, until the survivors are scored at the full budget of 1, see
+    `budget_brackets`. `func(points, budget)` scores a list of points at a
+    budget in (0, 1] and returns a list of scores, see `columnarBatchScoreWrapper`.
+
+    Like BOHB, every budget has its own `skopt.Optimizer` that is told the
+    scores at that budget, with its own incremental forest and training set. The points of a bracket are asked, with the constant
+    liar `strategy`, from the optimizer of the largest budget that has at least
+    `n_initial_points` scores, or from the one of the bracket's lowest budget
+    while none has, which samples its initial points first.
+
+    `n_calls` is the number of full budget evaluations to reach. The result
+    holds them only, and callbacks are evaluated once per bracket on it.
+    `result.budget_spent` is the total budget evaluated, in full evaluations.
+    Evaluated points `x0` with their full budget scores `y0` are told first
+    and do not count towards `n_calls`.
+
+    `base_estimator` can be a regressor instance, "GP", "GBRT" or "dummy"
+    for random proposals, which makes it Hyperband. A `profiler` records every
+    bracket as an iteration, without separating fit and acquisition. A
+    `LocalSearch` refines the acquisition candidates of every budget's optimizer.
+    """
+    specs = {"args": dict(locals()),
+             "function": "budget_minimize"}
+
+    from skopt import Optimizer
+    from skopt.callbacks import VerboseCallback, check_callback
+    from skopt.utils import eval_callbacks
+    from sklearn.utils import check_random_state
+
+    rng = check_random_state(random_state)
+    base_estimator, dimensions = _cook_base_estimator(base_estimator, dimensions, rng, n_jobs)
+    brackets = budget_brackets(min_budget, eta, hyperband)
+
+    x0 = x0 or []
+    y0 = y0 or []
+    if len(x0) != len(y0):
+        raise ValueError("`x0` and `y0` should have the same length")
+
+    optimizers = {}
+    optimizer_kwargs = {"local_search": local_search} if local_search is not None else {}
+    for budget in sorted({budget for bracket in brackets for _, budget in bracket}):
+        optimizers[budget] = (_skopt_class("InstrumentedOptimizer") if local_search is not None else Optimizer)(
+                                       dimensions, _unshared_estimator(base_estimator),
+                                       n_initial_points=n_initial_points,
+                                       initial_point_generator=initial_point_generator,
+                                       n_jobs=n_jobs,
+                                       acq_func=acq_func, acq_optimizer=acq_optimizer,
+                                       random_state=rng.randint(0, np.iinfo(np.int32).max),
+                                       acq_optimizer_kwargs={"n_points": n_points, "n_restarts_optimizer": n_restarts_optimizer,
+                                                             "n_jobs": n_jobs},
+                                       acq_func_kwargs={"xi": xi, "kappa": kappa},
+                                       **optimizer_kwargs)
+    full = optimizers[1.0]
+
+    callbacks = check_callback(callback)
+    if profiler is not None and profiler not in callbacks:
+        callbacks.append(profiler)
+    if verbose:
+        callbacks.append(VerboseCallback(n_init=0, n_random=n_initial_points, n_total=n_calls))
+
+    result = None
+    if x0:
+        result = full.tell(x0, y0)
+        result.specs = specs
+
+    spent = 0.0
+    n_calls += len(x0)
+    bracket = 0
+    while len(full.yi) < n_calls:
+        rungs = brackets[bracket % len(brackets)]
+        bracket += 1
+
+        ready = [budget for budget, optimizer in optimizers.items() if len(optimizer.yi) >= n_initial_points]
+        proposer = optimizers[max(ready) if ready else rungs[0][1]]
+        proposer.cache_ = {}  # a proposer that was told nothing since its last ask would repeat itself
+        n = rungs[0][0]
+        points = _ask_points(proposer, n, strategy)
+
+        for i, (_, budget) in enumerate(rungs):
+            if budget == 1.0:
+                points = points[:n_calls - len(full.yi)]
+            scores = func(points, budget)
+            spent += budget * len(points)
+            result = optimizers[budget].tell(points, scores)
+            if i + 1 < len(rungs):
+                points = [points[j] for j in np.argsort(scores, kind="stable")[:rungs[i + 1][0]]]
+
+        result.specs = specs
+        result.budget_spent = spent
+        if eval_callbacks(callbacks, result):
+            break
+
+    if profiler is not None:
+        profiler.end()
+    return result
+
+
+class Study(object):
+    """
+    One search run by `schedule_studies`: an `skopt.Optimizer` that is asked
+    for `batch_size` points at a time, which are scored later by the shared
+    worker pool of a `StudyScheduler`.
+
+    `base_estimator` is cooked like in `batch_minimize`, "dummy" proposes
+    random points. A higher `priority` study has its points scored before
+    those of lower ones, studies of equal priority share the workers evenly.
+    Scores are told as returned by the score function and negated when
+    `maximize`, points found in `cache` are not scored again.
+    """
+
+    def __init__(self, dimensions, base_estimator, maximize, n_calls, n_initial_points=10, batch_size=1, priority=0,
+                 initial_point_generator="random", acq_func="gp_hedge", acq_optimizer="sampling", random_state=None,
+                 n_points=10000, xi=0.01, kappa=1.96, strategy="cl_min", callback=None, cache=None):
+        from skopt import Optimizer
+        from skopt.callbacks import check_callback
+        from sklearn.utils import check_random_state
+
+        if n_calls < max(n_initial_points, 1):
+            raise ValueError("Expected `n_calls` >= %d, got %d" % (max(n_initial_points, 1), n_calls))
+
+        rng = check_random_state(random_state)
+        base_estimator, cooked = _cook_base_estimator(base_estimator, dimensions, rng, 1)
+        self.optimizer = Optimizer(cooked, base_estimator,
+                                   n_initial_points=n_initial_points,
+                                   initial_point_generator=initial_point_generator,
+                                   acq_func=acq_func, acq_optimizer=acq_optimizer,
+                                   random_state=rng,
+                                   acq_optimizer_kwargs={"n_points": n_points},
+                                   acq_func_kwargs={"xi": xi, "kappa": kappa})
+        self.dimensions = dimensions
+        self.layout = ColumnarLayout(dimensions)
+        self.maximize = maximize
+        self.n_calls = n_calls
+        self.batch_size = batch_size
+        self.priority = priority
+        self.strategy = strategy
+        self.callbacks = check_callback(callback)
+        self.cache = cache
+        self.result = None
+        self.stopped = False
+        self._batch = None
+        self._proposed = None
+        self._told = None
+
+    @property
+    def evaluations(self):
+        return len(self.optimizer.yi)
+
+    @property
+    def done(self):
+        return self.stopped or len(self.optimizer.yi) >= self.n_calls
+
+    @property
+    def pending(self):
+        """Number of points of the asked batch that are being scored."""
+        return len(self._batch[2]) if self._batch is not None else 0
+
+    def propose(self):
+        """Asks the optimizer for the next batch, studies can propose on different threads."""
+        n_points = min(self.batch_size, self.n_calls - len(self.optimizer.yi))
+        self._proposed = _ask_points(self.optimizer, n_points, self.strategy)
+
+    def ask(self):
+        """Takes the proposed batch, returns the points to score in the columnar layout and their count."""
+        points, self._proposed = self._proposed, None
+
+        scores = np.empty(len(points))
+        pending, keys, first = list(range(len(points))), None, {}
+        if self.cache is not None:
+            keys = [self.cache.key(point, self.dimensions) for point in points]
+            pending = []
+            for i, key in enumerate(keys):
+                if key in first:  # repeated within the batch, scored once
+                    self.cache.hits += 1
+                    continue
+                value = self.cache.get(key)
+                if value is not None:
+                    scores[i] = value
+                else:
+                    first[key] = i
+                    pending.append(i)
+
+        self._batch = (points, scores, pending, keys, first)
+        reals, integers = self.layout.pack_all([points[i] for i in pending])
+        return reals, integers, len(pending)
+
+    def tell(self, computed=None):
+        """Completes the batch with the `computed` scores of its pending points, they are told to the optimizer by `fit`."""
+        points, scores, pending, keys, first = self._batch
+        self._batch = None
+        if pending:
+            scores[pending] = computed
+        if self.cache is not None:
+            for i in pending:
+                self.cache.put(keys[i], scores[i])
+            for i, key in enumerate(keys):
+                scores[i] = scores[first.get(key, i)]
+
+        if self.maximize:
+            scores = -scores  # negate the score to minimize
+        self._told = (points, scores.tolist())
+
+    def fit(self):
+        """Tells the optimizer the completed batch, fitting its surrogate. Studies can fit on different threads."""
+        (points, scores), self._told = self._told, None
+        self.result = self.optimizer.tell(points, scores)
+        self.result.specs = {"args": {"n_calls": self.n_calls, "batch_size": self.batch_size, "priority": self.priority},
+                             "function": "schedule_studies"}
+
+    def end_batch(self):
+        """Evaluates the callbacks on the result of the fitted batch, returns whether the study is done."""
+        from skopt.utils import eval_callbacks
+
+        if eval_callbacks(self.callbacks, self.result):
+            self.stopped = True
+        return self.done
+
+
+def schedule_studies(studies, submit, wait, collect, n_threads=None):
+    """
+    Runs many `Study` interleaved on this thread while their points are scored
+    by a shared pool of workers, see `StudyScheduler`. Returns their results.
+
+    Every study has at most one batch in flight. Whenever batches complete,
+    their studies are told the scores and asked for their next batch, which
+    are submitted by descending priority and then fewest evaluations first.
+    The surrogates of those studies are fit and asked on up to `n_threads`
+    threads (one per processor by default), sklearn releases the GIL while
+    it builds and applies trees. Cache lookups, callbacks and `submit` stay on
+    this thread.
+    `submit(index, reals_ptr, integers_ptr, count)` queues a batch of the
+    study at `index` on the pool, `wait()` blocks until at least one batch
+    completed and returns the indices of their studies and
+    `collect(index, scores_ptr, count)` copies the scores of a completed batch.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    in_flight = set()
+    ready = [i for i, study in enumerate(studies) if not study.done]
+    with ThreadPoolExecutor(n_threads or os.cpu_count() or 1) as executor:
+        while ready or in_flight:
+            ready.sort(key=lambda i: (-studies[i].priority, studies[i].evaluations, i))
+            list(executor.map(lambda i: studies[i].propose(), ready))
+            told = []
+            for i in ready:
+                reals, integers, count = studies[i].ask()
+                if count:
+                    submit(i, reals.ctypes.data, integers.ctypes.data, count)
+                    in_flight.add(i)
+                else:
+                    told.append((i, None))  # every point of the batch was cached
+
+            if not told:
+                if not in_flight:
+                    break
+                for i in wait():
+                    scores = np.empty(studies[i].pending)
+                    collect(i, scores.ctypes.data, len(scores))
+                    in_flight.discard(i)
+                    told.append((i, scores))
+
+            for i, scores in told:
+                studies[i].tell(scores)
+            list(executor.map(lambda i: studies[i].fit(), [i for i, _ in told]))
+            ready = [i for i, _ in told if not studies[i].end_batch()]
+
+    return [study.result for study in studies]
+
+class CandidatePool(object):
+    """
+    Acquisition candidates that are sampled and transformed once.
+
+    The first fit fills a contiguous array of `n_points` transformed samples.
+    Every following fit only replaces a `refresh` fraction of it with fresh
+    samples, in rotation, and a `local` fraction with gaussian perturbations
+    (`scale` of each transformed range) of the incumbent, the best point so
+    far. The rest of the array is reused as is. Perturbed columns of
+    `Categorical` dimensions encoded as codes, see `ordinal_dimensions`, are
+    rounded to the nearest code.
+    """
+
+    def __init__(self, refresh=0.1, local=0.1, scale=0.05):
+        self.refresh = refresh
+        self.local = local
+        self.scale = scale
+        self.X = None
+        self._cursor = 0
+
+    def candidates(self, space, n_points, rng, Xi, yi):
+        if self.X is None or len(self.X) != n_points:
+            self.X = np.ascontiguousarray(space.transform(space.rvs(n_samples=n_points, random_state=rng)))
+            self._cursor = 0
+            return self.X
+
+        n_local = int(n_points * self.local) if self.X.dtype.kind == 'f' and yi else 0
+        n_global = n_points - n_local
+        n_refresh = min(int(n_points * self.refresh), n_global)
+        if n_refresh > 0:
+            rows = (self._cursor + np.arange(n_refresh)) % n_global
+            self.X[rows] = space.transform(space.rvs(n_samples=n_refresh, random_state=rng))
+            self._cursor = (self._cursor + n_refresh) % n_global
+
+        if n_local > 0:
+            bounds = np.asarray(space.transformed_bounds, dtype=np.float64)
+            scores = np.asarray(yi, dtype=np.float64)
+            scores = scores[:, 0] if scores.ndim == 2 else scores  # (score, time) for the "ps" acquisition functions
+            incumbent = space.transform([Xi[int(np.argmin(scores))]])[0]
+            noise = rng.normal(0, self.scale, size=(n_local, len(bounds))) * (bounds[:, 1] - bounds[:, 0])
+            self.X[n_global:] = np.clip(incumbent + noise, bounds[:, 0], bounds[:, 1])
+            for column, n_categories in self._code_columns(space):
+                self.X[n_global:, column] = np.round(self.X[n_global:, column] * (n_categories - 1)) / (n_categories - 1)
+
+        return self.X
+
+    @staticmethod
+    def _code_columns(space):
+        from skopt.space import Categorical
+
+        columns = []
+        column = 0
+        for dim in space.dimensions:
+            if isinstance(dim, Categorical) and dim.transform_ == "normalize" and len(dim.categories) > 1:
+                columns.append((column, len(dim.categories)))
+            column += dim.transformed_size
+        return columns
+
+
+class LocalSearch(object):
+    """
+    Acquisition optimizer for tree surrogates, which are piecewise constant and give lbfgs no gradient to follow.
+
+    The `n_starts` best of the sampled candidates and the `n_starts` best points
+    evaluated so far are refined for `n_rounds` rounds. Every round perturbs
+    each of them `n_neighbors` times, scores all the perturbations with a single
+    call to the acquisition function and keeps the `n_starts` best of the starts
+    and the perturbations as the next starts. A perturbation moves every
+    dimension with probability 1 / n_dims, and at least one: a `Real` by
+    gaussian noise of `scale` of its transformed range, an `Integer` one step
+    up or down and a `Categorical` to another category.
+
+    The `n_starts` best candidates that were not evaluated yet are returned.
+    """
+
+    def __init__(self, n_starts=5, n_neighbors=100, n_rounds=5, scale=0.1):
+        self.n_starts = n_starts
+        self.n_neighbors = n_neighbors
+        self.n_rounds = n_rounds
+        self.scale = scale
+
+    def refine(self, space, X, acquisition, rng, Xi, yi):
+        """Returns the refined candidates of the transformed candidates `X`, `acquisition(X)` returns the values to minimize."""
+        X = np.asarray(X)
+        if X.dtype.kind in "iub":
+            X = X.astype(np.float64)
+        elif X.dtype.kind != "f":
+            return X  # categories that are not transformed into numbers
+
+        values = acquisition(X)
+        order = np.argsort(values, kind="stable")[:self.n_starts]
+        starts, start_values = X[order], values[order]
+        evaluated = set()
+        if yi:
+            scores = np.asarray(yi, dtype=np.float64)
+            scores = scores[:, 0] if scores.ndim == 2 else scores  # (score, time) for the "ps" acquisition functions
+            Xt = np.asarray(space.transform(Xi), dtype=np.float64)
+            evaluated = {row.tobytes() for row in Xt}
+            incumbents = Xt[np.argsort(scores, kind="stable")[:self.n_starts]]
+            starts = np.vstack((starts, incumbents))
+            start_values = np.concatenate((start_values, acquisition(incumbents)))
+
+        moves = self._moves(space)
+        found, found_values = starts, start_values
+        for _ in range(self.n_rounds):
+            neighbors = self._neighbors(np.repeat(starts, self.n_neighbors, axis=0), moves, rng)
+            neighbor_values = acquisition(neighbors)
+            starts, start_values = self._best(np.vstack((starts, neighbors)), np.concatenate((start_values, neighbor_values)), self.n_starts)
+            found, found_values = self._best(np.vstack((found, neighbors)), np.concatenate((found_values, neighbor_values)), self.n_starts,
+                                             evaluated)
+
+        return found if len(found) else starts
+
+    @staticmethod
+    def _best(X, values, n, exclude=None):
+        # repeats of a row would otherwise crowd out the rest
+        _, first = np.unique(X, axis=0, return_index=True)
+        if exclude:
+            first = np.asarray([i for i in first if X[i].tobytes() not in exclude], dtype=np.intp)
+        first = first[np.argsort(values[first], kind="stable")[:n]]
+        return X[first], values[first]
+
+    def _moves(self, space):
+        from skopt.space import Categorical, Integer
+
+        moves = []
+        column = 0
+        for dim in space.dimensions:
+            if isinstance(dim, Categorical):
+                table = np.asarray(dim.transform(list(dim.categories)), dtype=np.float64).reshape(len(dim.categories), dim.transformed_size)
+                moves.append(("categorical", column, dim.transformed_size, table))
+            elif isinstance(dim, Integer):
+                moves.append(("integer", column, dim))
+            else:
+                low, high = dim.transformed_bounds
+                moves.append(("real", column, low, high))
+            column += dim.transformed_size
+        return moves
+
+    def _neighbors(self, X, moves, rng):
+        n, n_dims = len(X), len(moves)
+        move = rng.uniform(size=(n, n_dims)) < 1.0 / n_dims
+        move[np.arange(n), rng.randint(n_dims, size=n)] = True
+        for j, (kind, column, *args) in enumerate(moves):
+            rows = np.flatnonzero(move[:, j])
+            if len(rows) == 0:
+                continue
+            if kind == "real":
+                low, high = args
+                X[rows, column] = np.clip(X[rows, column] + rng.normal(0, self.scale * (high - low), size=len(rows)), low, high)
+            elif kind == "integer":
+                dim, = args
+                values = np.asarray(dim.inverse_transform(X[rows, column])) + rng.choice((-1, 1), size=len(rows))
+                X[rows, column] = dim.transform(np.clip(values, dim.low, dim.high))
+            else:
+                size, table = args
+                if len(table) < 2:
+                    continue
+                codes = np.argmin(np.abs(X[rows, column:column + size, np.newaxis] - table.T[np.newaxis]).sum(axis=1), axis=1)
+                codes = (codes + rng.randint(1, len(table), size=len(rows))) % len(table)
+                X[rows, column:column + size] = table[codes]
+        return X
+
+
+class _InstrumentedSpaceMixin(object):
+    """
+    Space that notices the `n_points` acquisition draw inside `InstrumentedOptimizer._tell`,
+    the point where fitting the surrogate ends. The draw comes from the candidate pool when there is one
+    and is refined by the local search when there is one.
+    """
+
+    _candidates = object()
+
+    def __init__(self, dimensions, optimizer):
+        super().__init__(dimensions)
+        self._optimizer = optimizer
+        self._telling = False
+        self.acquisition_start = None
+
+    def rvs(self, n_samples=1, random_state=None):
+        if self._telling and n_samples == self._optimizer.n_points:
+            self._telling = False
+            self.acquisition_start = time.perf_counter()
+            if self._optimizer.candidate_pool is not None or self._optimizer.local_search is not None:
+                return self._candidates
+        return super().rvs(n_samples=n_samples, random_state=random_state)
+
+    def transform(self, X):
+        if X is not self._candidates:
+            return super().transform(X)
+
+        optimizer = self._optimizer
+        if optimizer.candidate_pool is not None:
+            X = optimizer.candidate_pool.candidates(self, optimizer.n_points, optimizer.rng, optimizer.Xi, optimizer.yi)
+        else:
+            X = super().transform(super().rvs(n_samples=optimizer.n_points, random_state=optimizer.rng))
+        if optimizer.local_search is None:
+            return X
+
+        # the surrogate was just fit, the refined candidates of every acquisition function compete in `Optimizer._tell`
+        return np.vstack([optimizer.local_search.refine(self, X, optimizer._acquisition(acq_func), optimizer.rng, optimizer.Xi, optimizer.yi)
+                          for acq_func in optimizer.cand_acq_funcs_])
+
+
+class _InstrumentedOptimizerMixin(object):
+    """
+    `skopt.Optimizer` that optimizes the acquisition function over a `CandidatePool`
+    instead of `n_points` new samples per fit, refines the candidates with a
+    `LocalSearch`, and/or reports the time every fit and acquisition takes to a
+    `Profiler`. Copies made for the constant liar strategy share all three.
+    """
+
+    def __init__(self, dimensions, base_estimator="gp", candidate_pool=None, profiler=None, local_search=None, **kwargs):
+        super().__init__(dimensions, base_estimator, **kwargs)
+        self.candidate_pool = candidate_pool
+        self.profiler = profiler
+        self.local_search = local_search
+        self.space = _skopt_class("_InstrumentedSpace")(self.space.dimensions, self)
+
+    def _acquisition(self, acq_func):
+        """The acquisition function `_tell` minimizes, of the surrogate it just fit."""
+        from skopt.acquisition import _gaussian_acquisition
+
+        model, y_opt = self.models[-1], np.min(self.yi)
+        return lambda X: _gaussian_acquisition(X=X, model=model, y_opt=y_opt, acq_func=acq_func, acq_func_kwargs=self.acq_func_kwargs)
+
+    def _tell(self, x, y, fit=True):
+        from skopt.space import Space
+
+        space = self.space
+        space._telling = True
+        space.acquisition_start = None
+        start = time.perf_counter()
+        try:
+            result = super()._tell(x, y, fit=fit)
+            result.space = Space(space.dimensions)  # results are dumped and loaded without this module
+            return result
+        finally:
+            space._telling = False
+            if self.profiler is not None and space.acquisition_start is not None:
+                self.profiler.record_tell(space.acquisition_start - start, time.perf_counter() - space.acquisition_start)
+
+    def copy(self, random_state=None):
+        optimizer = type(self)(
+            dimensions=self.space.dimensions,
+            base_estimator=self.base_estimator_,
+            candidate_pool=self.candidate_pool,
+            profiler=self.profiler,
+            local_search=self.local_search,
+            n_initial_points=self.n_initial_points_,
+            initial_point_generator=self._initial_point_generator,
+            acq_func=self.acq_func,
+            acq_optimizer=self.acq_optimizer,
+            acq_func_kwargs=self.acq_func_kwargs,
+            acq_optimizer_kwargs=self.acq_optimizer_kwargs,
+            random_state=random_state
+        )
+        optimizer._initial_samples = self._initial_samples
+        if hasattr(self, "gains_"):
+            optimizer.gains_ = np.copy(self.gains_)
+        if self.Xi:
+            optimizer._tell(self.Xi, self.yi)
+
+        return optimizer
+
+
+_skopt_classes = {}
+
+
+def _skopt_class(name):
+    """
+    Returns `EarlyStopperWrapper`, `DeltaYStopper`, `InstrumentedOptimizer` or `_InstrumentedSpace`. All four derive
+    from skopt classes, they are created on first use for loading this module not to import skopt.
+    """
+    if not _skopt_classes:
+        from skopt import Optimizer
+        from skopt.callbacks import DeltaYStopper, EarlyStopper
+        from skopt.space import Space
+        _skopt_classes["EarlyStopperWrapper"] = type("EarlyStopperWrapper", (_EarlyStopperWrapperMixin, EarlyStopper),
+                                                     {"__doc__": _EarlyStopperWrapperMixin.__doc__})
+        _skopt_classes["DeltaYStopper"] = type("DeltaYStopper", (_DeltaYStopperMixin, DeltaYStopper),
+                                               {"__doc__": _DeltaYStopperMixin.__doc__})
+        _skopt_classes["_InstrumentedSpace"] = type("_InstrumentedSpace", (_InstrumentedSpaceMixin, Space),
+                                                    {"__doc__": _InstrumentedSpaceMixin.__doc__})
+        _skopt_classes["InstrumentedOptimizer"] = type("InstrumentedOptimizer", (_InstrumentedOptimizerMixin, Optimizer),
+                                                       {"__doc__": _InstrumentedOptimizerMixin.__doc__})
+    return _skopt_classes[name]
+
+
+def __getattr__(name):
+    if name in ("EarlyStopperWrapper", "DeltaYStopper", "InstrumentedOptimizer", "_InstrumentedSpace"):
+        return _skopt_class(name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+class Profiler(object):
+    """
+    skopt callback that breaks the wall time of every iteration down into phases,
+    timed with `time.perf_counter`:
+
+        objective    the .NET score function, accumulated by .NET into `managed`
+        marshal      packing points and calling into .NET, less the objective
+        fit          fitting the surrogate, for constant liar points too
+        acquisition  drawing candidates and optimizing the acquisition function
+        other        the rest: ask/tell bookkeeping, callbacks and the loop itself
+
+    fit and acquisition are reported by `InstrumentedOptimizer`, runs without
+    it count them as other. The running totals are attached to every result as
+    `result.profile`, see `summary`.
+
+    The 1-based iterations in `profile_iterations` run under cProfile. Their
+    stats are merged into `stats` and, with `profile_path`, dumped to
+    `iteration_<n>.prof` files in that directory.
+    """
+
+    COLUMNS = ("evaluations", "total", "objective", "marshal", "fit", "acquisition", "other")
+
+    def __init__(self, profile_iterations=None, profile_path=None):
+        self.profile_iterations = frozenset(profile_iterations or ())
+        self.profile_path = profile_path
+        self.managed = np.zeros(1)  # seconds spent in the .NET score function, written by .NET
+        self.begin()
+
+    def begin(self):
+        """Starts a new run, the first iteration is timed from here."""
+        self.iterations = []
+        self.totals = [0.0] * len(self.COLUMNS)
+        self.stats = None
+        self._current = [0.0] * len(self.COLUMNS)
+        self._managed = self.managed[0]
+        self._cprofile = None
+        self._last = time.perf_counter()
+        self._start_cprofile()
+
+    def record_call(self, elapsed, evaluations):
+        """Records `evaluations` points scored by one call into .NET that took `elapsed` seconds, packing included."""
+        objective = self.managed[0] - self._managed
+        self._managed = self.managed[0]
+        current = self._current
+        current[0] += evaluations
+        current[2] += objective
+        current[3] += max(0.0, elapsed - objective)
+
+    def record_tell(self, fit, acquisition):
+        self._current[4] += fit
+        self._current[5] += acquisition
+
+    def __call__(self, result):
+        now = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._dump_cprofile()
+
+        row = self._current
+        row[1] = now - self._last
+        row[6] = max(0.0, row[1] - sum(row[2:6]))
+        self.iterations.append(tuple(row))
+        self.totals = [total + value for total, value in zip(self.totals, row)]
+        self._current = [0.0] * len(self.COLUMNS)
+        result.profile = self.summary()
+
+        self._start_cprofile()
+        self._last = time.perf_counter()
+        return None
+
+    def end(self):
+        """Ends the run, stopping the cProfile session started for an iteration that never came."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile = None
+
+    def summary(self):
+        """Totals of every phase in seconds, with the number of iterations and evaluations."""
+        summary = dict(zip(self.COLUMNS, self.totals))
+        summary["evaluations"] = int(summary["evaluations"])
+        summary["iterations"] = len(self.iterations)
+        return summary
+
+    def table(self):
+        """The recorded iterations as a float64 [iterations, len(COLUMNS)] array."""
+        return np.array(self.iterations, dtype=np.float64).reshape(-1, len(self.COLUMNS))
+
+    def report(self, lines=30):
+        """The merged cProfile stats sorted by cumulative time, None when no iteration was profiled."""
+        if self.stats is None:
+            return None
+        stream = io.StringIO()
+        self.stats.stream = stream
+        self.stats.sort_stats("cumulative").print_stats(lines)
+        return stream.getvalue()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_cprofile"] = state["stats"] = None  # not picklable, kept out of dumped results
+        return state
+
+    def _start_cprofile(self):
+        self._cprofile = None
+        if len(self.iterations) + 1 in self.profile_iterations:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def _dump_cprofile(self):
+        iteration = len(self.iterations) + 1
+        if self.profile_path is not None:
+            os.makedirs(self.profile_path, exist_ok=True)
+            self._cprofile.dump_stats(os.path.join(self.profile_path, "iteration_%d.prof" % iteration))
+        if self.stats is None:
+            self.stats = pstats.Stats(self._cprofile)
+        else:
+            self.stats.add(self._cprofile)
+
+
+class Journal(object):
+    """
+    skopt callback that appends one JSON line per evaluation to `path`.
+
+    Each record holds the point `x`, its minimized score `y` and `t`, the
+    wall time in seconds the iteration took per evaluated point. A new journal
+    starts with a `names` record of the dimension names. Records are
+    flushed every iteration and fsynced every `fsync_every` records, so a
+    crash loses at most the records that were not synced yet. Unlike
+    `CheckpointSaver`, the cost of an iteration does not grow with the history.
+    """
+
+    def __init__(self, path, fsync_every=10):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell() > 0:
+            with open(path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    self._file.write("\n")  # terminate a torn record
+        self._journaled = 0
+        self._unsynced = 0
+        self._last = time.perf_counter()
+
+    def begin(self, resume=True):
+        """
+        Starts a new run. When resuming, returns the journaled `(x0, y0)` to be
+        told to the optimizer, they are not journaled again.
+        """
+        x0, y0 = read_journal(self.path) if resume else ([], [])
+        self._journaled = len(y0)
+        self._last = time.perf_counter()
+        return x0, y0
+
+    def skip(self, count):
+        """The next `count` points told to the optimizer are not journaled, e.g. the ones of a `WarmStart`."""
+        self._journaled += count
+
+    def __call__(self, result):
+        now = time.perf_counter()
+        x_iters = result.x_iters[self._journaled:]
+        func_vals = result.func_vals[self._journaled:]
+        if len(func_vals) == 0:
+            return None
+
+        if self._file.tell() == 0:
+            self._file.write(json.dumps({"names": result.space.dimension_names}) + "\n")
+        elapsed = (now - self._last) / len(func_vals)
+        for x, y in zip(x_iters, func_vals):
+            record = {"x": [value.item() if hasattr(value, 'dtype') else value for value in x], "y": float(y), "t": elapsed}
+            self._file.write(json.dumps(record) + "\n")
+
+        self._file.flush()
+        self._journaled += len(func_vals)
+        self._unsynced += len(func_vals)
+        if self._unsynced >= self.fsync_every:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+        self._last = time.perf_counter()
+        return None
+
+    def __getstate__(self):
+        # the open file is not picklable, results dumped from journaled runs keep the settings only
+        state = self.__dict__.copy()
+        state["_file"] = None
+        return state
+
+    def close(self):
+        if self._file is not None and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+
+def read_journal(path):
+    """
+    Reads the points and minimized scores of a `Journal` as `(x0, y0)`.
+    A torn last record left by a crash is skipped.
+    """
+    x0, y0 = [], []
+    for _, x, y in _journal_records(path):
+        x0.append(x)
+        y0.append(y)
+    return x0, y0
+
+
+def _journal_records(path):
+    """Yields the `(names, x, y)` of every record of a `Journal`, names is None for journals written without them."""
+    if not os.path.exists(path):
+        return
+
+    names = None
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "names" in record:
+                names = record["names"]
+            else:
+                yield names, record["x"], record["y"]
+
+
+class WarmStart(object):
+    """
+    Evaluations of earlier runs told to a new search as `x0`/`y0`, so it does not start cold.
+
+    Evaluations are added from `skopt.utils.dump` files and `Journal`s. When a search
+    begins, they are mapped to its dimensions by name, points outside the search space
+    or missing one of its dimensions are dropped, and repeated points are told once,
+    with the score of their first evaluation. Scores are the minimized ones, the runs
+    have to share the goal of the search.
+
+    Parameters
+    ----------
+    decimals : int or None
+        Real dimensions are rounded to this many decimals before deduplicating.
+        None to only merge exact repeats.
+    """
+
+    def __init__(self, decimals=None):
+        self.decimals = decimals
+        self.records = []  # (names or None, x, y)
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, names, x_iters, func_vals):
+        """Adds evaluations, `names` of the values of every point or None when they are in the order of the search space."""
+        names = list(names) if names is not None else None
+        for x, y in zip(x_iters, func_vals):
+            self.records.append((names, [value.item() if hasattr(value, 'dtype') else value for value in x], float(y)))
+
+    def add_dump(self, path):
+        """Adds the evaluations of a result dumped with `skopt.utils.dump`."""
+        from skopt.utils import load
+
+        result = load(path)
+        self.add(result.space.dimension_names, result.x_iters, result.func_vals)
+
+    def add_journal(self, path):
+        """Adds the evaluations of a `Journal`."""
+        for names, x, y in _journal_records(path):
+            self.records.append((names, x, float(y)))
+
+    def points(self, dimensions, names, x0=None, y0=None):
+        """
+        Returns `(x0, y0, count)`: the given `x0`/`y0` followed by the `count` evaluations
+        that fit `dimensions`, named `names`, and are neither repeated nor already in `x0`.
+        """
+        x0 = list(x0) if x0 is not None else []
+        y0 = list(y0) if y0 is not None else []
+        names = list(names)
+        seen = {canonical_key(x, dimensions, self.decimals) for x in x0}
+        count = 0
+        for record_names, x, y in self.records:
+            if record_names is None:
+                point = x if len(x) == len(dimensions) else None
+            else:
+                values = dict(zip(record_names, x))
+                point = [values[name] for name in names] if all(name in values for name in names) else None
+            if point is None or not all(value in dim for dim, value in zip(dimensions, point)):
+                continue
+
+            point = list(canonical_key(point, dimensions))  # json reads back whole reals as ints
+            key = canonical_key(point, dimensions, self.decimals)
+            if key in seen:
+                continue
+            seen.add(key)
+            x0.append(point)
+            y0.append(y)
+            count += 1
+
+        return x0, y0, count
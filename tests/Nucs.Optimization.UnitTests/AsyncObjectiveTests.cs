@@ -0,0 +1,56 @@
+using System;
+using System.Threading;
+using System.Threading.Tasks;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class AsyncObjectiveTests : PythonTest {
+    private int _calls;
+    private int _running;
+    private int _maxRunning;
+
+    [Maximize]
+    async Task<double> ScoreFunctionAsync(Parameters parameters) {
+        Interlocked.Increment(ref _calls);
+        var running = Interlocked.Increment(ref _running);
+        int max;
+        while ((max = _maxRunning) < running && Interlocked.CompareExchange(ref _maxRunning, running, max) != max) { }
+
+        await Task.Delay(20); //simulate an I/O bound objective
+        Interlocked.Decrement(ref _running);
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void Forest_Batch_Overlaps() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunctionAsync);
+        var result = opt.SearchAll(40, 16, random_state: 1337, n_points: 1000, options: new ForestSearchOptions { BatchSize = 8, NWorkers = 4 });
+
+        result.Iterations.Length.Should().Be(40);
+        result.BestScore.Should().BeGreaterThan(0); //[Maximize] is picked up from the async method
+        _calls.Should().Be(40);
+        _maxRunning.Should().BeGreaterThan(1).And.BeLessThanOrEqualTo(4);
+    }
+
+    [Fact]
+    public void Random_Sequential() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyRandomOptimization<Parameters>(ScoreFunctionAsync);
+        var result = opt.SearchAll(20, random_state: 1337, verbose: false);
+
+        result.Iterations.Length.Should().Be(20);
+        _calls.Should().Be(20);
+        _maxRunning.Should().Be(1);
+    }
+}
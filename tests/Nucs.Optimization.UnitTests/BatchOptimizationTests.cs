@@ -0,0 +1,89 @@
+using System;
+using System.Threading;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+using Xunit.Abstractions;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class BatchOptimizationTests : PythonTest {
+    private readonly ITestOutputHelper Console;
+    private int _calls;
+    private int _running;
+    private int _maxRunning;
+
+    public BatchOptimizationTests(ITestOutputHelper console) {
+        Console = console;
+    }
+
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        Interlocked.Increment(ref _calls);
+        var running = Interlocked.Increment(ref _running);
+        int max;
+        while ((max = _maxRunning) < running && Interlocked.CompareExchange(ref _maxRunning, running, max) != max) { }
+
+        Thread.Sleep(20); //simulate an expensive objective
+        Interlocked.Decrement(ref _running);
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void Forest_Batch() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(40, 10, random_state: 1337, n_points: 1000, options: new ForestSearchOptions { BatchSize = 4, NWorkers = 4 });
+        Console.WriteLine($"Best Score: {result.BestScore}, Parameters: {result.Best}, Max concurrent: {_maxRunning}");
+
+        result.Iterations.Length.Should().Be(40);
+        _calls.Should().Be(40);
+        _maxRunning.Should().BeGreaterThan(1).And.BeLessThanOrEqualTo(4);
+    }
+
+    [Fact]
+    public void Gbrt_Batch() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyGbrtOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchTop(5, 30, 10, random_state: 1337, n_points: 1000, options: new TreeSearchOptions { BatchSize = 5, NWorkers = 5, Strategy = LieStrategy.cl_mean });
+        Console.WriteLine($"Best Score: {result[0].Score}, Parameters: {result[0].Parameters}, Max concurrent: {_maxRunning}");
+
+        result.Length.Should().Be(5);
+        _calls.Should().Be(30);
+        _maxRunning.Should().BeGreaterThan(1).And.BeLessThanOrEqualTo(5);
+    }
+
+    [Fact]
+    public void Bayesian_Batch() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyBayesianOptimization<Parameters>(ScoreFunction);
+        (double score, Parameters parameters) = opt.Search(20, 10, random_state: 1337, options: new BatchSearchOptions { BatchSize = 4, NWorkers = 2 });
+        Console.WriteLine($"Best Score: {score}, Parameters: {parameters}, Max concurrent: {_maxRunning}");
+
+        _calls.Should().Be(20);
+        _maxRunning.Should().BeGreaterThan(1).And.BeLessThanOrEqualTo(2);
+    }
+
+    [Theory]
+    [InlineData(0)]
+    [InlineData(-4)]
+    public void Batch_NoWorkerLimit(int n_workers) {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(12, 4, random_state: 1337, n_points: 1000, options: new ForestSearchOptions { BatchSize = 4, NWorkers = n_workers });
+
+        result.Iterations.Length.Should().Be(12);
+        _maxRunning.Should().BeGreaterThan(1);
+    }
+}
@@ -0,0 +1,115 @@
+using System;
+using System.Collections.Concurrent;
+using System.Linq;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Nucs.Optimization.Helper;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class BudgetTests : PythonTest {
+    private readonly ConcurrentBag<double> _budgets = new ConcurrentBag<double>();
+
+    [Maximize]
+    double ScoreFunction(Parameters parameters, double budget) {
+        _budgets.Add(budget);
+        //lower budgets are noisier estimates of the full score
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000
+               + (1 - budget) * Math.Cos(parameters.Seed);
+    }
+
+    [Fact]
+    public void Brackets() {
+        using var _ = Py.GIL();
+        dynamic helper = EmbeddedModules.Helper;
+
+        dynamic brackets = helper.budget_brackets(1d / 9, 3, false);
+        ((string) brackets.__repr__()).Should().Be("[[(9, 0.1111111111111111), (3, 0.3333333333333333), (1, 1.0)]]");
+
+        brackets = helper.budget_brackets(0.1, 3, true);
+        ((string) brackets.__repr__()).Should().Be("[[(9, 0.1111111111111111), (3, 0.3333333333333333), (1, 1.0)], [(5, 0.3333333333333333), (1, 1.0)], [(3, 1.0)]]");
+    }
+
+    [Fact]
+    public void Forest_SuccessiveHalving() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(6, 5, random_state: 1337, n_points: 1000, options: new ForestSearchOptions { MinBudget = 1d / 9 });
+
+        result.Iterations.Should().HaveCount(6);
+        _budgets.Count(b => b == 1d).Should().Be(6);
+        _budgets.Count(b => b == 1d / 9).Should().Be(54);
+        _budgets.Count(b => b == 1d / 3).Should().Be(18);
+    }
+
+    [Fact]
+    public void Forest_Incremental_SuccessiveHalving() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(8, 5, random_state: 1337, n_points: 1000, options: new ForestSearchOptions { MinBudget = 1d / 9, Incremental = true });
+
+        result.Iterations.Should().HaveCount(8);
+        _budgets.Count(b => b == 1d).Should().Be(8);
+    }
+
+    [Fact]
+    public void IncrementalState_PerBudget() {
+        using var _ = Py.GIL();
+        dynamic forest = EmbeddedModules.Forest;
+        dynamic helper = EmbeddedModules.Helper;
+
+        dynamic state = forest.IncrementalState(n_replace: 2, refit_every: null);
+        dynamic baseEstimator = forest.ExtraTreesRegressor(n_estimators: 20, criterion: "squared_error", incremental: state, random_state: 1337);
+        dynamic result = helper.budget_minimize(PythonEngine.Eval("lambda points, budget: [sum(p) * budget for p in points]"), PythonEngine.Eval("[(0.0, 1.0)] * 3"), baseEstimator,
+                                                n_calls: 12, n_initial_points: 3, min_budget: 1d / 9, random_state: 1337, n_points: 100);
+
+        //the trees of the full budget are fit on its own observations only, the lower budgets score 9 and 3 times as many points
+        int observations = (int) result.func_vals.__len__();
+        observations.Should().Be(12);
+        foreach (dynamic model in result.models)
+            foreach (dynamic tree in model.estimators_)
+                ((int) tree.tree_.n_node_samples[0]).Should().BeLessThanOrEqualTo(observations);
+        ((int) state.n_fits_).Should().Be(0);
+    }
+
+    [Fact]
+    public void Random_Hyperband() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyRandomOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(5, random_state: 1337, verbose: false, options: new SearchOptions { MinBudget = 1d / 9, Hyperband = true });
+
+        //one full evaluation per bracket of 9 and 5 points, three for the last bracket
+        result.Iterations.Should().HaveCount(5);
+        _budgets.Count(b => b == 1d).Should().Be(5);
+        _budgets.Count(b => b < 1d).Should().Be(9 + 3 + 5);
+    }
+
+    [Fact]
+    public void Unbudgeted_Throws() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyRandomOptimization<Parameters>(parameters => parameters.Seed);
+        Assert.Throws<InvalidOperationException>(() => opt.SearchAll(5, verbose: false, options: new SearchOptions { MinBudget = 1d / 9 }));
+    }
+
+    [Fact]
+    public void Budgeted_WithoutMinBudget_ScoresFullBudget() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyRandomOptimization<Parameters>(ScoreFunction);
+        opt.SearchAll(5, random_state: 1337, verbose: false);
+        _budgets.ToArray().Should().Equal(1d, 1d, 1d, 1d, 1d);
+    }
+}
@@ -0,0 +1,67 @@
+using System;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+using EmbeddedModules = Nucs.Optimization.Helper.EmbeddedModules;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class CandidatePoolTests : PythonTest {
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void RefreshesOnlyAFraction() {
+        using var _ = Py.GIL();
+        using dynamic np = PyModule.Import("numpy");
+        using dynamic space = PyModule.Import("skopt.space");
+        dynamic helper = EmbeddedModules.Helper;
+
+        dynamic dimensions = new PyList(new PyObject[] { space.Real(0, 1), space.Integer(0, 10), space.Categorical(new PyList(new PyObject[] { new PyString("a"), new PyString("b") })) });
+        dynamic sp = space.Space(dimensions);
+        dynamic rng = np.random.RandomState(1337);
+        dynamic pool = helper.CandidatePool(refresh: 0.1, local: 0.2);
+
+        dynamic first = pool.candidates(sp, 1000, rng, new PyList(), new PyList()).copy();
+        var Xi = new PyList(new PyObject[] { new PyList(new PyObject[] { new PyFloat(0.5), new PyInt(5), new PyString("a") }) });
+        dynamic second = pool.candidates(sp, 1000, rng, Xi, new PyList(new PyObject[] { new PyFloat(1) }));
+
+        //100 resampled, 200 local, 700 reused
+        dynamic changed = np.any(np.not_equal(first, second), axis: 1);
+        ((int) np.take(changed, np.arange(0, 800)).sum()).Should().BeLessThanOrEqualTo(100);
+        ((bool) np.array_equal(np.take(first, np.arange(100, 800), axis: 0), np.take(second, np.arange(100, 800), axis: 0))).Should().BeTrue();
+
+        //perturbations of the incumbent, 0.05 of the range
+        dynamic local = np.take(np.take(second, np.arange(800, 1000), axis: 0), 0, axis: 1);
+        ((double) np.abs(local.mean() - 0.5)).Should().BeLessThan(0.02);
+        ((double) local.std()).Should().BeLessThan(0.1);
+    }
+
+    [Fact]
+    public void Forest_CandidatePool() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(40, 10, random_state: 1337, n_points: 2000, options: new ForestSearchOptions { CandidatePool = true });
+
+        result.Iterations.Should().HaveCount(40);
+        result.BestScore.Should().BeGreaterThan(0);
+    }
+
+    [Fact]
+    public void Gbrt_Batch_CandidatePool() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyGbrtOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(30, 10, random_state: 1337, n_points: 2000, options: new TreeSearchOptions { BatchSize = 4, CandidatePool = true, PoolRefresh = 0.2, PoolLocal = 0.05 });
+
+        result.Iterations.Should().HaveCount(30);
+    }
+}
@@ -0,0 +1,88 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class ColumnarMarshalingTests : PythonTest {
+    private readonly List<Parameters> _evaluated = new();
+
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        lock (_evaluated)
+            _evaluated.Add(parameters);
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void Layout() {
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        //FloatSeed is the only real, NumericalCategories is a categorical of floats
+        ParametersAnalyzer<Parameters>.RealsCount.Should().Be(1);
+        ParametersAnalyzer<Parameters>.IntegersCount.Should().Be(7);
+        ParametersAnalyzer<Parameters>.ColumnarIsReal[Array.IndexOf(ParametersAnalyzer<Parameters>.ParameterNames, "FloatSeed")].Should().BeTrue();
+        ParametersAnalyzer<Parameters>.ColumnarSlots.Where((_, i) => !ParametersAnalyzer<Parameters>.ColumnarIsReal[i]).Should().BeEquivalentTo(Enumerable.Range(0, 7));
+    }
+
+    [Fact]
+    public void Populate() {
+        ParametersAnalyzer<Parameters>.Initialize();
+        var names = ParametersAnalyzer<Parameters>.ParameterNames;
+
+        var reals = new double[] { 1.5 };
+        var integers = new long[ParametersAnalyzer<Parameters>.IntegersCount];
+        integers[ParametersAnalyzer<Parameters>.ColumnarSlots[Array.IndexOf(names, "Seed")]] = 42;
+        integers[ParametersAnalyzer<Parameters>.ColumnarSlots[Array.IndexOf(names, "Categories")]] = 2;          //"C"
+        integers[ParametersAnalyzer<Parameters>.ColumnarSlots[Array.IndexOf(names, "NumericalCategories")]] = 1; //2f
+        integers[ParametersAnalyzer<Parameters>.ColumnarSlots[Array.IndexOf(names, "UseMethod")]] = 1;           //false
+        integers[ParametersAnalyzer<Parameters>.ColumnarSlots[Array.IndexOf(names, "AnEnum")]] = 1;              //B
+        integers[ParametersAnalyzer<Parameters>.ColumnarSlots[Array.IndexOf(names, "Letter")]] = 2;              //'c'
+        integers[ParametersAnalyzer<Parameters>.ColumnarSlots[Array.IndexOf(names, "AnEnumWithValues")]] = 1;    //B
+
+        var parameters = ParametersAnalyzer<Parameters>.Populate(reals, integers);
+        parameters.Seed.Should().Be(42);
+        parameters.FloatSeed.Should().Be(1.5);
+        parameters.Categories.Should().Be("C");
+        parameters.NumericalCategories.Should().Be(2f);
+        parameters.UseMethod.Should().BeFalse();
+        parameters.AnEnum.Should().Be(SomeEnum.B);
+        parameters.Letter.Should().Be('c');
+        parameters.AnEnumWithValues.Should().Be(SomeEnum.B);
+    }
+
+    [Fact]
+    public void ScoredParametersMatchResults() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyRandomOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(200, random_state: 1337, verbose: false);
+
+        //result.Iterations are unboxed in bulk through opt_helpers.columnar_results
+        _evaluated.Should().HaveCount(200);
+        foreach (var (parameters, _) in result.Iterations)
+            _evaluated.Contains(parameters).Should().BeTrue();
+    }
+
+    [Fact]
+    public void BulkResults() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var all = new PyRandomOptimization<Parameters>(ScoreFunction).SearchAll(300, random_state: 1337, verbose: false);
+        var top = new PyRandomOptimization<Parameters>(ScoreFunction).SearchTop(10, 300, random_state: 1337, verbose: false);
+
+        all.Iterations.Should().HaveCount(300);
+        all.Best.Should().Be(all.Iterations[0].Parameters);
+        all.BestScore.Should().Be(all.Iterations[0].Score);
+        top.Select(t => t.Score).Should().Equal(all.Iterations.Take(10).Select(i => i.Score));
+        top.Select(t => t.Parameters).Should().Equal(all.Iterations.Take(10).Select(i => i.Parameters));
+    }
+}
\ No newline at end of file
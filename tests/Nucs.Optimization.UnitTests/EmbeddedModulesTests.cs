@@ -0,0 +1,37 @@
+using System;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Nucs.Optimization.Callbacks;
+using Nucs.Optimization.Helper;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class EmbeddedModulesTests : PythonTest {
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void Shared() {
+        using var _ = Py.GIL();
+        EmbeddedModules.Helper.Should().BeSameAs(EmbeddedModules.Helper);
+        EmbeddedModules.Forest.Should().BeSameAs(EmbeddedModules.Forest);
+    }
+
+    [Fact]
+    public void SurvivesDisposedInstances() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        for (int i = 0; i < 2; i++) {
+            using var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+            using var callback = new FastIterationCallback<Parameters>(_ => { });
+            opt.SearchAll(12, 10, random_state: 1337, n_points: 1000, callbacks: new PyOptCallback[] { callback }).Iterations.Should().HaveCount(12);
+        }
+    }
+}
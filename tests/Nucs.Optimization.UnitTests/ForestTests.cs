@@ -0,0 +1,185 @@
+using FluentAssertions;
+using Python.Runtime;
+using Xunit;
+using EmbeddedModules = Nucs.Optimization.Helper.EmbeddedModules;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class ForestTests : PythonTest {
+    [Theory]
+    [InlineData("RandomForestRegressor", 0d)]
+    [InlineData("RandomForestRegressor", 0.01d)]
+    [InlineData("ExtraTreesRegressor", 0d)]
+    [InlineData("ExtraTreesRegressor", 0.01d)]
+    public void PredictReturnStd_MatchesSkopt(string regressor, double minVariance) {
+        using var _ = Py.GIL();
+        using dynamic np = PyModule.Import("numpy");
+        using dynamic sklearn = PyModule.Import("sklearn.ensemble");
+        using dynamic skoptForest = PyModule.Import("skopt.learning.forest");
+        PyModule forest = EmbeddedModules.Forest;
+
+        dynamic rng = np.random.RandomState(1337);
+        dynamic X = rng.rand(200, 5);
+        dynamic y = np.sin(X.sum(axis: 1)) + rng.rand(200) * 0.1;
+        dynamic candidates = rng.rand(1000, 5);
+
+        dynamic model = forest.GetAttr(regressor).Invoke(new PyObject[0], Py.kw("n_estimators", 50, "criterion", "squared_error", "min_variance", minVariance, "random_state", 1337));
+        model.fit(X, y);
+
+        dynamic result = model.predict(candidates, return_std: true);
+        dynamic mean = result[0];
+        dynamic std = result[1];
+
+        //the previous two-pass implementation: sklearn's predict followed by skopt's _return_std
+        dynamic expectedMean = ((PyObject) sklearn).GetAttr(regressor).InvokeMethod("predict", model, candidates);
+        dynamic expectedStd = skoptForest._return_std(candidates, model.estimators_, expectedMean, minVariance);
+
+        ((bool) np.allclose(mean, expectedMean)).Should().BeTrue();
+        ((bool) np.allclose(std, expectedStd)).Should().BeTrue();
+        ((bool) np.array_equal(model.predict(candidates), expectedMean)).Should().BeTrue();
+    }
+
+    [Theory]
+    [InlineData("RandomForestRegressor")]
+    [InlineData("ExtraTreesRegressor")]
+    public void PredictReturnStd_Parallel_MatchesSequential(string regressor) {
+        using var _ = Py.GIL();
+        using dynamic np = PyModule.Import("numpy");
+        PyModule forest = EmbeddedModules.Forest;
+
+        dynamic rng = np.random.RandomState(1337);
+        dynamic X = rng.rand(200, 5);
+        dynamic y = np.sin(X.sum(axis: 1));
+        dynamic candidates = rng.rand(10000, 5);
+
+        dynamic model = forest.GetAttr(regressor).Invoke(new PyObject[0], Py.kw("n_estimators", 50, "criterion", "squared_error", "n_jobs", 4, "random_state", 1337));
+        model.fit(X, y);
+        dynamic parallel = model.predict(candidates, return_std: true);
+
+        model.n_jobs = 1;
+        dynamic sequential = model.predict(candidates, return_std: true);
+
+        ((bool) np.allclose(parallel[0], sequential[0])).Should().BeTrue();
+        ((bool) np.allclose(parallel[1], sequential[1])).Should().BeTrue();
+    }
+
+    [Fact]
+    public void IncrementalState_RetrainsOnlyOldestTrees() {
+        using var _ = Py.GIL();
+        using dynamic np = PyModule.Import("numpy");
+        using dynamic op = PyModule.Import("operator");
+        using dynamic sklearnBase = PyModule.Import("sklearn.base");
+        dynamic forest = EmbeddedModules.Forest;
+
+        dynamic rng = np.random.RandomState(1337);
+        dynamic X = rng.rand(20, 3);
+        dynamic y = X.sum(axis: 1);
+        dynamic X2 = np.vstack(new PyList(new PyObject[] { X, rng.rand(5, 3) }));
+        dynamic y2 = X2.sum(axis: 1);
+
+        dynamic state = forest.IncrementalState(n_replace: 2, refit_every: 5);
+        dynamic baseEstimator = forest.ExtraTreesRegressor(n_estimators: 10, criterion: "squared_error", incremental: state, random_state: 1337);
+
+        //skopt clones the base estimator before every fit
+        dynamic first = sklearnBase.clone(baseEstimator);
+        first.fit(X, y);
+        dynamic second = sklearnBase.clone(baseEstimator);
+        second.fit(X2, y2);
+
+        ((int) state.n_fits_).Should().Be(2);
+        ((int) state.n_full_fits_).Should().Be(1);
+        ((int) second.estimators_.__len__()).Should().Be(10);
+        for (int i = 0; i < 8; i++)
+            ((bool) op.is_(second.estimators_[i], first.estimators_[i + 2])).Should().BeTrue();
+        for (int i = 8; i < 10; i++)
+            ((bool) op.contains(first.estimators_, second.estimators_[i])).Should().BeFalse();
+
+        dynamic result = second.predict(X2, return_std: true);
+        ((int) result[1].shape[0]).Should().Be(25);
+    }
+
+    [Fact]
+    public void IncrementalState_Batched_KeepsNoLieTrees() {
+        using var _ = Py.GIL();
+        using dynamic op = PyModule.Import("operator");
+        dynamic forest = EmbeddedModules.Forest;
+        dynamic helper = EmbeddedModules.Helper;
+
+        dynamic state = forest.IncrementalState(n_replace: 2, refit_every: null);
+        dynamic baseEstimator = forest.ExtraTreesRegressor(n_estimators: 20, criterion: "squared_error", incremental: state, random_state: 1337);
+        dynamic result = helper.batch_minimize(PythonEngine.Eval("lambda points: [sum(p) for p in points]"), PythonEngine.Eval("[(0.0, 1.0)] * 3"), baseEstimator,
+                                               n_calls: 30, n_initial_points: 6, random_state: 1337, n_points: 100, batch_size: 4);
+
+        //one fit per told batch, the constant liar copies fit on made up scores in between
+        dynamic models = result.models;
+        int count = (int) models.__len__();
+        count.Should().Be(7);
+        ((int) state.n_fits_).Should().Be(count);
+        for (int m = 1; m < count; m++) {
+            //every fit after the first keeps the 18 newest trees of the previous one
+            for (int i = 0; i < 18; i++)
+                ((bool) op.is_(models[m].estimators_[i], models[m - 1].estimators_[i + 2])).Should().BeTrue();
+        }
+    }
+
+    [Theory]
+    [InlineData("RandomForestRegressor")]
+    [InlineData("ExtraTreesRegressor")]
+    public void FlatForest_MatchesTrees(string regressor) {
+        using var _ = Py.GIL();
+        using dynamic np = PyModule.Import("numpy");
+        PyModule forest = EmbeddedModules.Forest;
+
+        dynamic rng = np.random.RandomState(1337);
+        dynamic X = rng.rand(200, 5);
+        dynamic y = np.sin(X.sum(axis: 1));
+        dynamic candidates = rng.rand(5000, 5);
+
+        dynamic model = forest.GetAttr(regressor).Invoke(new PyObject[0], Py.kw("n_estimators", 30, "criterion", "squared_error", "min_variance", 0.01, "random_state", 1337));
+        model.fit(X, y);
+        dynamic expected = model.predict(candidates, return_std: true);
+
+        dynamic flat = model.flatten();
+        ((int) flat.__len__()).Should().Be(30);
+        ((int) flat.roots[1]).Should().Be((int) model.estimators_[0].tree_.node_count);
+        dynamic result = flat.predict(candidates, return_std: true);
+        ((bool) np.allclose(result[0], expected[0])).Should().BeTrue();
+        ((bool) np.allclose(result[1], expected[1])).Should().BeTrue();
+
+        //the sklearn trees are checked the same way: a feature count other than the fit one is refused
+        Assert.Throws<PythonException>(() => flat.predict(np.zeros(new PyTuple(new PyObject[] { new PyInt(3), new PyInt(4) }))));
+
+        dynamic restored = forest.GetAttr("FlatForest").InvokeMethod("from_bytes", flat.to_bytes());
+        ((bool) np.array_equal(restored.predict(candidates), result[0])).Should().BeTrue();
+    }
+
+    [Theory]
+    [InlineData("RandomForestRegressor", "deepcopy")]
+    [InlineData("ExtraTreesRegressor", "deepcopy")]
+    [InlineData("ExtraTreesRegressor", "pickle")]
+    public void Copy_KeepsTrees(string regressor, string copy) {
+        using var _ = Py.GIL();
+        using dynamic np = PyModule.Import("numpy");
+        using dynamic copyModule = PyModule.Import("copy");
+        using dynamic pickle = PyModule.Import("pickle");
+        PyModule forest = EmbeddedModules.Forest;
+
+        dynamic rng = np.random.RandomState(1337);
+        dynamic X = rng.rand(200, 5);
+        dynamic y = np.sin(X.sum(axis: 1));
+        dynamic candidates = rng.rand(1000, 5);
+
+        dynamic model = forest.GetAttr(regressor).Invoke(new PyObject[0], Py.kw("n_estimators", 30, "criterion", "squared_error", "random_state", 1337));
+        model.fit(X, y);
+        dynamic expected = model.predict(candidates, return_std: true);
+
+        dynamic copied = copy == "pickle" ? pickle.loads(pickle.dumps(model)) : copyModule.deepcopy(model);
+        ((int) copied.estimators_.__len__()).Should().Be(30);
+        dynamic result = copied.predict(candidates, return_std: true);
+        ((bool) np.array_equal(result[0], expected[0])).Should().BeTrue();
+        ((bool) np.array_equal(result[1], expected[1])).Should().BeTrue();
+        ((bool) np.array_equal(copied.predict(candidates), model.predict(candidates))).Should().BeTrue();
+        ((bool) np.array_equal(copied.apply(candidates), model.apply(candidates))).Should().BeTrue();
+        ((bool) np.array_equal(copied.feature_importances_, model.feature_importances_)).Should().BeTrue();
+    }
+}
@@ -0,0 +1,124 @@
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Nucs.Optimization.Callbacks;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class IncrementalCallbackTests : PythonTest {
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void DeltaYStopper_MatchesSkopt() {
+        using var _ = Py.GIL();
+        using dynamic skopt = PyModule.Import("skopt");
+        using dynamic np = PyModule.Import("numpy");
+
+        dynamic rng = np.random.RandomState(1337);
+        foreach (var (delta, nBest) in new[] { (0.01, 1), (0.1, 3), (0.5, 5) }) {
+            using var incremental = new DeltaYStopper(delta, nBest);
+            using var sorted = new DeltaYStopper((PyModule) skopt, delta, nBest);
+            var x = new PyList();
+            var y = new PyList();
+            for (int i = 0; i < 40; i++) {
+                //batches of scores, some of them close together
+                for (int j = 0; j < 1 + i % 3; j++) {
+                    x.Append(new PyList(new PyObject[] { new PyFloat(0) }));
+                    y.Append(new PyFloat((double) rng.rand() * (i % 2 == 0 ? 1 : 0.05)));
+                }
+
+                PyObject result = skopt.utils.create_result(x, y);
+                incremental.This.InvokeMethod("_criterion", result).Repr().Should().Be(sorted.This.InvokeMethod("_criterion", result).Repr());
+            }
+        }
+    }
+
+    [Fact]
+    public void DeltaYStopper_TiesAndReuse_MatchSkopt() {
+        using var _ = Py.GIL();
+        using dynamic skopt = PyModule.Import("skopt");
+
+        using var incremental = new DeltaYStopper(0, 3);
+        using var sorted = new DeltaYStopper((PyModule) skopt, 0, 3);
+        //repeated best scores are not within a delta of 0, then a second run starts over with fewer points
+        foreach (var scores in new[] { new[] { 1d, 1d, 1d, 2d }, new[] { 3d, 3d, 3d }, new[] { 5d, 4d } }) {
+            var x = new PyList();
+            var y = new PyList();
+            foreach (var score in scores) {
+                x.Append(new PyList(new PyObject[] { new PyFloat(0) }));
+                y.Append(new PyFloat(score));
+                PyObject result = skopt.utils.create_result(x, y);
+                incremental.This.InvokeMethod("_criterion", result).Repr().Should().Be(sorted.This.InvokeMethod("_criterion", result).Repr());
+            }
+        }
+    }
+
+    [Fact]
+    public void IterationCallback_Batched_EveryPoint() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var received = new List<(int Iteration, Parameters Parameters, double Score)>();
+        void Callback(int iteration, Parameters parameters, double score) => received.Add((iteration, parameters, score));
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(20, 8, random_state: 1337, n_points: 1000, callbacks: new[] { new IterationCallback<Parameters>(true, Callback) },
+                                   options: new ForestSearchOptions { BatchSize = 4 });
+
+        //callbacks are evaluated once per batch, every point of the batch is passed once
+        received.Select(r => r.Iteration).Should().Equal(Enumerable.Range(1, 20));
+        received.Select(r => r.Score).OrderBy(s => s).ToArray().Should().Equal(result.Iterations.Select(i => i.Score).OrderBy(s => s).ToArray());
+        foreach (var (_, parameters, score) in received) {
+            result.Iterations.Any(i => i.Score == score && i.Parameters.Seed == parameters.Seed && i.Parameters.FloatSeed == parameters.FloatSeed).Should().BeTrue();
+        }
+    }
+
+    [Fact]
+    public void IterationCallback_NewestPoint() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var received = new List<(int Iteration, Parameters Parameters, double Score)>();
+        void Callback(int iteration, Parameters parameters, double score) => received.Add((iteration, parameters, score));
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(20, 10, random_state: 1337, n_points: 1000, callbacks: new[] { new IterationCallback<Parameters>(true, Callback) });
+
+        received.Select(r => r.Iteration).Should().Equal(Enumerable.Range(1, 20));
+        foreach (var (_, parameters, score) in received) {
+            result.Iterations.Any(i => i.Score == score && i.Parameters.Seed == parameters.Seed && i.Parameters.FloatSeed == parameters.FloatSeed
+                                       && i.Parameters.UseMethod == parameters.UseMethod && i.Parameters.NumericalCategories == parameters.NumericalCategories).Should().BeTrue();
+        }
+    }
+
+    [Fact]
+    public void EarlyStopper_StopsOnNewestPoint() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        Parameters? stoppedAt = null;
+        bool Callback(Parameters parameters, double score) {
+            if (score <= 0)
+                return false;
+            stoppedAt = parameters;
+            return true;
+        }
+
+        var opt = new PyRandomOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(500, random_state: 1337, verbose: false, callbacks: new[] { new EarlyStopper<Parameters>(true, Callback) });
+
+        result.Iterations.Length.Should().BeLessThan(500);
+        result.Iterations.Count(i => i.Score > 0).Should().Be(1);
+        result.Best.Seed.Should().Be(stoppedAt!.Seed);
+        result.Best.FloatSeed.Should().Be(stoppedAt.FloatSeed);
+    }
+}
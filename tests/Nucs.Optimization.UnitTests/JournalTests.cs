@@ -0,0 +1,96 @@
+using System;
+using System.IO;
+using System.Linq;
+using System.Threading;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Nucs.Optimization.Callbacks;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class JournalTests : PythonTest {
+    private int _calls;
+
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        Interlocked.Increment(ref _calls);
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void Random_Resume() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+        using var tmpFile = new TempFile();
+
+        using (var journal = new Journal(tmpFile)) {
+            new PyRandomOptimization<Parameters>(ScoreFunction).SearchAll(30, random_state: 1337, verbose: false, options: new SearchOptions { Journal = journal });
+        }
+
+        //the names record and one record per evaluation
+        File.ReadAllLines(tmpFile.Path).Should().HaveCount(31);
+        _calls.Should().Be(30);
+
+        //a crash while writing leaves a torn record
+        File.AppendAllText(tmpFile.Path, "{\"x\": [1, ");
+
+        OptimizeResult<Parameters> result;
+        using (var journal = new Journal(tmpFile)) {
+            result = new PyRandomOptimization<Parameters>(ScoreFunction).SearchAll(50, random_state: 7, verbose: false, options: new SearchOptions { Journal = journal });
+        }
+
+        _calls.Should().Be(50);
+        result.Iterations.Should().HaveCount(50);
+        File.ReadAllLines(tmpFile.Path).Should().HaveCount(52);
+
+        //the torn record is skipped, all others are resumed
+        using (var journal = new Journal(tmpFile)) {
+            result = new PyRandomOptimization<Parameters>(ScoreFunction).SearchAll(50, random_state: 7, verbose: false, options: new SearchOptions { Journal = journal });
+        }
+
+        _calls.Should().Be(50);
+        result.Iterations.Should().HaveCount(50);
+    }
+
+    [Fact]
+    public void Forest_Batch_Resume() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+        using var tmpFile = new TempFile();
+
+        using (var journal = new Journal(tmpFile, fsyncEvery: 1)) {
+            new PyForestOptimization<Parameters>(ScoreFunction).SearchAll(20, 10, random_state: 1337, options: new ForestSearchOptions { BatchSize = 4, Journal = journal });
+        }
+
+        OptimizeResult<Parameters> result;
+        using (var journal = new Journal(tmpFile)) {
+            result = new PyForestOptimization<Parameters>(ScoreFunction).SearchAll(30, 10, random_state: 7, options: new ForestSearchOptions { BatchSize = 4, Journal = journal });
+        }
+
+        _calls.Should().Be(30);
+        result.Iterations.Should().HaveCount(30);
+        File.ReadAllLines(tmpFile.Path).Should().HaveCount(31);
+    }
+
+    [Fact]
+    public void Forest_WithoutResume_StartsOver() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+        using var tmpFile = new TempFile();
+
+        using (var journal = new Journal(tmpFile)) {
+            new PyForestOptimization<Parameters>(ScoreFunction).SearchAll(15, 10, random_state: 1337, options: new ForestSearchOptions { Journal = journal });
+        }
+
+        using (var journal = new Journal(tmpFile, resume: false)) {
+            new PyForestOptimization<Parameters>(ScoreFunction).SearchAll(15, 10, random_state: 1337, options: new ForestSearchOptions { Journal = journal });
+        }
+
+        _calls.Should().Be(30);
+        File.ReadAllLines(tmpFile.Path).Should().HaveCount(31);
+    }
+}
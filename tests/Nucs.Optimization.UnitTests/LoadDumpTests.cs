@@ -31,6 +31,24 @@ public class LoadDumpTests : PythonTest {
         loaded.Best.Equals(loaded.Iterations.MaxBy(b=>b.Score).Parameters).Should().BeTrue();
     }
 
+    [Fact]
+    public void Dump_FlattensForests() {
+        using var _ = Py.GIL();
+        using dynamic skopt = PyModule.Import("skopt");
+
+        using var tmpFile = new TempFile();
+        var forest = new PyForestOptimization<Parameters>(BlackBoxScoreFunction, maximize: true, tmpFile);
+        var result = forest.SearchAll(15, 10, random_state: 1337, n_points: 1000);
+
+        //the dump holds the surrogates as flat arrays, the loaded ones predict like the fit ones did
+        dynamic dumped = skopt.utils.load(tmpFile.Path);
+        ((int) dumped.models.__len__()).Should().Be(6);
+        ((string) dumped.models[0].__class__.__name__).Should().Be("FlatForest");
+        var loaded = PyOptimization<Parameters>.Load(tmpFile, maximize: true);
+        loaded.Iterations.Length.Should().Be(result.Iterations.Length);
+        loaded.BestScore.Should().Be(result.BestScore);
+    }
+
     private double BlackBoxScoreFunction(Parameters parameters) {
         var res = new Random(parameters.Seed).Next(1, int.MaxValue);
         Console.WriteLine($"Score: {res}, Parameters: {parameters}");
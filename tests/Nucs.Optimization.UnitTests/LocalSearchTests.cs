@@ -0,0 +1,68 @@
+using System;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+using EmbeddedModules = Nucs.Optimization.Helper.EmbeddedModules;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class LocalSearchTests : PythonTest {
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void RefinesTheCandidates() {
+        using var _ = Py.GIL();
+        using dynamic np = PyModule.Import("numpy");
+        using dynamic space = PyModule.Import("skopt.space");
+        dynamic helper = EmbeddedModules.Helper;
+        dynamic forest = EmbeddedModules.Forest;
+
+        dynamic dimensions = new PyList(new PyObject[] { space.Real(0, 1), space.Integer(0, 10, transform: "normalize"), space.Categorical(new PyList(new PyObject[] { new PyString("a"), new PyString("b"), new PyString("c") })) });
+        dynamic sp = space.Space(dimensions);
+        dynamic rng = np.random.RandomState(1337);
+        dynamic estimator = forest.ExtraTreesRegressor(n_estimators: 20, criterion: "squared_error", random_state: 1337);
+        estimator.fit(sp.transform(sp.rvs(50, random_state: rng)), rng.rand(50));
+
+        dynamic X = sp.transform(sp.rvs(200, random_state: rng));
+        dynamic refined = helper.LocalSearch(n_starts: 5).refine(sp, X, estimator.predict, rng, new PyList(), new PyList());
+
+        ((int) refined.shape[0]).Should().Be(5);
+        ((double) estimator.predict(refined).min()).Should().BeLessThanOrEqualTo((double) estimator.predict(X).min());
+
+        //every perturbation is a point of the space: integers on their steps and a single category
+        foreach (dynamic point in sp.inverse_transform(refined))
+            ((bool) sp.__contains__(point)).Should().BeTrue();
+        dynamic integers = np.take(refined, 1, axis: 1) * 10;
+        ((bool) np.allclose(integers, np.round(integers))).Should().BeTrue();
+        ((bool) np.array_equal(np.take(refined, np.arange(2, 5), axis: 1).sum(axis: 1), np.ones(5))).Should().BeTrue();
+    }
+
+    [Fact]
+    public void Forest_Local() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(30, 10, random_state: 1337, n_points: 1000, acq_optimizer: PyForestOptimization.AcqOptimizer.local);
+
+        result.Iterations.Should().HaveCount(30);
+        result.BestScore.Should().BeGreaterThan(0);
+    }
+
+    [Fact]
+    public void Gbrt_Batch_Local() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyGbrtOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(30, 10, random_state: 1337, n_points: 1000, acq_optimizer: PyGbrtOptimization.AcqOptimizer.local, options: new TreeSearchOptions { BatchSize = 4, LocalRounds = 3 });
+
+        result.Iterations.Should().HaveCount(30);
+    }
+}
@@ -0,0 +1,81 @@
+using System.Threading;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class ObjectiveCacheTests : PythonTest {
+    public record SmallParameters {
+        [IntegerSpace<int>(0, 4)]
+        public int Seed;
+
+        [CategoricalSpace<string>("A", "B")]
+        public string Categories;
+
+        public bool UseMethod;
+    }
+
+    private int _calls;
+
+    [Maximize]
+    double ScoreFunction(SmallParameters parameters) {
+        Interlocked.Increment(ref _calls);
+        return parameters.Seed * (parameters.Categories == "A" ? 1 : 2) * (parameters.UseMethod ? 1 : -1);
+    }
+
+    [Fact]
+    public void Random_RepeatedPointsAreCached() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<SmallParameters>.Initialize();
+
+        using var cache = new ObjectiveCache();
+        var opt = new PyRandomOptimization<SmallParameters>(ScoreFunction, cache: cache);
+        var result = opt.SearchAll(100, random_state: 1337, verbose: false);
+
+        //only 20 distinct points exist
+        _calls.Should().BeLessThanOrEqualTo(20);
+        cache.Misses.Should().Be(_calls);
+        (cache.Hits + cache.Misses).Should().Be(100);
+        cache.Count.Should().Be(_calls);
+        result.BestScore.Should().Be(8);
+    }
+
+    [Fact]
+    public void Forest_Batch_MaxSize() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<SmallParameters>.Initialize();
+
+        using var cache = new ObjectiveCache(maxSize: 5);
+        var opt = new PyForestOptimization<SmallParameters>(ScoreFunction, cache: cache);
+        var result = opt.SearchAll(60, 10, random_state: 1337, options: new ForestSearchOptions { BatchSize = 4 });
+
+        cache.Misses.Should().Be(_calls);
+        (cache.Hits + cache.Misses).Should().Be(60);
+        cache.Count.Should().Be(5);
+        result.Iterations.Should().HaveCount(60);
+    }
+
+    [Fact]
+    public void Persistent_ReusedBetweenRuns() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<SmallParameters>.Initialize();
+        using var tmpFile = new TempFile();
+
+        using (var cache = new ObjectiveCache(path: tmpFile)) {
+            new PyRandomOptimization<SmallParameters>(ScoreFunction, cache: cache).SearchAll(50, random_state: 1337, verbose: false);
+        }
+
+        var calls = _calls;
+        using (var cache = new ObjectiveCache(path: tmpFile)) {
+            new PyRandomOptimization<SmallParameters>(ScoreFunction, cache: cache).SearchAll(50, random_state: 1337, verbose: false);
+            cache.Hits.Should().Be(50);
+            cache.Misses.Should().Be(0);
+        }
+
+        _calls.Should().Be(calls);
+    }
+}
@@ -0,0 +1,54 @@
+using System;
+using System.IO;
+using System.Linq;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class OptimizationHistoryTests : PythonTest {
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void Random_TopMatchesResult() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        using var history = new OptimizationHistory<Parameters>(maximize: true, capacity: 16);
+        var result = new PyRandomOptimization<Parameters>(ScoreFunction).SearchAll(500, random_state: 1337, verbose: false, callbacks: new[] { history });
+
+        history.Count.Should().Be(500);
+        history.Top(10).Select(t => t.Score).Should().Equal(result.Iterations.Take(10).Select(i => i.Score));
+        history.Top(10).Select(t => t.Parameters).Should().Equal(result.Iterations.Take(10).Select(i => i.Parameters));
+        history.Top(1000).Should().HaveCount(500);
+
+        var all = history.Read(0, 500);
+        all.Select(a => a.Parameters).ToHashSet().SetEquals(result.Iterations.Select(i => i.Parameters)).Should().BeTrue();
+        history[42].Should().Be(all[42]);
+        ((int) history.Data.Length()).Should().Be(500);
+    }
+
+    [Fact]
+    public void Memmap() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+        using var tmpFile = new TempFile();
+
+        using (var history = new OptimizationHistory<Parameters>(maximize: true, path: tmpFile, capacity: 8)) {
+            var result = new PyForestOptimization<Parameters>(ScoreFunction).SearchAll(30, 10, random_state: 1337, callbacks: new[] { history });
+
+            history.Count.Should().Be(30);
+            history.Top(1)[0].Score.Should().Be(result.BestScore);
+            Assert.Throws<ArgumentOutOfRangeException>(() => history.Read(25, 10));
+        }
+
+        new FileInfo(tmpFile.Path).Length.Should().BeGreaterThan(0);
+    }
+}
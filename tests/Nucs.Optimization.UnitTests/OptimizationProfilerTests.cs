@@ -0,0 +1,90 @@
+using System;
+using System.IO;
+using System.Linq;
+using System.Threading;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Nucs.Optimization.Callbacks;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class OptimizationProfilerTests : PythonTest {
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        Thread.Sleep(2);
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void Forest_Phases() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var profiler = new OptimizationProfiler();
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(30, 10, random_state: 1337, n_points: 1000, callbacks: new PyOptCallback[] { profiler });
+
+        var iterations = profiler.Iterations;
+        iterations.Should().HaveCount(30);
+        iterations.Sum(i => i.Evaluations).Should().Be(30);
+        iterations.Should().OnlyContain(i => i.Objective >= TimeSpan.FromMilliseconds(1.5) && i.Objective <= i.Total);
+        //the surrogate is only fit once the random starts are told
+        iterations.Take(9).Should().OnlyContain(i => i.Fit == TimeSpan.Zero && i.Acquisition == TimeSpan.Zero);
+        iterations.Skip(10).Should().OnlyContain(i => i.Fit > TimeSpan.Zero && i.Acquisition > TimeSpan.Zero);
+
+        var summary = profiler.Summary;
+        summary.Iterations.Should().Be(30);
+        summary.Evaluations.Should().Be(30);
+        (summary.Objective + summary.Marshal + summary.Fit + summary.Acquisition + summary.Other).TotalSeconds.Should().BeApproximately(summary.Total.TotalSeconds, 1e-6);
+        result.Profile.Should().Be(summary);
+    }
+
+    [Fact]
+    public void Random_Phases() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var profiler = new OptimizationProfiler();
+        var opt = new PyRandomOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(20, random_state: 1337, verbose: false, callbacks: new PyOptCallback[] { profiler });
+
+        result.Profile.Should().NotBeNull();
+        result.Profile!.Value.Evaluations.Should().Be(20);
+        result.Profile!.Value.Objective.Should().BeGreaterThan(TimeSpan.FromMilliseconds(30));
+        result.Profile!.Value.Fit.Should().Be(TimeSpan.Zero);
+    }
+
+    [Fact]
+    public void Gbrt_Batch_ProfilesSelectedIterations() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+        var directory = new DirectoryInfo(Path.Combine(Path.GetTempPath(), Guid.NewGuid().ToString("N")));
+
+        try {
+            var profiler = new OptimizationProfiler(profileIterations: new[] { 6, 7 }, profilePath: directory);
+            var opt = new PyGbrtOptimization<Parameters>(ScoreFunction);
+            opt.Search(24, 8, random_state: 1337, n_points: 1000, callbacks: new PyOptCallback[] { profiler }, options: new TreeSearchOptions { BatchSize = 3 });
+
+            profiler.Iterations.Should().HaveCount(8);
+            profiler.Iterations.Should().OnlyContain(i => i.Evaluations == 3);
+            profiler.Report()!.Should().Contain("_tell");
+            directory.GetFiles().Select(f => f.Name).Should().BeEquivalentTo("iteration_6.prof", "iteration_7.prof");
+        } finally {
+            if (directory.Exists)
+                directory.Delete(true);
+        }
+    }
+
+    [Fact]
+    public void NotProfiled() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        opt.SearchAll(12, 10, random_state: 1337, n_points: 1000).Profile.Should().BeNull();
+    }
+}
@@ -0,0 +1,58 @@
+using System;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+using EmbeddedModules = Nucs.Optimization.Helper.EmbeddedModules;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class OrdinalCategoricalTests : PythonTest {
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void OneColumnPerDimension() {
+        using var _ = Py.GIL();
+        using dynamic np = PyModule.Import("numpy");
+        using dynamic space = PyModule.Import("skopt.space");
+        dynamic helper = EmbeddedModules.Helper;
+
+        var categories = new PyList(new PyObject[] { new PyString("a"), new PyString("b"), new PyString("c"), new PyString("d"), new PyString("e") });
+        dynamic dimensions = new PyList(new PyObject[] { space.Real(0, 1), space.Categorical(categories), space.Categorical(categories, transform: "label") });
+        dynamic sp = space.Space(helper.ordinal_dimensions(dimensions));
+
+        ((int) space.Space(dimensions).transformed_n_dims).Should().Be(7);
+        ((int) sp.transformed_n_dims).Should().Be(3);
+        ((string) sp.dimensions[2].transform_).Should().Be("label"); //explicit transforms are kept
+        ((string) sp.inverse_transform(sp.transform(new PyList(new PyObject[] { new PyList(new PyObject[] { new PyFloat(0.5), new PyString("d"), new PyString("b") }) }))).__repr__())
+           .Should().Be("[[0.5, 'd', 'b']]");
+
+        //perturbations of the incumbent stay on the codes
+        dynamic rng = np.random.RandomState(1337);
+        dynamic pool = helper.CandidatePool(local: 0.5, scale: 0.5);
+        pool.candidates(sp, 1000, rng, new PyList(), new PyList());
+        var Xi = new PyList(new PyObject[] { new PyList(new PyObject[] { new PyFloat(0.5), new PyString("c"), new PyString("a") }) });
+        dynamic local = np.take(np.take(pool.candidates(sp, 1000, rng, Xi, new PyList(new PyObject[] { new PyFloat(1) })), np.arange(500, 1000), axis: 0), 1, axis: 1);
+        ((string) np.unique(local).__repr__()).Should().Be("array([0.  , 0.25, 0.5 , 0.75, 1.  ])");
+    }
+
+    [Fact]
+    public void Forest_OrdinalCategoricals() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(40, 10, random_state: 1337, n_points: 2000, options: new ForestSearchOptions { OrdinalCategoricals = true });
+        result.Iterations.Should().HaveCount(40);
+        result.BestScore.Should().BeGreaterThan(0);
+
+        var pooled = opt.SearchAll(40, 10, random_state: 1337, n_points: 2000, options: new ForestSearchOptions { CandidatePool = true, OrdinalCategoricals = true });
+        pooled.Iterations.Should().HaveCount(40);
+        pooled.BestScore.Should().BeGreaterThan(0);
+    }
+}
@@ -0,0 +1,132 @@
+using System;
+using System.Collections.Concurrent;
+using System.Linq;
+using System.Threading;
+using System.Threading.Tasks;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class StudySchedulerTests : PythonTest {
+    private int _running;
+    private int _maxRunning;
+
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        var running = Interlocked.Increment(ref _running);
+        InterlockedMax(ref _maxRunning, running);
+        Thread.Sleep(5);
+        Interlocked.Decrement(ref _running);
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Maximize]
+    async Task<double> ScoreFunctionAsync(Parameters parameters) {
+        await Task.Delay(5);
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void RunsAllStudies() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        using var scheduler = new StudyScheduler(n_workers: 3);
+        var forest = scheduler.Add(new PyForestOptimization<Parameters>(ScoreFunction), 20, 10, random_state: 1337, n_points: 1000);
+        var gbrt = scheduler.Add(new PyGbrtOptimization<Parameters>(ScoreFunction), 20, 10, batch_size: 4, random_state: 1337, n_points: 1000);
+        var random = scheduler.Add(new PyRandomOptimization<Parameters>(ScoreFunctionAsync), 20, 20, batch_size: 4, random_state: 1337);
+        var bayesian = scheduler.Add(new PyBayesianOptimization<Parameters>(ScoreFunction), 12, 8, random_state: 1337, n_points: 1000);
+        scheduler.Run();
+
+        foreach (var study in new Study[] { forest, gbrt, random })
+            study.Evaluations.Should().Be(20);
+        bayesian.Evaluations.Should().Be(12);
+        forest.Result!.Iterations.Should().HaveCount(20);
+        gbrt.Result!.Iterations.Should().HaveCount(20);
+        random.Result!.Iterations.Should().HaveCount(20);
+        bayesian.Result!.Iterations.Should().HaveCount(12);
+        forest.Result.BestScore.Should().BeGreaterThan(0);
+
+        //the studies shared the workers
+        _maxRunning.Should().BeGreaterThan(1).And.BeLessThanOrEqualTo(3);
+    }
+
+    [Fact]
+    public void HigherPriorityFirst() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var order = new ConcurrentQueue<string>();
+        using var scheduler = new StudyScheduler(n_workers: 1);
+        scheduler.Add(new PyRandomOptimization<Parameters>(p => Tagged(order, "low", p), maximize: true), 8, 8, batch_size: 4, random_state: 1);
+        scheduler.Add(new PyRandomOptimization<Parameters>(p => Tagged(order, "high", p), maximize: true), 8, 8, priority: 1, batch_size: 4, random_state: 2);
+        scheduler.Run();
+
+        string.Join(",", order.Take(4)).Should().Be("high,high,high,high");
+        order.Should().HaveCount(16);
+    }
+
+    [Fact]
+    public void EqualPriorityTakesTurns() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var order = new ConcurrentQueue<string>();
+        using var scheduler = new StudyScheduler(n_workers: 1);
+        scheduler.Add(new PyRandomOptimization<Parameters>(p => Tagged(order, "a", p), maximize: true), 8, 8, batch_size: 4, random_state: 1);
+        scheduler.Add(new PyRandomOptimization<Parameters>(p => Tagged(order, "b", p), maximize: true), 8, 8, batch_size: 4, random_state: 2);
+        scheduler.Run();
+
+        string.Join(",", order.Take(8)).Should().Be("a,b,a,b,a,b,a,b");
+    }
+
+    [Fact]
+    public void ScoreFunctionThrows() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        using var scheduler = new StudyScheduler(n_workers: 2);
+        scheduler.Add(new PyRandomOptimization<Parameters>(ScoreFunction), 10, 10, random_state: 1);
+        scheduler.Add(new PyRandomOptimization<Parameters>(Throwing), 10, 10, random_state: 2);
+        Assert.Throws<InvalidOperationException>(() => scheduler.Run()).Message.Should().Be("failed");
+        //the running evaluations finished before the studies can be disposed
+        Volatile.Read(ref _running).Should().Be(0);
+    }
+
+    [Fact]
+    public void ScoreFunctionTakesGil() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        using var scheduler = new StudyScheduler(n_workers: 2);
+        var study = scheduler.Add(new PyRandomOptimization<Parameters>(WithGil), 8, 8, batch_size: 4, random_state: 1);
+        scheduler.Run();
+
+        study.Evaluations.Should().Be(8);
+    }
+
+    double WithGil(Parameters parameters) {
+        using (Py.GIL())
+            using (var value = new PyFloat(parameters.FloatSeed))
+                return value.As<double>();
+    }
+
+    double Throwing(Parameters parameters) {
+        throw new InvalidOperationException("failed");
+    }
+
+    private double Tagged(ConcurrentQueue<string> order, string tag, Parameters parameters) {
+        order.Enqueue(tag);
+        return ScoreFunction(parameters);
+    }
+
+    private static void InterlockedMax(ref int target, int value) {
+        int current;
+        while (value > (current = Volatile.Read(ref target)) && Interlocked.CompareExchange(ref target, value, current) != current) { }
+    }
+}
@@ -0,0 +1,100 @@
+using System;
+using System.Threading;
+using System.Threading.Tasks;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+using EmbeddedModules = Nucs.Optimization.Helper.EmbeddedModules;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class TimedObjectiveTests : PythonTest {
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        Thread.Sleep(parameters.UseMethod ? 30 : 10); //the better half of the space is the expensive one
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Maximize]
+    async Task<double> ScoreFunctionAsync(Parameters parameters) {
+        await Task.Delay(parameters.UseMethod ? 30 : 10);
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void Timer() {
+        using var _ = Py.GIL();
+        dynamic helper = EmbeddedModules.Helper;
+        dynamic timer = helper.ObjectiveTimer();
+
+        ((double) timer.elapsed()).Should().Be(1); //nothing recorded yet
+        timer.record(0.5, new PyTuple(new PyObject[] { new PyInt(1) }));
+        timer.record(1.5);
+        ((double) timer.elapsed()).Should().Be(1);
+        ((double) timer.elapsed(new PyTuple(new PyObject[] { new PyInt(1) }))).Should().Be(0.5);
+        ((string) timer.pairs(new PyList(new PyObject[] { new PyFloat(3) })).__repr__()).Should().Be("[[3.0, 1.0]]");
+    }
+
+    [Fact]
+    public void Forest_EIps() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+        using var dumpFile = new TempFile();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction, dumpResults: dumpFile);
+        var result = opt.SearchAll(20, 10, random_state: 1337, n_points: 1000, acq_func: PyForestOptimization.AcqFunc.EIps);
+        result.Iterations.Should().HaveCount(20);
+        result.BestScore.Should().BeGreaterThan(0);
+
+        //every evaluation was timed, the search fit the log of the times next to the scores
+        AssertTimed(dumpFile, 20);
+    }
+
+    [Fact]
+    public void Gbrt_Batch_PIps() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+        using var dumpFile = new TempFile();
+
+        var opt = new PyGbrtOptimization<Parameters>(ScoreFunction, dumpResults: dumpFile);
+        var result = opt.SearchAll(20, 8, random_state: 1337, n_points: 1000, acq_func: PyGbrtOptimization.AcqFunc.PIps, options: new TreeSearchOptions { BatchSize = 4, NWorkers = 4 });
+        result.Iterations.Should().HaveCount(20);
+
+        AssertTimed(dumpFile, 20);
+    }
+
+    [Fact]
+    public void Forest_Async_Batch_EIps() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+        using var dumpFile = new TempFile();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunctionAsync, dumpResults: dumpFile);
+        var result = opt.SearchAll(16, 8, random_state: 1337, n_points: 1000, acq_func: PyForestOptimization.AcqFunc.EIps, options: new ForestSearchOptions { BatchSize = 4, NWorkers = 2 });
+        result.Iterations.Should().HaveCount(16);
+
+        AssertTimed(dumpFile, 16);
+    }
+
+    [Fact]
+    public void MinBudget_Throws() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>((parameters, budget) => parameters.FloatSeed * budget);
+        Assert.Throws<ArgumentException>(() => opt.SearchAll(10, 5, acq_func: PyForestOptimization.AcqFunc.EIps, options: new ForestSearchOptions { MinBudget = 1d / 9 }));
+    }
+
+    private static void AssertTimed(TempFile dumpFile, int count) {
+        using dynamic np = PyModule.Import("numpy");
+        using dynamic skopt = PyModule.Import("skopt");
+        dynamic times = np.exp(skopt.utils.load(dumpFile.Path).log_time);
+
+        ((int) times.__len__()).Should().Be(count);
+        ((double) times.min()).Should().BeGreaterThan(0.009);
+        ((double) times.max()).Should().BeGreaterThan(0.029);
+    }
+}
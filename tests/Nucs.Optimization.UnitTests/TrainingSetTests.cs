@@ -0,0 +1,58 @@
+using System;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Python.Runtime;
+using Xunit;
+using EmbeddedModules = Nucs.Optimization.Helper.EmbeddedModules;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class TrainingSetTests : PythonTest {
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void KeepsBestAndRecent() {
+        using var _ = Py.GIL();
+        using dynamic np = PyModule.Import("numpy");
+        dynamic forest = EmbeddedModules.Forest;
+
+        dynamic rng = np.random.RandomState(1337);
+        dynamic X = rng.rand(1000, 3);
+        dynamic y = rng.rand(1000);
+        dynamic policy = forest.TrainingSetPolicy(100, n_best: 20, n_recent: 30, random_state: 1337);
+
+        dynamic best = np.take(np.argsort(y), np.arange(20));
+        dynamic recent = np.arange(970, 1000);
+        dynamic indices = policy.indices(y);
+        ((int) indices.__len__()).Should().Be(100);
+        ((int) np.isin(best, indices).sum()).Should().Be(20);
+        ((int) np.isin(recent, indices).sum()).Should().Be(30);
+
+        //the rest is spread over the whole range of the scores
+        dynamic rest = np.take(y, np.setdiff1d(np.setdiff1d(indices, best), recent));
+        ((double) rest.min()).Should().BeLessThan(0.1);
+        ((double) rest.max()).Should().BeGreaterThan(0.9);
+
+        dynamic selected = policy.select(X, y);
+        ((int) selected[0].shape[0]).Should().Be(100);
+        ((bool) np.array_equal(selected[1], np.take(y, policy.indices(y)))).Should().BeFalse(); //every fit draws another subsample
+        ((int) policy.indices(np.take(y, np.arange(50))).__len__()).Should().Be(50);
+    }
+
+    [Fact]
+    public void Forest_BoundedTrainingSet() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+
+        var opt = new PyForestOptimization<Parameters>(ScoreFunction);
+        var result = opt.SearchAll(60, 10, random_state: 1337, n_points: 1000, options: new ForestSearchOptions { MaxTrainPoints = 20 });
+
+        result.Iterations.Should().HaveCount(60);
+        result.BestScore.Should().BeGreaterThan(0);
+    }
+}
@@ -0,0 +1,76 @@
+using System;
+using System.IO;
+using System.Threading;
+using FluentAssertions;
+using Nucs.Optimization;
+using Nucs.Optimization.Analyzer;
+using Nucs.Optimization.Attributes;
+using Nucs.Optimization.Callbacks;
+using Python.Runtime;
+using Xunit;
+using EmbeddedModules = Nucs.Optimization.Helper.EmbeddedModules;
+
+namespace Nucs.Essentials.UnitTests;
+
+public class WarmStartTests : PythonTest {
+    private int _calls;
+
+    [Maximize]
+    double ScoreFunction(Parameters parameters) {
+        Interlocked.Increment(ref _calls);
+        return (parameters.Seed * parameters.NumericalCategories * (parameters.UseMethod ? 1 : -1) * Math.Sin(0.05 + parameters.FloatSeed)) / 1000000;
+    }
+
+    [Fact]
+    public void Forest_FromDumpAndJournal() {
+        using var _ = Py.GIL();
+        ParametersAnalyzer<Parameters>.Initialize();
+        using var dumpFile = new TempFile();
+        using var journalFile = new TempFile();
+
+        var first = new PyForestOptimization<Parameters>(ScoreFunction, dumpResults: dumpFile).SearchAll(20, 10, random_state: 1337, n_points: 1000);
+        using (var journal = new Journal(journalFile)) {
+            new PyRandomOptimization<Parameters>(ScoreFunction).SearchAll(10, random_state: 7, verbose: false, options: new SearchOptions { Journal = journal });
+        }
+
+        using var warmStart = new WarmStart().AddDump(dumpFile).AddJournal(journalFile);
+        warmStart.Count.Should().Be(30);
+
+        _calls = 0;
+        using var rerunFile = new TempFile();
+        OptimizeResult<Parameters> result;
+        using (var journal = new Journal(rerunFile)) {
+            result = new PyForestOptimization<Parameters>(ScoreFunction).SearchAll(10, 10, random_state: 1, n_points: 1000, options: new ForestSearchOptions { Journal = journal, WarmStart = warmStart });
+        }
+
+        //only new points are scored and journaled, the random starts are replaced by the earlier evaluations
+        _calls.Should().Be(10);
+        File.ReadAllLines(rerunFile.Path).Should().HaveCount(11);
+        result.Iterations.Should().HaveCount(40);
+        result.BestScore.Should().BeGreaterThanOrEqualTo(first.BestScore);
+    }
+
+    [Fact]
+    public void MapsByName_FiltersAndDedupes() {
+        using var _ = Py.GIL();
+        using dynamic space = PyModule.Import("skopt.space");
+        dynamic helper = EmbeddedModules.Helper;
+
+        dynamic warmStart = helper.WarmStart();
+        var point = new PyList(new PyObject[] { new PyFloat(0.5), new PyInt(3), new PyString("a") });
+        warmStart.add(new[] { "real", "integer", "categorical" }, new PyList(new PyObject[] { point, point, new PyList(new PyObject[] { new PyFloat(0.5), new PyInt(30), new PyString("a") }) }),
+                      new PyList(new PyObject[] { new PyFloat(1), new PyFloat(2), new PyFloat(3) }));
+        warmStart.add(new[] { "real", "integer" }, new PyList(new PyObject[] { new PyList(new PyObject[] { new PyFloat(0.25), new PyInt(4) }) }), new PyList(new PyObject[] { new PyFloat(4) }));
+
+        //reordered, the integer narrowed and the categorical widened
+        dynamic dimensions = new PyList(new PyObject[] {
+            space.Categorical(new PyList(new PyObject[] { new PyString("a"), new PyString("b") }), name: "categorical"), space.Integer(0, 10, name: "integer"), space.Real(0, 1, name: "real")
+        });
+        dynamic points = warmStart.points(dimensions, new[] { "categorical", "integer", "real" });
+
+        //the repeat, the point out of range and the point missing a parameter are dropped
+        ((int) points[2]).Should().Be(1);
+        ((string) points[0].__repr__()).Should().Be("[['a', 3, 0.5]]");
+        ((string) points[1].__repr__()).Should().Be("[1.0]");
+    }
+}